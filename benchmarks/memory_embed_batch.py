@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Batched embedding benchmark
+Records/sec of the embedding stage against batch size: embedding alone,
+embedding through a cold embedding cache (which pays for the writes) and
+re-embedding unchanged records from a warm one. Then end to end against a
+local stub webhook, posting one memory per request as ingest.py does
+against uploading precomputed vectors in bulk
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "memory"))
+
+from embed_ingest import EmbeddingCache, embed_batches, embed_ingest  # noqa: E402
+from embeddings import HashingEmbedder  # noqa: E402
+from ingest import ingest  # noqa: E402
+from memory_ingest import make_records  # noqa: E402
+from stub_langflow import base_url, run_stub  # noqa: E402
+
+def rate(records, run) -> float:
+    start = time.perf_counter()
+    run()
+    return len(records) / (time.perf_counter() - start)
+
+def drain(batches):
+    for _ in batches:
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32, 128, 512, 2048])
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--upload-records", type=int, default=2000, help="records for the end-to-end comparison")
+    parser.add_argument("--latency", type=float, default=0.05, help="stub webhook latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    embedder = HashingEmbedder(args.dim)
+    records = list(make_records(args.records))
+    print(f"📊 {args.records:,} records, hashing embedder dim={args.dim} (records/s)")
+    print(f"{'batch':>8}{'embed':>12}{'cold cache':>14}{'warm cache':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for batch_size in args.batch_sizes:
+            plain = rate(records, lambda: drain(embed_batches(records, embedder, batch_size=batch_size)))
+            cache = EmbeddingCache(os.path.join(directory, f"cache-{batch_size}.sqlite"))
+            cold = rate(records, lambda: drain(embed_batches(records, embedder, cache, batch_size)))
+            warm = rate(records, lambda: drain(embed_batches(records, embedder, cache, batch_size)))
+            cache.close()
+            print(f"{batch_size:>8}{plain:>12,.0f}{cold:>14,.0f}{warm:>14,.0f}")
+
+    records = list(make_records(args.upload_records))
+    print(f"\n🌐 {args.upload_records:,} records to a stub webhook with {args.latency * 1000:.0f}ms latency, "
+          f"concurrency {args.concurrency}")
+    with run_stub(latency=args.latency) as server:
+        url = f"{base_url(server)}/api/v1/webhook/bench"
+        one_by_one = rate(records, lambda: asyncio.run(ingest(records, url=url, concurrency=args.concurrency)))
+        print(f"  {'one memory per request':<32}{one_by_one:>10,.0f} records/s")
+        for upload_size in (10, 100):
+            bulk = rate(records, lambda: asyncio.run(
+                embed_ingest(records, embedder, url=url, upload_size=upload_size, concurrency=args.concurrency)
+            ))
+            print(f"  {f'bulk, {upload_size} per request':<32}{bulk:>10,.0f} records/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Connection reuse benchmark for the shared memory HTTP clients
+Sends the same webhook requests to the stub flow with a fresh connection per
+request (bare requests.post / a new httpx client) and through the pooled
+keep-alive clients in http_client.py, sequentially and concurrently
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "memory"))
+
+import httpx  # noqa: E402
+import requests  # noqa: E402
+
+from http_client import async_client, new_session  # noqa: E402
+from stub_langflow import base_url, run_stub  # noqa: E402
+
+RECORD = {"name": "Bench", "email": "bench@example.com", "subject": "Pool", "body": "Connection reuse"}
+
+def run_threads(post, url: str, count: int, concurrency: int) -> float:
+    start = time.perf_counter()
+    if concurrency == 1:
+        for _ in range(count):
+            post(url, json=RECORD, timeout=10).raise_for_status()
+    else:
+        with ThreadPoolExecutor(concurrency) as pool:
+            for response in pool.map(lambda _: post(url, json=RECORD, timeout=10), range(count)):
+                response.raise_for_status()
+    return time.perf_counter() - start
+
+async def run_async(url: str, count: int, concurrency: int, pooled: bool) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+    client = async_client("webhook", pool_size=concurrency) if pooled else None
+
+    async def post():
+        async with semaphore:
+            if client is not None:
+                response = await client.post(url, json=RECORD)
+            else:
+                async with httpx.AsyncClient(timeout=10) as fresh:
+                    response = await fresh.post(url, json=RECORD)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(post() for _ in range(count)))
+    finally:
+        if client is not None:
+            await client.aclose()
+    return time.perf_counter() - start
+
+def report(name: str, elapsed: float, count: int):
+    print(f"{name:<34}{elapsed:>8.2f}s{count / elapsed:>10.0f} req/s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the stub waits per request")
+    args = parser.parse_args()
+
+    with run_stub(latency=args.latency) as server:
+        url = f"{base_url(server)}/api/v1/webhook/bench"
+        session = new_session(args.concurrency)
+        try:
+            print(f"📊 {args.requests} requests, concurrency {args.concurrency}")
+            print("=" * 54)
+            report("sequential, new connection", run_threads(requests.post, url, args.requests, 1), args.requests)
+            report("sequential, pooled session", run_threads(session.post, url, args.requests, 1), args.requests)
+            report("threads, new connection",
+                   run_threads(requests.post, url, args.requests, args.concurrency), args.requests)
+            report("threads, pooled session",
+                   run_threads(session.post, url, args.requests, args.concurrency), args.requests)
+            report("async, new client",
+                   asyncio.run(run_async(url, args.requests, args.concurrency, pooled=False)), args.requests)
+            report("async, pooled client",
+                   asyncio.run(run_async(url, args.requests, args.concurrency, pooled=True)), args.requests)
+        finally:
+            session.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Memory ingestion benchmark against a local stub webhook
+Compares the old one-at-a-time path with the concurrent ingestion pipeline
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "memory"))
+
+from ingest import ingest  # noqa: E402
+from stub_langflow import base_url, run_stub  # noqa: E402
+
+WEBHOOK_PATH = "/api/v1/webhook/bench"
+
+def make_records(count: int):
+    for i in range(count):
+        yield {
+            "name": f"User {i}",
+            "email": f"user{i}@example.com",
+            "subject": f"Request {i}",
+            "body": f"Benchmark memory body number {i} with a little bit of text to embed.",
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub webhook latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="fraction of 429 responses")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    print(f"📊 {args.records} records, stub latency {args.latency * 1000:.0f}ms, {args.error_rate:.0%} 429s")
+    print(f"   (old add_memories.py: latency + 2s sleep per record ≈ {args.records * (args.latency + 2):.0f}s)")
+    print("=" * 60)
+    with run_stub(latency=args.latency, error_rate=args.error_rate) as server:
+        url = base_url(server) + WEBHOOK_PATH
+        for concurrency in args.concurrency:
+            start = time.perf_counter()
+            stats = asyncio.run(ingest(make_records(args.records), url=url, concurrency=concurrency))
+            elapsed = time.perf_counter() - start
+            print(f"concurrency={concurrency:<4} {elapsed:>7.2f}s  {stats['sent'] / elapsed:>8.1f} records/s  "
+                  f"failed={stats['failed']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Recall/latency benchmark for the local memory vector index
+Compares IVF search at several nprobe settings against exact brute force
+on a synthetic collection embedded with the hashing embedder
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "memory"))
+
+import numpy as np  # noqa: E402
+
+from embeddings import HashingEmbedder, memory_text  # noqa: E402
+from local_index import LocalVectorIndex  # noqa: E402
+
+VOCABULARY = [
+    "appointment", "cardiologist", "dentist", "pizza", "delivery", "flight", "hotel", "insurance",
+    "urgent", "morning", "afternoon", "vegan", "groceries", "rental", "weekend", "family", "office",
+    "cleaning", "pediatrician", "budget", "cancel", "reschedule", "invoice", "refund", "order",
+    "prescription", "pharmacy", "plumber", "electrician", "school", "meeting", "birthday", "gift",
+]
+
+def synthetic_records(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    for i in range(count):
+        words = rng.choices(VOCABULARY, k=12)
+        yield {
+            "name": f"User {i}",
+            "email": f"user{i % (count // 10 + 1)}@example.com",
+            "subject": " ".join(words[:3]),
+            "body": " ".join(words),
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    embedder = HashingEmbedder(args.dim)
+    with tempfile.TemporaryDirectory() as directory:
+        index = LocalVectorIndex(directory, dim=args.dim)
+        records = list(synthetic_records(args.records))
+        start = time.perf_counter()
+        for offset in range(0, len(records), 10_000):
+            batch = records[offset:offset + 10_000]
+            index.add(batch, embedder.embed([memory_text(record) for record in batch]))
+        print(f"🌱 Indexed {len(index):,} memories in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        index.build_ivf()
+        print(f"🧭 Built IVF with {len(index.centroids)} lists in {time.perf_counter() - start:.1f}s")
+
+        rng = random.Random(1)
+        queries = embedder.embed([" ".join(rng.choices(VOCABULARY, k=4)) for _ in range(args.queries)])
+
+        start = time.perf_counter()
+        exact = index.search(queries, k=args.k)
+        brute_ms = (time.perf_counter() - start) / args.queries * 1000
+        truth = [{row for row, _ in hits} for hits in exact]
+
+        print("=" * 60)
+        print(f"{'mode':<16}{'recall@' + str(args.k):>12}{'ms/query':>12}")
+        print(f"{'brute force':<16}{1.0:>12.3f}{brute_ms:>12.2f}")
+        for nprobe in args.nprobe:
+            start = time.perf_counter()
+            approx = index.search(queries, k=args.k, nprobe=nprobe)
+            elapsed_ms = (time.perf_counter() - start) / args.queries * 1000
+            recall = np.mean([
+                len(expected & {row for row, _ in hits}) / max(1, len(expected))
+                for expected, hits in zip(truth, approx)
+            ])
+            print(f"{'ivf nprobe=' + str(nprobe):<16}{recall:>12.3f}{elapsed_ms:>12.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Parser benchmark for Langflow /run responses
+Compares json.loads + extract_search_results against the single-pass
+streaming parser on multi-megabyte response fixtures: total time, time to
+first result and peak Python memory
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "memory"))
+
+from get_memories import extract_search_results  # noqa: E402
+from run_parser import iter_search_results  # noqa: E402
+from stub_langflow import search_response  # noqa: E402
+
+def make_fixture(results: int) -> bytes:
+    response = search_response("fixture query", results)
+    for i, item in enumerate(response["outputs"][0]["results"]["search_results"]):
+        item["page_content"] += " " + "lorem ipsum dolor sit amet " * 20
+        item["metadata"]["vector"] = [round(0.001 * (i + j), 6) for j in range(64)]
+    return json.dumps(response).encode()
+
+def old_parse(body: bytes):
+    return extract_search_results(json.loads(body))
+
+def measure(name: str, parse, body: bytes, repeats: int):
+    best_total = best_first = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        first = None
+        count = 0
+        for _ in parse(body):
+            if first is None:
+                first = time.perf_counter() - start
+            count += 1
+        best_total = min(best_total, time.perf_counter() - start)
+        best_first = min(best_first, first or 0)
+
+    tracemalloc.start()
+    for _ in parse(body):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<28} total={best_total * 1000:>8.1f}ms  first={best_first * 1000:>8.2f}ms  "
+          f"peak={peak / 2**20:>7.1f}MiB  results={count}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--results", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    for results in args.results:
+        body = make_fixture(results)
+        print(f"📦 {results} results, {len(body) / 2**20:.1f} MiB")
+        measure("json.loads + extract", old_parse, body, args.repeats)
+        measure("iter_search_results", iter_search_results, body, args.repeats)
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Multi-query memory retrieval benchmark against a local stub of the /run flow
+Compares the old sequential loop (with its 1s sleep) against search_many,
+including a slow tail that exceeds the per-query deadline
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "memory"))
+
+import requests  # noqa: E402
+
+from retrieval import AsyncMemoryRetriever, RetrievalCache, run_payload  # noqa: E402
+from stub_langflow import base_url, run_stub  # noqa: E402
+
+QUERIES = [
+    "caller profile",
+    "open tasks",
+    "preferences",
+    "recent appointments",
+    "insurance details",
+    "delivery address",
+]
+
+def sequential(url: str, queries, sleep: float) -> float:
+    """The old get_memories.py loop: one bare request per query, sleeping in between"""
+    start = time.perf_counter()
+    for i, query in enumerate(queries):
+        requests.post(f"{url}/api/v1/run/bench?stream=false", json=run_payload(query), timeout=30)
+        if i < len(queries) - 1 and sleep:
+            time.sleep(sleep)
+    return time.perf_counter() - start
+
+async def concurrent(url: str, queries, deadline: float, rounds: int):
+    retriever = AsyncMemoryRetriever("bench", url, cache=RetrievalCache(max_entries=0))
+    samples, partial = [], 0
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            results = await retriever.search_many(queries, deadline=deadline)
+            samples.append(time.perf_counter() - start)
+            partial += sum(1 for value in results.values() if value is None)
+    finally:
+        await retriever.close()
+    return samples, partial
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.2, help="stub /run latency in seconds")
+    parser.add_argument("--slow-rate", type=float, default=0.05, help="fraction of very slow searches")
+    parser.add_argument("--slow-latency", type=float, default=3.0)
+    parser.add_argument("--deadline", type=float, default=1.0)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    with run_stub(latency=args.latency, slow_rate=args.slow_rate, slow_latency=args.slow_latency) as server:
+        url = base_url(server)
+        old = sequential(url, QUERIES, sleep=1.0)
+        old_no_sleep = sequential(url, QUERIES, sleep=0)
+        samples, partial = asyncio.run(concurrent(url, QUERIES, args.deadline, args.rounds))
+
+    samples.sort()
+    print(f"📊 {len(QUERIES)} queries, stub latency {args.latency * 1000:.0f}ms, "
+          f"{args.slow_rate:.0%} take {args.slow_latency}s, deadline {args.deadline}s")
+    print("=" * 60)
+    print(f"sequential with 1s sleep    {old * 1000:>8.0f}ms")
+    print(f"sequential, no sleep        {old_no_sleep * 1000:>8.0f}ms")
+    print(f"search_many p50             {statistics.median(samples) * 1000:>8.0f}ms")
+    print(f"search_many max             {samples[-1] * 1000:>8.0f}ms  "
+          f"({partial} of {len(QUERIES) * args.rounds} queries cut off by the deadline)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Durable spool benchmark against a local stub webhook
+Measures what producers pay per memory (a spool append, with and without
+fsync, against posting straight to the webhook), then drives a webhook
+outage: producers keep spooling while the webhook answers 503, and the
+drainer must deliver everything once it is back. Finally a drainer
+"crashes" holding a claimed batch and a new one recovers it. Reports time
+to drain and duplicate deliveries (allowed, since delivery is at-least-once)
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "memory"))
+
+import httpx  # noqa: E402
+
+from memory_ingest import make_records  # noqa: E402
+from spool import MemorySpool, SpoolDrainer  # noqa: E402
+from status_checker_load import percentile  # noqa: E402
+from stub_langflow import base_url, run_stub  # noqa: E402
+
+WEBHOOK_PATH = "/api/v1/webhook/bench"
+
+def producer_costs(path: str, url: str, count: int):
+    """Per-record latency of a spool append (plain and fsync) and of a direct webhook post"""
+    records = list(make_records(count))
+    for name, fsync in (("spool append", False), ("spool append (fsync)", True)):
+        spool = MemorySpool(os.path.join(path, f"producer-{fsync}.sqlite"), fsync=fsync)
+        samples = []
+        for record in records:
+            start = time.perf_counter()
+            spool.append(record)
+            samples.append(time.perf_counter() - start)
+        spool.close()
+        yield name, samples
+    samples = []
+    with httpx.Client() as client:
+        for record in records:
+            start = time.perf_counter()
+            client.post(url, json=record)
+            samples.append(time.perf_counter() - start)
+    yield "direct webhook post", samples
+
+async def outage(spool: MemorySpool, server, url: str, args) -> dict:
+    """Producers spool through an outage while a follow-mode drainer keeps trying"""
+    drainer = SpoolDrainer(spool, url=url, batch_size=args.batch_size, concurrency=args.concurrency,
+                           max_backoff=args.max_backoff)
+    server.outage(args.outage)
+    received_before = server.received
+    started = time.perf_counter()
+    drain = asyncio.create_task(drainer.run(follow=True, poll_interval=0.05))
+    for i, record in enumerate(make_records(args.records)):
+        spool.append(record)
+        if i % 50 == 0:
+            await asyncio.sleep(0)  # Let the drainer run alongside the producer
+    produced = time.perf_counter() - started
+    while spool.stats()["pending"]:
+        await asyncio.sleep(0.05)
+    drained = time.perf_counter() - started
+    drain.cancel()
+    await asyncio.gather(drain, return_exceptions=True)
+    return {
+        "produce_s": produced,
+        "drained_s": drained,
+        "after_outage_s": drained - args.outage,
+        "delivered": server.received - received_before,
+    }
+
+async def crash_recovery(spool: MemorySpool, server, url: str, args) -> dict:
+    """A drainer claims a batch and dies; a new one recovers it without waiting for the lease"""
+    spool.append_many(make_records(args.batch_size))
+    spool.claim(args.batch_size, lease=3600)  # The claim a crashed drainer leaves behind
+    received_before = server.received
+    started = time.perf_counter()
+    recovered = spool.recover()
+    await SpoolDrainer(spool, url=url, batch_size=args.batch_size, concurrency=args.concurrency).run()
+    return {"recovered": recovered, "delivered": server.received - received_before, "recovery_s": time.perf_counter() - started}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.02, help="stub webhook latency in seconds")
+    parser.add_argument("--outage", type=float, default=3.0, help="seconds the webhook answers 503")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--max-backoff", type=float, default=1.0, help="cap on the drainer's retry delay")
+    parser.add_argument("--producer-records", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path, run_stub(latency=args.latency) as server:
+        url = f"{base_url(server)}{WEBHOOK_PATH}"
+        print(f"{'producer path':<24}{'p50 ms':>10}{'p99 ms':>10}")
+        for name, samples in producer_costs(path, url, args.producer_records):
+            print(f"{name:<24}{percentile(samples, 50) * 1000:>10.2f}{percentile(samples, 99) * 1000:>10.2f}")
+
+        spool = MemorySpool(os.path.join(path, "spool.sqlite"))
+        result = asyncio.run(outage(spool, server, url, args))
+        print(f"\n🌩️  {args.outage:g}s outage, {args.records} memories: produced in {result['produce_s']:.2f}s, "
+              f"drained {result['after_outage_s']:.2f}s after the webhook came back")
+        print(f"   delivered {result['delivered']} ({result['delivered'] - args.records} duplicates), "
+              f"left {spool.stats()}")
+
+        result = asyncio.run(crash_recovery(spool, server, url, args))
+        print(f"\n💥 Crashed drainer: recovered {result['recovered']} claimed records, "
+              f"delivered {result['delivered']} in {result['recovery_s']:.2f}s")
+        spool.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Time-to-first-result benchmark for streaming memory retrieval
+Runs the same searches against the stub flow in blocking (/run?stream=false)
+and streaming (/run?stream=true) mode and compares how long the caller waits
+for the first memory and for the whole result set
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "memory"))
+
+from retrieval import MemoryRetriever, RetrievalCache  # noqa: E402
+from status_checker_load import percentile  # noqa: E402
+from stub_langflow import base_url, run_stub  # noqa: E402
+
+def timed(search, query: str):
+    """(seconds to first result, seconds to last result, count) for one search"""
+    start = time.perf_counter()
+    first = None
+    count = 0
+    for _ in search(query):
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+    return first or 0.0, time.perf_counter() - start, count
+
+def report(name: str, samples):
+    firsts = sorted(sample[0] * 1000 for sample in samples)
+    totals = sorted(sample[1] * 1000 for sample in samples)
+    print(f"{name:<12}first p50={percentile(firsts, 50):>7.1f}ms p99={percentile(firsts, 99):>7.1f}ms  "
+          f"total p50={percentile(totals, 50):>7.1f}ms p99={percentile(totals, 99):>7.1f}ms  "
+          f"results={samples[0][2]}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds the stub flow takes per search")
+    parser.add_argument("--results", type=int, default=5)
+    args = parser.parse_args()
+
+    with run_stub(latency=args.latency, results_per_query=args.results) as server:
+        # Caching disabled so every search reaches the flow
+        retriever = MemoryRetriever("bench", base_url(server), cache=RetrievalCache(max_entries=0))
+        queries = [f"benchmark query {i}" for i in range(args.queries)]
+        try:
+            blocking = [timed(retriever.search, query) for query in queries]
+            streaming = [timed(retriever.stream, query) for query in queries]
+        finally:
+            retriever.close()
+
+    print(f"📊 {args.queries} searches, {args.latency * 1000:.0f}ms flow latency, {args.results} results each")
+    report("blocking", blocking)
+    report("streaming", streaming)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Per-user search benchmark for the local memory vector index
+Grows the collection by adding users with a fixed number of memories each
+and times a search for one caller's memories three ways: scoped to their
+partition, brute force over the whole collection then filtered to the
+caller, and IVF over the whole collection then filtered. Scoped latency
+should stay flat as the user count grows; the others grow with it
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "memory"))
+
+from embeddings import HashingEmbedder, memory_text  # noqa: E402
+from local_index import LocalVectorIndex  # noqa: E402
+from memory_local_index import VOCABULARY  # noqa: E402
+
+def user_records(first_user: int, users: int, per_user: int, rng: random.Random):
+    for user in range(first_user, first_user + users):
+        for i in range(per_user):
+            words = rng.choices(VOCABULARY, k=12)
+            yield {
+                "name": f"User {user}",
+                "email": f"user{user}@example.com",
+                "subject": f"{' '.join(words[:3])} #{i}",
+                "body": " ".join(words),
+            }
+
+def timed(search, queries, users) -> float:
+    """Mean milliseconds per search"""
+    start = time.perf_counter()
+    for query, user in zip(queries, users):
+        search(query, user)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--per-user", type=int, default=10, help="memories per user")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--nprobe", type=int, default=8)
+    args = parser.parse_args()
+
+    embedder = HashingEmbedder(args.dim)
+    rng = random.Random(0)
+    print(f"{'users':>8}{'memories':>10}{'scoped ms':>12}{'brute+filter ms':>18}{'ivf+filter ms':>16}")
+    with tempfile.TemporaryDirectory() as directory:
+        index = LocalVectorIndex(directory, dim=args.dim)
+        indexed_users = 0
+        for users in sorted(args.users):
+            batch = list(user_records(indexed_users, users - indexed_users, args.per_user, rng))
+            for offset in range(0, len(batch), 10_000):
+                chunk = batch[offset:offset + 10_000]
+                index.add(chunk, embedder.embed([memory_text(record) for record in chunk]))
+            indexed_users = users
+            index.build_ivf()
+
+            queries = embedder.embed([" ".join(rng.choices(VOCABULARY, k=4)) for _ in range(args.queries)])
+            callers = [f"user{rng.randrange(users)}@example.com" for _ in range(args.queries)]
+
+            def filtered(hits, user):
+                return [(row, score) for row, score in hits if index.records[row]["user"] == user]
+
+            scoped = timed(lambda query, user: index.search(query, k=args.k, user=user), queries, callers)
+            # Without partitions the best a global search can do is over-fetch and filter afterwards,
+            # here with every row kept so it finds the caller's memories at all
+            brute = timed(
+                lambda query, user: filtered(index.search(query, k=len(index.records))[0], user), queries, callers
+            )
+            ivf = timed(
+                lambda query, user: filtered(index.search(query, k=len(index.records), nprobe=args.nprobe)[0], user),
+                queries, callers,
+            )
+            print(f"{users:>8,}{len(index):>10,}{scoped:>12.3f}{brute:>18.2f}{ivf:>16.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for the status-checker service
+Fires many concurrent callers at /add-status and /status/{call_id}
+and reports p50/p99 latency per route
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import Dict, List
+
+import httpx
+
+DEFAULT_BASE_URL = "http://127.0.0.1:8001"
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def summarize(name: str, samples: List[float], errors: int, elapsed: float) -> Dict:
+    """Build a latency summary (milliseconds) for one route"""
+    return {
+        "route": name,
+        "requests": len(samples) + errors,
+        "errors": errors,
+        "throughput_rps": round((len(samples) + errors) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p90_ms": round(percentile(samples, 90) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 2) if samples else 0.0,
+    }
+
+async def run_route(client: httpx.AsyncClient, name: str, make_request, total: int, concurrency: int) -> Dict:
+    """Run `total` requests with at most `concurrency` in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: List[float] = []
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await make_request(client, i)
+                if response.status_code >= 400:
+                    errors += 1
+                    return
+            except httpx.HTTPError:
+                errors += 1
+                return
+            samples.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return summarize(name, samples, errors, time.perf_counter() - started)
+
+async def main_async(args):
+    call_ids = [f"bench-{uuid.uuid4().hex[:8]}" for _ in range(args.calls)]
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as client:
+        async def add(client, i):
+            return await client.post("/add-status", json={
+                "call_id": call_ids[i % len(call_ids)],
+                "status": f"step-{i}",
+                "metadata": {"bench": True},
+            })
+
+        async def get(client, i):
+            return await client.get(f"/status/{call_ids[i % len(call_ids)]}")
+
+        results = [
+            await run_route(client, "/add-status", add, args.requests, args.concurrency),
+            await run_route(client, "/status/{call_id}", get, args.requests, args.concurrency),
+        ]
+
+    print(f"📊 {args.requests} requests per route, {args.concurrency} concurrent callers, {args.calls} call IDs")
+    print("=" * 70)
+    for result in results:
+        print(f"{result['route']:<20} p50={result['p50_ms']:>8}ms  p99={result['p99_ms']:>8}ms  "
+              f"rps={result['throughput_rps']:>8}  errors={result['errors']}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--calls", type=int, default=50, help="distinct call IDs to spread load over")
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for status-checker
+Measures what a scale-to-zero deployment pays before serving: the time to
+import the app in a fresh interpreter, and, over several fresh processes,
+the time from spawning the service until /healthz answers, until /readyz
+reports MongoDB reachable, and until the first status write and read
+succeed. MongoDB is --mongo-uri, a throwaway mongod when one is installed,
+or else mongomock, where --connect-delay stands in for the DNS and TLS cost
+of reaching a remote cluster
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import httpx
+
+from suite import STATUS_CHECKER_DIR, free_port, mongo_stand_in
+
+IMPORT_SNIPPET = "import time; start = time.perf_counter(); import main; print(time.perf_counter() - start)"
+
+# The service process imports nothing but the app, uvicorn and (without --mongo-uri) mongomock,
+# so its startup is what a deployment would see. Arguments: port, connect delay, "mongomock" or ""
+SERVE_SNIPPET = """
+import sys, time
+import uvicorn
+import main
+
+port, connect_delay, backend = int(sys.argv[1]), float(sys.argv[2]), sys.argv[3]
+if backend == "mongomock":
+    from mongomock_motor import AsyncMongoMockClient
+
+    def mongo_client():
+        time.sleep(connect_delay)
+        return AsyncMongoMockClient()
+
+    main.mongo_client = mongo_client
+uvicorn.run(main.app, host="127.0.0.1", port=port, log_level="warning")
+"""
+
+def import_times(runs: int) -> List[float]:
+    times = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET], cwd=STATUS_CHECKER_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        times.append(float(output.strip().splitlines()[-1]))
+    return times
+
+def poll(client: httpx.Client, method: str, url: str, deadline: float, **kwargs) -> httpx.Response:
+    """Retry until the service answers 2xx; connection errors and 503s mean it isn't there yet"""
+    while time.perf_counter() < deadline:
+        try:
+            response = client.request(method, url, **kwargs)
+            if response.status_code < 300:
+                return response
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.005)
+    raise RuntimeError(f"{method} {url} did not succeed in time")
+
+def cold_start(mongo_uri: Optional[str], connect_delay: float) -> Dict[str, float]:
+    """Spawn a fresh service and time each milestone from the spawn"""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    child_env = dict(os.environ)
+    if mongo_uri:
+        child_env["MONGODB_URI"] = mongo_uri
+    command = [sys.executable, "-c", SERVE_SNIPPET, str(port), str(connect_delay), "" if mongo_uri else "mongomock"]
+    call_id = f"cold-{uuid.uuid4().hex[:8]}"
+
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=STATUS_CHECKER_DIR, env=child_env)
+    try:
+        deadline = started + 60
+        with httpx.Client(timeout=30) as client:
+            poll(client, "GET", f"{url}/healthz", deadline)
+            healthy = time.perf_counter()
+            write_start = time.perf_counter()
+            poll(client, "POST", f"{url}/add-status", deadline, json={"call_id": call_id, "status": "started"})
+            written = time.perf_counter()
+            poll(client, "GET", f"{url}/status/{call_id}", deadline)
+            read = time.perf_counter()
+            poll(client, "GET", f"{url}/readyz", deadline)
+            ready = time.perf_counter()
+    finally:
+        process.terminate()
+        process.wait()
+    return {
+        "healthz": healthy - started,
+        "first_write": written - started,
+        "first_write_latency": written - write_start,
+        "first_read": read - started,
+        "readyz": ready - started,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per measurement")
+    parser.add_argument("--mongo-uri", default=None, help="use this MongoDB instead of a local stand-in")
+    parser.add_argument("--connect-delay", type=float, default=0.0, help="seconds added to opening the mongomock client")
+    args = parser.parse_args()
+
+    imports = import_times(args.runs)
+    print(f"📦 import main: median {statistics.median(imports) * 1000:.0f}ms, min {min(imports) * 1000:.0f}ms")
+
+    with mongo_stand_in(args.mongo_uri) as (mongo_uri, mongo_kind):
+        runs = [cold_start(mongo_uri, args.connect_delay) for _ in range(args.runs)]
+    print(f"🧪 Mongo: {mongo_kind}, {args.runs} cold starts (ms from spawn, median / max)")
+    for field in runs[0]:
+        values = [run[field] * 1000 for run in runs]
+        print(f"  {field:<24}{statistics.median(values):>8.0f}{max(values):>8.0f}")
+
+if __name__ == "__main__":
+    main()
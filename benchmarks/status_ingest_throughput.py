@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Ingestion throughput benchmark for the status-checker service
+Compares per-row /add-status calls against /add-status/batch at several batch sizes.
+Run it once per server STATUS_WRITE_MODE (direct, buffered, async) to compare
+the write buffer against the plain per-row path.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+from status_checker_load import DEFAULT_BASE_URL
+
+def make_status(call_id: str, i: int) -> dict:
+    return {"call_id": call_id, "status": f"step-{i}", "metadata": {"bench": True, "seq": i}}
+
+async def run_single(client: httpx.AsyncClient, total: int, concurrency: int) -> float:
+    """Post `total` rows one request each; returns rows/sec"""
+    call_id = f"ingest-{uuid.uuid4().hex[:8]}"
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            response = await client.post("/add-status", json=make_status(call_id, i))
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return total / (time.perf_counter() - start)
+
+async def run_batched(client: httpx.AsyncClient, total: int, concurrency: int, batch_size: int) -> float:
+    """Post `total` rows in batches of `batch_size`; returns rows/sec"""
+    call_id = f"ingest-{uuid.uuid4().hex[:8]}"
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(offset: int):
+        batch = [make_status(call_id, i) for i in range(offset, min(offset + batch_size, total))]
+        async with semaphore:
+            response = await client.post("/add-status/batch", json=batch)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(offset) for offset in range(0, total, batch_size)))
+    return total / (time.perf_counter() - start)
+
+async def main_async(args):
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        results = {"per-row /add-status": await run_single(client, args.rows, args.concurrency)}
+        for batch_size in args.batch_sizes:
+            results[f"batch of {batch_size}"] = await run_batched(client, args.rows, args.concurrency, batch_size)
+
+    baseline = results["per-row /add-status"]
+    print(f"📊 {args.rows} rows, {args.concurrency} concurrent requests")
+    print("=" * 60)
+    for name, rows_per_sec in results.items():
+        print(f"{name:<22} {rows_per_sec:>10.0f} rows/s  ({rows_per_sec / baseline:.1f}x)")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[10, 100, 500])
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Query plan benchmark for /status/{call_id} lookups
+Seeds a scratch collection with millions of status rows and compares the
+old unindexed full-history query against the indexed, bounded, projected one
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from pymongo import ASCENDING, DESCENDING, MongoClient
+
+MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
+PROJECTION = {"_id": 0, "call_id": 1, "status": 1, "timestamp": 1, "metadata": 1}
+
+def seed(collection, rows: int, calls: int, batch_size: int = 10000):
+    """Fill the collection with `rows` status rows spread across `calls` call IDs"""
+    print(f"🌱 Seeding {rows:,} rows across {calls:,} calls...")
+    start = datetime.utcnow() - timedelta(days=30)
+    batch = []
+    for i in range(rows):
+        batch.append({
+            "call_id": f"call-{random.randrange(calls)}",
+            "status": random.choice(["ringing", "in-progress", "transcribing", "completed"]),
+            "timestamp": start + timedelta(milliseconds=i),
+            "metadata": {"message": f"event {i}", "seq": i},
+        })
+        if len(batch) == batch_size:
+            collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+
+def plan_summary(explain: dict) -> dict:
+    """Pull the interesting numbers out of an explain('executionStats') result"""
+    stats = explain["executionStats"]
+    stages = []
+    stage = explain["queryPlanner"]["winningPlan"]
+    while stage:
+        stages.append(stage["stage"])
+        stage = stage.get("inputStage")
+    return {
+        "stages": " <- ".join(stages),
+        "docs_examined": stats["totalDocsExamined"],
+        "keys_examined": stats["totalKeysExamined"],
+        "returned": stats["nReturned"],
+        "execution_ms": stats["executionTimeMillis"],
+    }
+
+def time_query(run, repeats: int) -> dict:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+    return {
+        "p50_ms": round(statistics.median(samples) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--calls", type=int, default=2_000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--reseed", action="store_true", help="drop and reseed the scratch collection")
+    args = parser.parse_args()
+
+    client = MongoClient(MONGODB_URI)
+    collection = client.status_bench.calls
+
+    if args.reseed or collection.estimated_document_count() == 0:
+        collection.drop()
+        seed(collection, args.rows, args.calls)
+
+    call_id = collection.find_one({}, {"call_id": 1})["call_id"]
+    print(f"🎯 Probing call_id={call_id} ({collection.count_documents({'call_id': call_id}):,} rows)")
+
+    # Old query: no index, full history, every field
+    if "call_id_timestamp" in collection.index_information():
+        collection.drop_index("call_id_timestamp")
+    old = lambda: collection.find({"call_id": call_id}).sort("timestamp", -1)
+    old_plan = plan_summary(old().explain())
+    old_timing = time_query(lambda: list(old()), args.repeats)
+
+    # New query: compound index, bounded, projected
+    collection.create_index([("call_id", ASCENDING), ("timestamp", DESCENDING)], name="call_id_timestamp")
+    new = lambda: collection.find({"call_id": call_id}, PROJECTION).sort("timestamp", DESCENDING).limit(args.limit)
+    new_plan = plan_summary(new().explain())
+    new_timing = time_query(lambda: list(new()), args.repeats)
+
+    print("=" * 70)
+    for label, plan, timing in (("old", old_plan, old_timing), ("new", new_plan, new_timing)):
+        print(f"{label}: {plan['stages']}")
+        print(f"     docs examined={plan['docs_examined']:,} keys examined={plan['keys_examined']:,} "
+              f"returned={plan['returned']:,} server={plan['execution_ms']}ms "
+              f"client p50={timing['p50_ms']}ms max={timing['max_ms']}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for status-checker responses
+Measures the cost of turning status rows (as MongoDB returns them) into a
+response body per 10k rows: the old path (strip _id, jsonable_encoder,
+JSONResponse) against the orjson path, plus gzip cost and size
+"""
+
+import argparse
+import gzip
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+def make_rows(count: int):
+    start = datetime(2024, 3, 21, 12, 0, 0)
+    return [
+        {
+            "_id": ObjectId(),
+            "call_id": "bench-call",
+            "status": f"step-{i}",
+            "timestamp": start + timedelta(milliseconds=137 * i),
+            "metadata": {"agent": "buster", "attempt": i % 3, "transcript": "Caller asked about an appointment"},
+        }
+        for i in range(count)
+    ]
+
+def old_path(rows) -> bytes:
+    content = [{key: value for key, value in row.items() if key != "_id"} for row in rows]
+    return JSONResponse(jsonable_encoder(content)).body
+
+def new_path(rows) -> bytes:
+    return ORJSONResponse([{key: value for key, value in row.items() if key != "_id"} for row in rows]).body
+
+def best_of(repeats: int, fn, *args):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}{'path':>18}{'ms':>10}{'ms/10k':>10}{'bytes':>12}{'gzip ms':>10}{'gzip bytes':>12}")
+    for count in args.rows:
+        rows = make_rows(count)
+        old_time, old_body = best_of(args.repeats, old_path, rows)
+        new_time, new_body = best_of(args.repeats, new_path, rows)
+        assert old_body.replace(b" ", b"") == new_body.replace(b" ", b""), "serializers disagree"
+        gzip_time, compressed = best_of(args.repeats, gzip.compress, new_body, 6)
+        for name, elapsed, body in (("jsonable_encoder", old_time, old_body), ("orjson", new_time, new_body)):
+            print(f"{count:>8}{name:>18}{elapsed * 1000:>10.1f}{elapsed * 1000 * 10000 / count:>10.1f}{len(body):>12}"
+                  f"{gzip_time * 1000:>10.1f}{len(compressed):>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Worker scaling benchmark for status-checker
+Starts the service with 1, 2, 4... worker processes sharing state through a
+Redis-compatible server (the one at --redis-url, otherwise an in-process
+fakeredis server) and drives a mixed write/read load at each worker count,
+reporting throughput and latency per count. MongoDB is --mongo-uri, a
+throwaway mongod when one is installed, or else mongomock; with mongomock
+every worker has its own in-memory database, so only the HTTP and
+serialization side of scaling is measured
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+
+from status_checker_load import run_route
+from suite import STATUS_CHECKER_DIR, free_port, mongo_stand_in, wait_until
+
+@contextmanager
+def redis_stand_in(url: Optional[str]) -> Iterator[str]:
+    """URL of the Redis the workers should share; fakeredis runs in its own process so it doesn't compete with the load"""
+    if url:
+        yield url
+        return
+
+    port = free_port()
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve-redis", str(port)])
+    try:
+        wait_until(lambda: socket.create_connection(("127.0.0.1", port), timeout=0.5).close() is None, 30, "fakeredis")
+        yield f"redis://127.0.0.1:{port}/0"
+    finally:
+        process.terminate()
+        process.wait()
+
+def serve_redis(port: int):
+    """Child process entry point: an in-memory Redis-compatible server"""
+    from fakeredis import TcpFakeServer
+
+    TcpFakeServer(("127.0.0.1", port)).serve_forever()
+
+def make_app():
+    """Worker entry point (uvicorn factory): the real app, on mongomock when asked"""
+    import main
+
+    if os.environ.get("BENCH_MONGOMOCK"):
+        from mongomock_motor import AsyncMongoMockClient
+
+        main.mongo_client = lambda: AsyncMongoMockClient()
+    return main.app
+
+def serve(port: int, workers: int):
+    """Child process entry point: uvicorn with `workers` processes"""
+    import uvicorn
+
+    sys.path.insert(0, STATUS_CHECKER_DIR)
+    uvicorn.run(
+        "status_worker_scaling:make_app",
+        factory=True,
+        host="127.0.0.1",
+        port=port,
+        workers=workers,
+        log_level="warning",
+        timeout_graceful_shutdown=5,
+    )
+
+@contextmanager
+def status_checker(workers: int, mongo_uri: Optional[str], redis_url: str) -> Iterator[str]:
+    port = free_port()
+    child_env = dict(os.environ)
+    child_env.update({
+        "STATUS_WORKERS": str(workers),
+        "STATUS_SHARED_BACKEND": "redis",
+        "STATUS_REDIS_URL": redis_url,
+        "STATUS_REDIS_CHANNEL": f"bench-{uuid.uuid4().hex[:8]}",
+        "PYTHONPATH": os.pathsep.join(filter(None, [os.path.dirname(os.path.abspath(__file__)), child_env.get("PYTHONPATH")])),
+    })
+    if mongo_uri:
+        child_env["MONGODB_URI"] = mongo_uri
+    else:
+        child_env["BENCH_MONGOMOCK"] = "1"
+    with tempfile.TemporaryDirectory(prefix="status-checker-metrics-") as metrics_dir:
+        child_env["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+        process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--serve", str(port), "--workers", str(workers)],
+            cwd=STATUS_CHECKER_DIR,
+            env=child_env,
+        )
+        url = f"http://127.0.0.1:{port}"
+        try:
+            wait_until(lambda: httpx.get(f"{url}/cache/stats").status_code == 200, 60, "status-checker")
+            yield url
+        finally:
+            process.terminate()
+            process.wait()
+
+async def mixed_load(url: str, args) -> List[Dict]:
+    call_ids = [f"scale-{uuid.uuid4().hex[:8]}-{i}" for i in range(args.calls)]
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        async def add(client, i):
+            return await client.post("/add-status", json={
+                "call_id": call_ids[i % len(call_ids)], "status": f"step-{i}", "metadata": {"bench": True},
+            })
+
+        async def get(client, i):
+            return await client.get(f"/status/{call_ids[i % len(call_ids)]}", params={"limit": args.limit})
+
+        await run_route(client, "warm-up", add, args.concurrency, args.concurrency)
+        return [
+            await run_route(client, "/add-status", add, args.requests, args.concurrency),
+            await run_route(client, "/status/{call_id}", get, args.requests, args.concurrency),
+        ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--mongo-uri", default=None, help="use this MongoDB instead of a local stand-in")
+    parser.add_argument("--redis-url", default=None, help="use this Redis-compatible server instead of fakeredis")
+    parser.add_argument("--requests", type=int, default=4000, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--calls", type=int, default=50, help="distinct call IDs")
+    parser.add_argument("--limit", type=int, default=50, help="rows per status read")
+    parser.add_argument("--serve", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    parser.add_argument("--serve-redis", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_redis:
+        serve_redis(args.serve_redis)
+        return
+    if args.serve:
+        serve(args.serve, args.workers[0])
+        return
+
+    print(f"{'workers':>8}{'route':>22}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    with mongo_stand_in(args.mongo_uri) as (mongo_uri, mongo_kind), redis_stand_in(args.redis_url) as redis_url:
+        for workers in args.workers:
+            with status_checker(workers, mongo_uri, redis_url) as url:
+                for result in asyncio.run(mixed_load(url, args)):
+                    print(f"{workers:>8}{result['route']:>22}{result['throughput_rps']:>10}"
+                          f"{result['p50_ms']:>10}{result['p99_ms']:>10}{result['errors']:>8}")
+    print(f"🧪 Mongo: {mongo_kind}")
+
+if __name__ == "__main__":
+    main()
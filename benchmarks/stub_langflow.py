@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Langflow API used by the memory benchmarks
+Serves the ingestion webhook and the /run search flow with configurable
+latency, slow-request tail, rate-limit errors and webhook outages.
+/run?stream=true emits one event per result, spreading the same latency
+across them
+"""
+
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+class StubLangflowServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # socketserver's default backlog of 5 drops concurrent connects, which then wait out a 1s SYN retry
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        address,
+        latency: float = 0.02,
+        error_rate: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_latency: float = 1.0,
+        results_per_query: int = 5,
+    ):
+        super().__init__(address, StubLangflowHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.results_per_query = results_per_query
+        self.received = 0
+        self.down_until = 0.0
+        self._lock = threading.Lock()
+
+    def outage(self, seconds: float):
+        """Answer the webhook with 503 for the next `seconds`"""
+        self.down_until = time.monotonic() + seconds
+
+    def record(self):
+        with self._lock:
+            self.received += 1
+
+def search_response(query: str, count: int) -> dict:
+    """A /run response in the shape extract_search_results understands"""
+    return {
+        "session_id": "stub",
+        "outputs": [{
+            "results": {
+                "search_results": [
+                    {
+                        "page_content": f"name: User {i}\nsubject: About {query}\nbody: Memory {i} matching {query}",
+                        "metadata": {"name": f"User {i}", "email": f"user{i}@example.com", "subject": f"About {query}"},
+                    }
+                    for i in range(count)
+                ]
+            }
+        }],
+    }
+
+def stream_events(query: str, count: int) -> Iterator[dict]:
+    """The /run?stream=true events for a search: the user's message, one message per hit, then end"""
+    yield {"event": "add_message", "data": {"sender": "User", "text": query}}
+    response = search_response(query, count)
+    for item in response["outputs"][0]["results"]["search_results"]:
+        yield {"event": "add_message", "data": {"sender": "Machine", "text": item["page_content"], "data": item["metadata"]}}
+    yield {"event": "end", "data": {"result": response}}
+
+class StubLangflowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real server
+    disable_nagle_algorithm = True  # TCP_NODELAY, as uvicorn sets, so reused connections don't stall on delayed ACKs
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status: int, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_stream(self, events: Iterator[dict], delay: float):
+        """Chunked newline-delimited events, pausing `delay` before each flow message"""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for event in events:
+            if event["event"] == "add_message" and event["data"]["sender"] != "User":
+                time.sleep(delay)
+            chunk = json.dumps(event).encode() + b"\n\n"
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_POST(self):
+        body = self.read_json()
+        slow = random.random() < self.server.slow_rate
+        latency = self.server.slow_latency if slow else self.server.latency
+        if self.path.startswith("/api/v1/run/") and "stream=true" in self.path:
+            self.server.record()
+            count = self.server.results_per_query
+            self.send_stream(stream_events(body.get("input_value", ""), count), latency / max(1, count))
+            return
+        time.sleep(latency)
+        if self.path.startswith("/api/v1/run/"):
+            self.server.record()
+            self.send_json(200, search_response(body.get("input_value", ""), self.server.results_per_query))
+        elif self.path.startswith("/api/v1/webhook/"):
+            if time.monotonic() < self.server.down_until:
+                self.send_json(503, {"detail": "Service unavailable"})
+                return
+            if random.random() < self.server.error_rate:
+                self.send_json(429, {"detail": "Too many requests"})
+                return
+            self.server.record()
+            self.send_json(202, {"message": "Task started in the background", "status": "in progress"})
+        else:
+            self.send_json(404, {"detail": "Not found"})
+
+@contextmanager
+def run_stub(latency: float = 0.02, error_rate: float = 0.0, **options) -> Iterator[StubLangflowServer]:
+    """Run a stub server on a free local port for the duration of the block"""
+    server = StubLangflowServer(("127.0.0.1", 0), latency=latency, error_rate=error_rate, **options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def base_url(server: StubLangflowServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=7860)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = StubLangflowServer(("127.0.0.1", args.port), latency=args.latency, error_rate=args.error_rate)
+    print(f"🧪 Stub Langflow listening on {base_url(server)}")
+    server.serve_forever()
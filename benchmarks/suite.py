@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmark suite for the Python services
+Starts status-checker against a local Mongo stand-in (a throwaway mongod when
+one is installed, otherwise the in-memory mongomock backend) and the stub
+Langflow server, drives fixed workloads (status ingest bursts, per-call
+polling storms, memory ingest bursts and retrieval fan-out) and writes
+throughput and latency percentiles to JSON, so runs can be compared for
+regressions across commits
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+STATUS_CHECKER_DIR = os.path.join(REPO_DIR, "status-checker")
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, "results")
+
+sys.path.insert(0, os.path.join(REPO_DIR, "memory"))
+
+import httpx  # noqa: E402
+
+from memory_ingest import make_records  # noqa: E402
+from memory_search_many import QUERIES  # noqa: E402
+from status_checker_load import run_route, summarize  # noqa: E402
+from stub_langflow import base_url, run_stub  # noqa: E402
+
+WORKLOADS = ["status_ingest_burst", "status_polling_storm", "memory_ingest_burst", "memory_retrieval_fanout"]
+
+# Metrics compared against a baseline: (field, True when higher is better)
+COMPARED_FIELDS = [("p50_ms", False), ("p99_ms", False), ("throughput_rps", True)]
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_until(check, timeout: float, what: str):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if check():
+                return
+        except Exception:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"{what} did not start within {timeout:.0f}s")
+
+@contextmanager
+def mongo_stand_in(uri: Optional[str]) -> Iterator[Tuple[Optional[str], str]]:
+    """(uri, kind) of the Mongo the service should use; None means in-memory mongomock"""
+    if uri:
+        yield uri, "external"
+        return
+    mongod = shutil.which("mongod")
+    if not mongod:
+        yield None, "mongomock"
+        return
+
+    from pymongo import MongoClient
+
+    port = free_port()
+    with tempfile.TemporaryDirectory() as dbpath:
+        process = subprocess.Popen(
+            [mongod, "--dbpath", dbpath, "--port", str(port), "--bind_ip", "127.0.0.1", "--quiet"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        uri = f"mongodb://127.0.0.1:{port}"
+        try:
+            client = MongoClient(uri, serverSelectionTimeoutMS=500)
+            wait_until(lambda: client.admin.command("ping"), 30, "mongod")
+            client.close()
+            yield uri, "mongod"
+        finally:
+            process.terminate()
+            process.wait()
+
+@contextmanager
+def status_checker(mongo_uri: Optional[str]) -> Iterator[str]:
+    """Run status-checker in a child process and yield its base URL"""
+    port = free_port()
+    command = [sys.executable, os.path.abspath(__file__), "--serve-status-checker", str(port)]
+    child_env = dict(os.environ)
+    if mongo_uri:
+        child_env["MONGODB_URI"] = mongo_uri
+    else:
+        command.append("--mongomock")
+    process = subprocess.Popen(command, cwd=STATUS_CHECKER_DIR, env=child_env)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        wait_until(lambda: httpx.get(f"{url}/cache/stats").status_code == 200, 60, "status-checker")
+        yield url
+    finally:
+        process.terminate()
+        process.wait()
+
+def serve_status_checker(port: int, mongomock: bool):
+    """Child process entry point: the real app, optionally on the in-memory Mongo backend"""
+    import uvicorn
+
+    sys.path.insert(0, STATUS_CHECKER_DIR)
+    import main
+
+    if mongomock:
+        from mongomock_motor import AsyncMongoMockClient
+
+        main.mongo_client = lambda: AsyncMongoMockClient()
+    uvicorn.run(main.app, host="127.0.0.1", port=port, log_level="warning")
+
+async def status_ingest_burst(url: str, args) -> List[Dict]:
+    """Many callers writing statuses at once, per row and in batches"""
+    call_ids = [f"suite-{args.run_id}-ingest-{i}" for i in range(args.calls)]
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        async def add(client, i):
+            return await client.post("/add-status", json={
+                "call_id": call_ids[i % len(call_ids)], "status": f"step-{i}", "metadata": {"suite": True},
+            })
+
+        async def add_batch(client, i):
+            call_id = call_ids[i % len(call_ids)]
+            return await client.post("/add-status/batch", json=[
+                {"call_id": call_id, "status": f"batch-{i}-{j}"} for j in range(args.batch_size)
+            ])
+
+        single = await run_route(client, "/add-status", add, args.requests, args.concurrency)
+        batches = max(1, args.requests // args.batch_size)
+        batch = await run_route(client, "/add-status/batch", add_batch, batches, args.concurrency)
+        batch["rows_per_s"] = round(batch["throughput_rps"] * args.batch_size, 1)
+        return [single, batch]
+
+async def status_polling_storm(url: str, args) -> List[Dict]:
+    """Several pollers per call following the cursor while a writer keeps adding statuses"""
+    call_ids = [f"suite-{args.run_id}-poll-{i}" for i in range(args.calls)]
+    connections = args.calls * (args.pollers_per_call + 1)
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    samples: List[float] = []
+    errors = 0
+    unchanged = 0
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        for call_id in call_ids:
+            await client.post("/add-status", json={"call_id": call_id, "status": "started"})
+
+        async def writer(call_id: str):
+            for i in range(args.polls):
+                await client.post("/add-status", json={"call_id": call_id, "status": f"update-{i}"})
+                await asyncio.sleep(args.poll_interval)
+
+        async def poller(call_id: str):
+            nonlocal errors, unchanged
+            cursor = None
+            for _ in range(args.polls):
+                start = time.perf_counter()
+                try:
+                    response = await client.get(f"/status/{call_id}", params={"cursor": cursor} if cursor else None)
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                if response.status_code == 304:
+                    unchanged += 1
+                elif response.status_code >= 400:
+                    errors += 1
+                    continue
+                samples.append(time.perf_counter() - start)
+                cursor = response.headers.get("X-Next-Cursor", cursor)
+                await asyncio.sleep(args.poll_interval)
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(writer(call_id) for call_id in call_ids),
+            *(poller(call_id) for call_id in call_ids for _ in range(args.pollers_per_call)),
+        )
+        result = summarize("/status/{call_id} (polling)", samples, errors, time.perf_counter() - started)
+    result["not_modified"] = unchanged
+    return [result]
+
+async def memory_ingest_burst(stub_url: str, args) -> List[Dict]:
+    """The bulk ingestion pipeline posting to the stub webhook"""
+    from ingest import ingest
+
+    start = time.perf_counter()
+    stats = await ingest(make_records(args.records), url=f"{stub_url}/api/v1/webhook/suite", concurrency=args.concurrency)
+    elapsed = time.perf_counter() - start
+    return [{
+        "route": "memory ingest",
+        "requests": args.records,
+        "errors": stats["failed"],
+        "throughput_rps": round(stats["sent"] / elapsed, 1),
+    }]
+
+async def memory_retrieval_fanout(stub_url: str, args) -> List[Dict]:
+    """search_many rounds of the call-setup queries against the stub /run flow"""
+    from retrieval import AsyncMemoryRetriever, RetrievalCache
+
+    retriever = AsyncMemoryRetriever("suite", stub_url, cache=RetrievalCache(max_entries=0))
+    samples: List[float] = []
+    errors = 0
+    started = time.perf_counter()
+    try:
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            results = await retriever.search_many(QUERIES, deadline=args.deadline)
+            samples.append(time.perf_counter() - start)
+            errors += sum(1 for value in results.values() if value is None)
+    finally:
+        await retriever.close()
+    result = summarize("search_many", samples, 0, time.perf_counter() - started)
+    result["queries_cut_off"] = errors
+    return [result]
+
+def git_revision() -> Tuple[Optional[str], bool]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_DIR,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> int:
+    """Print the change against `baseline` per route and return how many metrics regressed"""
+    regressions = 0
+    print(f"\n🔁 Against {baseline.get('commit')} ({baseline.get('timestamp')}), threshold {threshold:.0%}")
+    for workload, routes in results["workloads"].items():
+        previous = {route["route"]: route for route in baseline.get("workloads", {}).get(workload, [])}
+        for route in routes:
+            old = previous.get(route["route"])
+            if not old:
+                continue
+            for field, higher_is_better in COMPARED_FIELDS:
+                if field not in route or not old.get(field):
+                    continue
+                change = (route[field] - old[field]) / old[field]
+                regressed = -change > threshold if higher_is_better else change > threshold
+                regressions += regressed
+                marker = "❌" if regressed else "  "
+                print(f"{marker} {workload:<24}{route['route']:<30}{field:<16}"
+                      f"{old[field]:>10} → {route[field]:<10}{change:>+8.1%}")
+    return regressions
+
+async def run_workloads(args, status_url: Optional[str], stub_url: str) -> Dict[str, List[Dict]]:
+    results = {}
+    for name in args.only:
+        random.seed(args.seed)
+        target = status_url if name.startswith("status_") else stub_url
+        print(f"⏱️  {name}...")
+        results[name] = await globals()[name](target, args)
+    return results
+
+def print_results(results: Dict):
+    print("=" * 100)
+    for workload, routes in results["workloads"].items():
+        for route in routes:
+            percentiles = "".join(
+                f"  {field[:-3]}={route[field]:>8}ms" for field in ("p50_ms", "p90_ms", "p99_ms") if field in route
+            )
+            print(f"{workload:<24}{route['route']:<30}rps={route['throughput_rps']:>8}{percentiles}  "
+                  f"errors={route['errors']}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--only", nargs="+", choices=WORKLOADS, default=WORKLOADS)
+    parser.add_argument("--mongo-uri", default=None, help="use this MongoDB instead of a local stand-in")
+    parser.add_argument("--output", default=None, help="results file (default: results/<time>-<commit>.json)")
+    parser.add_argument("--compare", default=None, help="baseline results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative change that counts as a regression")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--requests", type=int, default=2000, help="status writes per ingest burst")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--calls", type=int, default=20, help="distinct call IDs")
+    parser.add_argument("--pollers-per-call", type=int, default=5)
+    parser.add_argument("--polls", type=int, default=40, help="polls per poller")
+    parser.add_argument("--poll-interval", type=float, default=0.05)
+    parser.add_argument("--records", type=int, default=500, help="memories per ingest burst")
+    parser.add_argument("--rounds", type=int, default=30, help="retrieval fan-out rounds")
+    parser.add_argument("--deadline", type=float, default=1.0)
+    parser.add_argument("--stub-latency", type=float, default=0.02)
+    parser.add_argument("--serve-status-checker", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    parser.add_argument("--mongomock", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_status_checker:
+        serve_status_checker(args.serve_status_checker, args.mongomock)
+        return
+
+    commit, dirty = git_revision()
+    # Fresh call IDs per run, so runs against a shared database don't see each other's rows
+    args.run_id = uuid.uuid4().hex[:8]
+    needs_status_checker = any(name.startswith("status_") for name in args.only)
+    with mongo_stand_in(args.mongo_uri) as (mongo_uri, mongo_kind), run_stub(latency=args.stub_latency) as stub:
+        print(f"🧪 Mongo: {mongo_kind}, stub Langflow: {base_url(stub)}")
+        if needs_status_checker:
+            with status_checker(mongo_uri) as status_url:
+                workloads = asyncio.run(run_workloads(args, status_url, base_url(stub)))
+        else:
+            workloads = asyncio.run(run_workloads(args, None, base_url(stub)))
+
+    config = {key: value for key, value in vars(args).items()
+              if key not in ("output", "compare", "serve_status_checker", "mongomock", "run_id")}
+    results = {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "mongo": mongo_kind,
+        "config": config,
+        "workloads": workloads,
+    }
+    print_results(results)
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{commit or 'unknown'}{'-dirty' if dirty else ''}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"⚠️  {regressions} metrics regressed")
+            sys.exit(1)
+        print("✅ No regressions")
+
+if __name__ == "__main__":
+    main()
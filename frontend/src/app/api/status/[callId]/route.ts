@@ -6,16 +6,31 @@ export async function GET(
 ) {
   try {
     const { callId } = await params;
+    const cursor = request.nextUrl.searchParams.get('cursor');
     
-    console.log('🔄 Proxying status request for call:', callId);
+    console.log('🔄 Proxying status request for call:', callId, cursor ? `(cursor ${cursor})` : '');
     
-    const response = await fetch(`https://langflow-status-checker-534113739138.europe-west1.run.app/status/${callId}`, {
+    const statusUrl = new URL(`https://langflow-status-checker-534113739138.europe-west1.run.app/status/${callId}`);
+    if (cursor) {
+      statusUrl.searchParams.set('cursor', cursor);
+    }
+
+    const response = await fetch(statusUrl, {
       method: 'GET',
       headers: {
         'Content-Type': 'application/json',
       },
+      cache: 'no-store',
     });
 
+    // Pass the polling cursor through so the client only asks for newer rows next time
+    const nextCursor = response.headers.get('X-Next-Cursor');
+    const cursorHeaders: Record<string, string> = nextCursor ? { 'X-Next-Cursor': nextCursor } : {};
+
+    if (response.status === 304) {
+      return NextResponse.json([], { headers: cursorHeaders });
+    }
+
     if (!response.ok) {
       if (response.status === 404) {
         console.log('📊 No status updates yet for call:', callId);
@@ -37,7 +52,7 @@ export async function GET(
     
     // Ensure we return an array
     const statusUpdates = Array.isArray(data) ? data : [];
-    return NextResponse.json(statusUpdates);
+    return NextResponse.json(statusUpdates, { headers: cursorHeaders });
   } catch (error) {
     console.error('❌ Status proxy error:', error);
     return NextResponse.json([]);
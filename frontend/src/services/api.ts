@@ -79,10 +79,20 @@ export const makeCall = async (
   }
 };
 
+interface StatusPage {
+  updates: StatusUpdate[];
+  nextCursor: string | null;
+}
+
 // Function to get status updates from status checker
-export const getCallStatus = async (callId: string): Promise<StatusUpdate[]> => {
+// Pass the previous page's nextCursor to only receive updates added since then
+export const getCallStatus = async (callId: string, cursor?: string | null): Promise<StatusPage> => {
+  const page = (updates: StatusUpdate[], nextCursor: string | null = cursor ?? null): StatusPage => ({ updates, nextCursor });
+
   try {
-    const statusUrl = `${STATUS_CHECKER_ENDPOINT}/${callId}`;
+    const statusUrl = cursor
+      ? `${STATUS_CHECKER_ENDPOINT}/${callId}?cursor=${encodeURIComponent(cursor)}`
+      : `${STATUS_CHECKER_ENDPOINT}/${callId}`;
     console.log("📊 Checking status for call:", callId, "at", statusUrl);
     
     const response = await fetch(statusUrl, {
@@ -97,14 +107,15 @@ export const getCallStatus = async (callId: string): Promise<StatusUpdate[]> =>
     if (!response.ok) {
       if (response.status === 404) {
         console.log("📊 No status updates yet for call:", callId);
-        return [];
+        return page([]);
       }
       const errorText = await response.text();
       console.error("❌ Status checker error:", errorText);
       // Don't throw error - just log it and return empty array to keep polling working
-      return [];
+      return page([]);
     }
 
+    const nextCursor = response.headers.get('X-Next-Cursor') ?? cursor ?? null;
     const data = await response.json();
     console.log("📊 Raw status data received:", data);
     
@@ -113,36 +124,36 @@ export const getCallStatus = async (callId: string): Promise<StatusUpdate[]> =>
       if (data.detail.includes("Collection") || data.detail.includes("Cursor")) {
         console.warn("⚠️ Status checker has a database issue:", data.detail);
         console.warn("⚠️ Backend needs to fix the find() cursor handling");
-        return []; // Return empty array when backend has issues
+        return page([]); // Return empty array when backend has issues
       }
     }
     
     // If backend returns a single status object, wrap it in an array
     if (data && !Array.isArray(data) && data.status) {
       console.log("📊 Single status document received, converting to array");
-      return [{
+      return page([{
         timestamp: data.timestamp || new Date().toISOString(),
         status: data.status,
         message: data.message || data.metadata?.message || `Status: ${data.status}`
-      }];
+      }], nextCursor);
     }
     
     // If backend returns an array of status documents
     if (Array.isArray(data)) {
       console.log(`📊 Received ${data.length} status documents`);
       // Transform each document to our StatusUpdate format
-      return data.map(doc => ({
+      return page(data.map(doc => ({
         timestamp: doc.timestamp || new Date().toISOString(),
         status: doc.status || 'unknown',
         message: doc.message || doc.metadata?.message || `Status: ${doc.status || 'unknown'}`
-      }));
+      })), nextCursor);
     }
     
     // Default: ensure we return an array
-    return [];
+    return page([]);
   } catch (error) {
     console.error("❌ Error fetching call status:", error);
-    return [];
+    return page([]);
   }
 };
 
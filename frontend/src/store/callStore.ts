@@ -269,15 +269,20 @@ export const useCallStore = create<CallState>()(
     // Stop any existing polling
     stopStatusPolling();
     
+    // Cursor from the last poll, so each poll only fetches updates added since then
+    let cursor: string | null = null;
+
     // Import the API function dynamically to avoid circular dependency
     const pollStatus = async () => {
       try {
         const { getCallStatus } = await import('@/services/api');
-        const statusUpdates = await getCallStatus(callId);
+        const { updates, nextCursor } = await getCallStatus(callId, cursor);
+        cursor = nextCursor;
         
         const { currentCall, addStatusUpdates } = get();
-        if (currentCall && currentCall.id === callId) {
-          addStatusUpdates(statusUpdates);
+        if (currentCall && currentCall.id === callId && updates.length > 0) {
+          // New updates arrive newest first, ahead of the ones already shown
+          addStatusUpdates([...updates, ...currentCall.statusUpdates]);
         }
       } catch (error) {
         console.error('Status polling error:', error);
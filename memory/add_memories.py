@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 """
 Test script to add dummy memories to the vector database via webhook
+Memories the webhook can't take are spooled rather than lost; with --spool
+they are only spooled, and `python spool.py drain` delivers them
 """
 
-import requests
-import json
-import time
+import argparse
+import asyncio
+
+from dedup import RunDedup
+from ingest import DEFAULT_SEEN_DB, ingest
+from spool import DEFAULT_SPOOL_DB, MemorySpool
 
 # Your webhook URL for the ingestion pipeline
 WEBHOOK_URL = "http://127.0.0.1:7860/api/v1/webhook/a952c6cc-e887-4e2a-a389-386d54e65858"
@@ -61,57 +66,45 @@ memories = [
     }
 ]
 
-def add_memory(memory_data):
-    """Add a single memory to the database"""
-    print(f"Adding memory: {memory_data['subject']}")
-    print(f"Data: {json.dumps(memory_data, indent=2)}")
-    
+def spool_only(spool: MemorySpool) -> int:
+    """Spool the memories not already ingested unchanged, without waiting on the webhook"""
+    dedup = RunDedup(DEFAULT_SEEN_DB)
     try:
-        response = requests.post(
-            WEBHOOK_URL,
-            headers={'Content-Type': 'application/json'},
-            json=memory_data,
-            timeout=30
-        )
-        
-        print(f"Status: {response.status_code}")
-        print(f"Response: {response.text}")
-        
-        if response.status_code in [200, 202]:
-            print("✅ SUCCESS!\n")
-            return True
-        else:
-            print(f"❌ FAILED with status {response.status_code}\n")
-            return False
-            
-    except requests.exceptions.RequestException as e:
-        print(f"❌ ERROR: {e}\n")
-        return False
+        return spool.append_many(memory for memory in memories if dedup.classify(memory))
+    finally:
+        dedup.close()
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--spool", action="store_true", help="only spool the memories and return at once")
+    args = parser.parse_args()
+
     print("🚀 ADDING MEMORIES TO VECTOR DATABASE")
     print("=" * 50)
     
-    success_count = 0
     total_count = len(memories)
-    
-    for i, memory in enumerate(memories, 1):
-        print(f"\n📝 Memory {i}/{total_count}")
-        print("-" * 30)
-        
-        if add_memory(memory):
-            success_count += 1
-        
-        # Add a small delay between requests to avoid overwhelming the server
-        if i < total_count:
-            print("⏳ Waiting 2 seconds...")
-            time.sleep(2)
+    spool = MemorySpool(DEFAULT_SPOOL_DB)
+    try:
+        if args.spool:
+            count = spool_only(spool)
+            print(f"📥 Spooled {count}/{total_count} memories into {DEFAULT_SPOOL_DB}; deliver with: python spool.py drain")
+            return
+
+        # Post through the bulk ingestion pipeline: a few concurrent workers with
+        # retries on 429/5xx instead of a fixed sleep between requests. Memories
+        # already ingested unchanged on a previous run are skipped, and those
+        # that still fail are spooled for `python spool.py drain`.
+        stats = asyncio.run(ingest(memories, url=WEBHOOK_URL, concurrency=4, seen_path=DEFAULT_SEEN_DB, spool=spool))
+    finally:
+        spool.close()
+    success_count = stats["sent"]
     
     print("\n" + "=" * 50)
     print(f"🎉 COMPLETED! {success_count}/{total_count} memories added successfully")
+    print(f"🆕 New: {stats['new']}  ✏️  Updated: {stats['updated']}  ⏭️  Unchanged (skipped): {stats['skipped']}")
     
-    if success_count < total_count:
-        print(f"⚠️  {total_count - success_count} memories failed to add")
+    if stats["spooled"]:
+        print(f"📥 {stats['spooled']} memories spooled in {DEFAULT_SPOOL_DB}; deliver with: python spool.py drain")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Content-hash dedup for memory ingestion
+Keeps a local SQLite index of what has already been sent, so reruns only
+post memories that are new or have changed since the last ingestion
+"""
+
+import hashlib
+import re
+import sqlite3
+from typing import Dict, Optional, Set, Tuple
+
+HASHED_FIELDS = ("name", "email", "subject", "body")
+
+NEW = "new"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+
+def normalize(value) -> str:
+    """Case- and whitespace-insensitive form of a field"""
+    return re.sub(r"\s+", " ", str(value or "")).strip().lower()
+
+def content_hash(record: Dict) -> str:
+    """Stable hash of the fields that end up in the embedding"""
+    joined = "\x1f".join(normalize(record.get(field)) for field in HASHED_FIELDS)
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()
+
+def user_key(value) -> str:
+    """Canonical form of a user key: a normalized email, or a phone number reduced to digits and '+'"""
+    value = str(value or "")
+    if "@" in value:
+        return normalize(value)
+    return re.sub(r"[^0-9+]", "", value)
+
+def record_user(record: Dict) -> str:
+    """Whose memory this is: the sender's email, or their phone number when there is no email"""
+    return user_key(record.get("email") or record.get("phone"))
+
+def with_user(record: Dict) -> Dict:
+    """The record as sent for storage, carrying the canonical "user" that user-scoped searches filter on"""
+    user = record_user(record)
+    return {**record, "user": user} if user else record
+
+def record_key(record: Dict) -> str:
+    """
+    Identity of a memory across runs: an explicit id when the source has one,
+    otherwise sender plus subject, so an edited body counts as an update
+    """
+    if record.get("id"):
+        return f"id:{record['id']}"
+    return f"{normalize(record.get('email'))}|{normalize(record.get('subject'))}"
+
+class SeenIndex:
+    """On-disk map of record key -> content hash of the version last ingested"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, hash TEXT NOT NULL)")
+        self.db.commit()
+
+    def lookup(self, key: str) -> Optional[str]:
+        row = self.db.execute("SELECT hash FROM seen WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def classify(self, record: Dict) -> str:
+        """NEW, UPDATED or UNCHANGED relative to the last ingested version"""
+        previous = self.lookup(record_key(record))
+        if previous is None:
+            return NEW
+        return UNCHANGED if previous == content_hash(record) else UPDATED
+
+    def mark(self, record: Dict):
+        self.db.execute(
+            "INSERT INTO seen (key, hash) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET hash = excluded.hash",
+            (record_key(record), content_hash(record)),
+        )
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+class RunDedup:
+    """
+    Decides which records of one ingestion run to send: not those whose
+    content was last ingested as-is (with a SeenIndex at `seen_path`), nor
+    repeats of a record already sent this run
+    """
+
+    def __init__(self, seen_path: Optional[str] = None):
+        self.seen = SeenIndex(seen_path) if seen_path else None
+        # (key, hash) pairs already queued this run, so duplicates within one input are skipped too
+        self.queued: Set[Tuple[str, str]] = set()
+
+    def classify(self, record: Dict) -> Optional[str]:
+        """NEW or UPDATED for a record to send, None for one to skip"""
+        identity = (record_key(record), content_hash(record))
+        if identity in self.queued:
+            return None
+        kind = self.seen.classify(record) if self.seen else NEW
+        if kind == UNCHANGED:
+            return None
+        self.queued.add(identity)
+        return kind
+
+    def mark(self, record: Dict):
+        """Record that `record` was ingested"""
+        if self.seen:
+            self.seen.mark(record)
+
+    def close(self):
+        if self.seen:
+            self.seen.close()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Batched embedding stage for memory backfills
+Instead of the ingestion flow embedding each memory in its own call, records
+are embedded here in vectorized batches through a pluggable Embedder and
+uploaded with their vectors in bulk, many memories per webhook request.
+Vectors are cached on disk by a hash of the embedded text, so unchanged
+memories are never embedded twice, across batches or runs.
+
+    python embed_ingest.py memories.jsonl --url <bulk webhook URL> --embedder my_models:MiniLM
+    python embed_ingest.py memories.jsonl --local-index ./index   # offline
+
+Each upload is a JSON body {"memories": [...]}, one document per memory with
+its fields, "user", "content" (the embedded text) and "$vector", the shape
+Astra DB's insertMany takes. The hashing embedder is only meant for offline
+use and benchmarks, so uploading its vectors has to be forced.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from http_client import async_client
+from dedup import RunDedup, record_user
+from embeddings import DEFAULT_EMBEDDER, Embedder, load_embedder, memory_text
+from ingest import DEFAULT_SEEN_DB, Ingested, TokenBucket, post_memory, read_records, run_workers
+from local_index import LocalVectorIndex
+from retrieval import DEFAULT_CACHE_DB, RetrievalCache
+
+DEFAULT_EMBEDDING_CACHE_DB = os.getenv("MEMORY_EMBEDDING_CACHE_DB", "memory_embeddings.sqlite")
+
+# Astra DB's insertMany accepts at most 100 documents per call
+DEFAULT_UPLOAD_SIZE = 100
+
+# Hashes looked up per query, below SQLite's bound-parameter limit
+LOOKUP_CHUNK = 500
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def batched(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+class EmbeddingCache:
+    """On-disk map of (embedder name, text hash) -> float32 vector"""
+
+    def __init__(self, path: str = DEFAULT_EMBEDDING_CACHE_DB):
+        self.path = path
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (model TEXT NOT NULL, hash TEXT NOT NULL, vector BLOB NOT NULL, "
+            "PRIMARY KEY (model, hash))"
+        )
+        self.db.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, model: str, hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        for start in range(0, len(hashes), LOOKUP_CHUNK):
+            chunk = hashes[start:start + LOOKUP_CHUNK]
+            rows = self.db.execute(
+                f"SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN ({','.join('?' * len(chunk))})",
+                (model, *chunk),
+            )
+            for digest, vector in rows:
+                found[digest] = np.frombuffer(vector, dtype=np.float32)
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, np.ndarray]):
+        self.db.executemany(
+            "INSERT OR REPLACE INTO embeddings (model, hash, vector) VALUES (?, ?, ?)",
+            [(model, digest, np.asarray(vector, dtype=np.float32).tobytes()) for digest, vector in vectors.items()],
+        )
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+def embed_batch(records: Sequence[Dict], embedder: Embedder, cache: Optional[EmbeddingCache] = None) -> np.ndarray:
+    """
+    Vectors for `records`, one row each. Texts already in `cache` are looked
+    up; the rest, each distinct text once, go to the embedder in a single call.
+    """
+    hashes = [text_hash(memory_text(record)) for record in records]
+    known = cache.get_many(embedder.name, list(dict.fromkeys(hashes))) if cache else {}
+    missing = {digest: record for digest, record in zip(hashes, records) if digest not in known}
+    if cache:
+        cache.hits += len(records) - sum(digest in missing for digest in hashes)
+        cache.misses += len(missing)
+    if missing:
+        fresh = embedder.embed([memory_text(record) for record in missing.values()])
+        fresh = dict(zip(missing, fresh))
+        if cache:
+            cache.put_many(embedder.name, fresh)
+        known.update(fresh)
+    vectors = np.zeros((len(records), embedder.dim), dtype=np.float32)
+    for row, digest in enumerate(hashes):
+        vectors[row] = known[digest]
+    return vectors
+
+def embed_batches(
+    records: Iterable[Dict], embedder: Embedder, cache: Optional[EmbeddingCache] = None, batch_size: int = 256
+) -> Iterator[Tuple[List[Dict], np.ndarray]]:
+    """(records, vectors) for each batch of `batch_size` records"""
+    for batch in batched(records, batch_size):
+        yield batch, embed_batch(batch, embedder, cache)
+
+def upload_document(record: Dict, vector: np.ndarray) -> Dict:
+    """One memory as stored in the vector collection, with its precomputed vector"""
+    document = {field: record.get(field) for field in ("name", "email", "phone", "subject", "body") if record.get(field)}
+    document["user"] = record_user(record)
+    document["content"] = memory_text(record)
+    document["$vector"] = vector.tolist()
+    return document
+
+async def embed_ingest(
+    records: Iterable[Dict],
+    embedder: Optional[Embedder] = None,
+    url: Optional[str] = None,
+    cache: Optional[EmbeddingCache] = None,
+    local_index: Optional[LocalVectorIndex] = None,
+    batch_size: int = 256,
+    upload_size: int = DEFAULT_UPLOAD_SIZE,
+    concurrency: int = 4,
+    rate: Optional[float] = None,
+    max_retries: int = 5,
+    seen_path: Optional[str] = None,
+    timeout: Optional[float] = None,
+    retrieval_cache: Optional[RetrievalCache] = None,
+) -> Dict[str, int]:
+    """
+    Embed `records` in batches of `batch_size` and upload them to `url` in
+    requests of `upload_size` memories through `concurrency` workers, with
+    the same retries as ingest.post_memory. Embedding runs in a thread, so
+    the next batch is embedded while the previous one uploads; a full upload
+    queue pushes back on it. Uploaded memories are added to `local_index`,
+    and without `url` they only go there. With `seen_path`, records whose
+    content was already ingested are skipped before embedding. Stored
+    memories invalidate cached searches of their users as ingest.ingest's
+    do (default: the shared cache at DEFAULT_CACHE_DB). `embedder` defaults
+    to hashing, which is only fit for a local index.
+    """
+    embedder = embedder or load_embedder("hashing", local_index.dim if local_index is not None else None)
+    if local_index is not None:
+        local_index.check_embedder(embedder)
+    dedup = RunDedup(seen_path)
+    own_cache = retrieval_cache is None
+    if own_cache:
+        retrieval_cache = RetrievalCache(disk_path=DEFAULT_CACHE_DB)
+    # Vectors are already computed here, so the local index is fed directly
+    ingested = Ingested(dedup, retrieval_cache)
+    bucket = TokenBucket(rate) if rate else None
+    stats = {"embedded": 0, "cached": 0, "uploaded": 0, "requests": 0, "failed": 0, "skipped": 0}
+
+    def fresh(records: Iterable[Dict]) -> Iterator[Dict]:
+        for record in records:
+            if dedup.classify(record) is None:
+                stats["skipped"] += 1
+                continue
+            yield record
+
+    def delivered(chunk: List[Dict], vectors: np.ndarray):
+        stats["uploaded"] += len(chunk)
+        if local_index is not None:
+            local_index.add(chunk, vectors)
+        ingested.add_many(chunk)
+
+    async def uploads():
+        for batch in batched(fresh(records), batch_size):
+            hits = cache.hits if cache else 0
+            vectors = await asyncio.to_thread(embed_batch, batch, embedder, cache)
+            cached = (cache.hits - hits) if cache else 0
+            stats["cached"] += cached
+            stats["embedded"] += len(batch) - cached
+            if not url:
+                delivered(batch, vectors)
+                continue
+            for start in range(0, len(batch), upload_size):
+                yield batch[start:start + upload_size], vectors[start:start + upload_size]
+
+    async with async_client("webhook", pool_size=concurrency, timeout=timeout) as client:
+        async def upload(item: Tuple[List[Dict], np.ndarray]):
+            chunk, vectors = item
+            payload = {"memories": [upload_document(record, vector) for record, vector in zip(chunk, vectors)]}
+            ok, detail = await post_memory(client, url, payload, bucket, max_retries)
+            stats["requests"] += 1
+            if ok:
+                delivered(chunk, vectors)
+            else:
+                stats["failed"] += len(chunk)
+                print(f"❌ Upload of {len(chunk)} memories failed: {detail}")
+
+        try:
+            await run_workers(uploads(), upload, concurrency if url else 0)
+        finally:
+            dedup.close()
+            if own_cache:
+                retrieval_cache.close()
+
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="memories to ingest, .jsonl or .csv")
+    parser.add_argument("--url", default=os.getenv("MEMORY_BULK_WEBHOOK_URL"),
+                        help="webhook of the flow that stores precomputed vectors")
+    parser.add_argument("--local-index", default=os.getenv("MEMORY_LOCAL_INDEX"),
+                        help="directory of the local vector index to add the memories to")
+    parser.add_argument("--embedder", default=DEFAULT_EMBEDDER, help="'hashing' or module:factory")
+    parser.add_argument("--allow-hashing-upload", action="store_true",
+                        help="upload hashing vectors to --url anyway, e.g. to a test collection")
+    parser.add_argument("--dim", type=int, default=None,
+                        help="embedder dimensions (hashing: 256 unless given); must match an existing --local-index")
+    parser.add_argument("--batch-size", type=int, default=256, help="records per embedding call")
+    parser.add_argument("--upload-size", type=int, default=DEFAULT_UPLOAD_SIZE, help="memories per upload request")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=None, help="max upload requests per second")
+    parser.add_argument("--retries", type=int, default=5)
+    parser.add_argument("--cache-db", default=DEFAULT_EMBEDDING_CACHE_DB, help="embedding cache file")
+    parser.add_argument("--no-cache", action="store_true", help="embed every record, even cached text")
+    parser.add_argument("--seen-db", default=DEFAULT_SEEN_DB, help="content-hash index of ingested memories")
+    parser.add_argument("--no-dedup", action="store_true", help="upload every record, even unchanged ones")
+    parser.add_argument("--retrieval-cache-db", default=DEFAULT_CACHE_DB,
+                        help="retrieval cache to invalidate for each stored user")
+    args = parser.parse_args()
+    if not args.url and not args.local_index:
+        parser.error("give --url (or MEMORY_BULK_WEBHOOK_URL), --local-index, or both")
+    if args.url and args.embedder == "hashing" and not args.allow_hashing_upload:
+        parser.error("the hashing embedder is for offline use; pass --embedder module:factory to upload to --url "
+                     "(or --allow-hashing-upload if hashing vectors are really wanted there)")
+
+    embedder = load_embedder(args.embedder, args.dim)
+    local_index = LocalVectorIndex(args.local_index, dim=embedder.dim) if args.local_index else None
+    cache = None if args.no_cache else EmbeddingCache(args.cache_db)
+    print(f"🚀 Embedding {args.path} with {embedder.name} in batches of {args.batch_size} → {args.url or args.local_index}")
+    start = time.perf_counter()
+    try:
+        stats = asyncio.run(embed_ingest(
+            read_records(args.path),
+            embedder=embedder,
+            url=args.url,
+            cache=cache,
+            local_index=local_index,
+            batch_size=args.batch_size,
+            upload_size=args.upload_size,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            max_retries=args.retries,
+            seen_path=None if args.no_dedup else args.seen_db,
+            retrieval_cache=RetrievalCache(disk_path=args.retrieval_cache_db),
+        ))
+    finally:
+        if cache:
+            cache.close()
+    elapsed = time.perf_counter() - start
+
+    print("=" * 50)
+    print(f"🎉 Stored {stats['uploaded']} memories in {elapsed:.1f}s ({stats['uploaded'] / elapsed:.1f}/s)"
+          + (f" over {stats['requests']} requests" if args.url else ""))
+    print(f"🧮 Embedded: {stats['embedded']}  💾 From cache: {stats['cached']}  ⏭️  Unchanged (skipped): {stats['skipped']}")
+    if stats["failed"]:
+        print(f"⚠️  {stats['failed']} memories failed to upload; rerun to retry them")
+
+if __name__ == "__main__":
+    main()
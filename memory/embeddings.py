@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Embedders for local memory search
+`Embedder` is the interface the local index relies on; `HashingEmbedder` is a
+deterministic, dependency-light implementation (feature hashing of words and
+word bigrams) that works offline and in benchmarks. Other embedders plug in
+by import path through load_embedder, e.g. MEMORY_EMBEDDER=my_models:MiniLM
+"""
+
+import importlib
+import os
+import re
+import zlib
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+DEFAULT_EMBEDDER = os.getenv("MEMORY_EMBEDDER", "hashing")
+
+def memory_text(record: Dict) -> str:
+    """The text a memory is embedded as, matching the fields the ingestion flow sends"""
+    return "\n".join(
+        f"{field}: {record[field]}" for field in ("name", "email", "subject", "body") if record.get(field)
+    )
+
+class Embedder(ABC):
+    """
+    Turns texts into a (len(texts), dim) float32 matrix of L2-normalized rows.
+    `name` identifies the model and its settings, so vectors cached under one
+    embedder are never served for another.
+    """
+
+    dim: int
+    name: str
+
+    @abstractmethod
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        ...
+
+class HashingEmbedder(Embedder):
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text: str) -> List[str]:
+        words = TOKEN_PATTERN.findall(text.lower())
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        rows, digests = [], []
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            rows.extend([row] * len(features))
+            digests.extend(zlib.crc32(feature.encode("utf-8")) for feature in features)
+        digests = np.asarray(digests, dtype=np.uint32)
+        # Low bits pick the bucket, a high bit picks the sign so collisions cancel out
+        signs = np.where(digests & 0x80000000, 1.0, -1.0)
+        cells = np.asarray(rows, dtype=np.int64) * self.dim + digests % self.dim
+        vectors = np.bincount(cells, weights=signs, minlength=len(texts) * self.dim)
+        vectors = vectors.reshape(len(texts), self.dim).astype(np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+def load_embedder(spec: str = DEFAULT_EMBEDDER, dim: Optional[int] = None) -> Embedder:
+    """
+    The embedder named by `spec`: "hashing" for HashingEmbedder (with `dim`
+    dimensions), or "module:factory" for a class or function in an importable
+    module that returns an Embedder when called without arguments
+    """
+    if spec == "hashing":
+        return HashingEmbedder(dim or 256)
+    module_name, _, attribute = spec.partition(":")
+    if not attribute:
+        raise ValueError(f"Embedder '{spec}' is neither 'hashing' nor 'module:factory'")
+    embedder = getattr(importlib.import_module(module_name), attribute)()
+    if not isinstance(embedder, Embedder):
+        raise TypeError(f"{spec} returned {type(embedder).__name__}, not an Embedder")
+    if dim is not None and embedder.dim != dim:
+        raise ValueError(f"{spec} embeds into {embedder.dim} dimensions, expected {dim}")
+    return embedder
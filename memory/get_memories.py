@@ -6,13 +6,23 @@ Addresses response parsing and embedding issues
 
 import requests
 import json
-import time
+import asyncio
+import os
+import ijson
+from dedup import user_key
+from run_parser import iter_search_results, iter_stream_results
+from http_client import TIMEOUTS, get_session, timeout_for
 from typing import Dict, List, Any, Optional
 
 # Configuration
 FLOW_ID = "fbe7f7de-63f9-4e8d-9962-42d6cf6c1387"  # Your flow ID
 BASE_URL = "http://127.0.0.1:7860"
 RUN_URL = f"{BASE_URL}/api/v1/run/{FLOW_ID}?stream=false"
+STREAM_RUN_URL = f"{BASE_URL}/api/v1/run/{FLOW_ID}?stream=true"
+# Vector search component that user-scoped searches pass a metadata filter to
+# (its node ID from the flow's API panel, e.g. "AstraDB-Xy12z"); without it
+# searches can't be scoped to a user
+SEARCH_COMPONENT = os.getenv("MEMORY_SEARCH_COMPONENT")
 
 # Test queries for memory retrieval
 test_queries = [
@@ -25,8 +35,9 @@ test_queries = [
 
 def extract_search_results(response_data: Any) -> List[Dict]:
     """
-    Extract search results from Langflow /run API response
+    Extract search results from an already parsed Langflow /run API response
     Handles multiple response formats from Chat Output components
+    (run_parser.iter_search_results does the same straight from the raw body)
     """
     results = []
     
@@ -121,69 +132,86 @@ def format_search_result(result: Dict) -> str:
     
     return f"📄 [{result_type}] {text}"
 
-def search_memories(query: str) -> Optional[List[Dict]]:
+def user_filter(user: str) -> Dict:
+    """
+    Metadata filter matching one user's memories, by email or by phone number,
+    on the canonical "user" every ingestion path stores with a memory
+    """
+    return {"user": user_key(user)}
+
+def search_payload(query: str, user: Optional[str] = None, component: Optional[str] = None) -> Dict:
+    """
+    Request body for the /run API with a chat input. With `user`, the vector
+    search of `component` (default SEARCH_COMPONENT) is filtered on that user's
+    metadata, so it only scans their memories. Raises ValueError for a user
+    when no component is configured rather than silently searching everyone
+    """
+    tweaks = {}
+    if user:
+        component = component or SEARCH_COMPONENT
+        if not component:
+            raise ValueError("User-scoped search needs the vector search component ID; set MEMORY_SEARCH_COMPONENT")
+        tweaks = {component: {"search_filter": user_filter(user)}}
+    return {"input_value": query, "output_type": "chat", "input_type": "chat", "tweaks": tweaks}
+
+def search_memories(query: str, stream: bool = False, user: Optional[str] = None) -> Optional[List[Dict]]:
     """
     Search for memories using the Langflow /run API
+    With stream=True the flow runs in streaming mode and each result is shown
+    as soon as the flow emits it, rather than after the whole run finishes.
+    With `user` (an email or phone number) only that user's memories are searched
     """
-    print(f"🔍 Searching for: '{query}'")
+    print(f"🔍 Searching for: '{query}'" + (f" in memories of {user}" if user else ""))
     
     # Format payload for Langflow Chat Input
-    payload = {
-        "input_value": query,
-        "output_type": "chat",
-        "input_type": "chat",
-        "tweaks": {
-            # Add any component-specific tweaks here if needed
-        }
-    }
+    payload = search_payload(query, user)
     
     try:
-        response = requests.post(
-            RUN_URL,
+        response = get_session().post(
+            STREAM_RUN_URL if stream else RUN_URL,
             headers={
                 'Content-Type': 'application/json',
                 'Accept': 'application/json'
             },
             json=payload,
-            timeout=30
+            timeout=timeout_for("run"),
+            stream=True
         )
         
         print(f"📡 HTTP Status: {response.status_code}")
         
         if response.status_code == 200:
+            search_results = []
             try:
-                result_data = response.json()
-                print("✅ Response received successfully")
-                
-                # Debug: Show response structure  
-                print(f"🔍 Response type: {type(result_data)}")
-                if isinstance(result_data, dict):
-                    print(f"🔍 Available keys: {list(result_data.keys())}")
-                
-                # Extract and display results
-                search_results = extract_search_results(result_data)
-                
-                if search_results:
-                    print(f"📋 Found {len(search_results)} results:")
-                    print("=" * 50)
-                    
-                    for i, result in enumerate(search_results, 1):
-                        print(f"Result {i}:")
-                        formatted = format_search_result(result)
-                        print(formatted)
-                        print("-" * 30)
-                    
-                    return search_results
+                # Parse straight off the socket in one pass and show each result as it
+                # is read, instead of waiting for and building the whole response tree
+                if stream:
+                    results = iter_stream_results(response.iter_lines())
                 else:
-                    print("📭 No results found")
-                    print("🔍 Debug - Response preview:")
-                    print(json.dumps(result_data, indent=2)[:500] + "...")
-                    return []
-                    
-            except json.JSONDecodeError as e:
+                    response.raw.decode_content = True
+                    results = iter_search_results(response.raw)
+                for i, result in enumerate(results, 1):
+                    if i == 1:
+                        print("✅ Response received successfully")
+                        print("=" * 50)
+                    print(f"Result {i}:")
+                    print(format_search_result(result.to_dict()))
+                    print("-" * 30)
+                    search_results.append(result.to_dict())
+            except (ijson.JSONError, ValueError) as e:
                 print(f"❌ JSON parsing error: {e}")
-                print(f"📄 Raw response preview: {response.text[:200]}...")
                 return None
+            except RuntimeError as e:
+                print(f"❌ Flow error: {e}")
+                return None
+            finally:
+                response.close()
+            
+            if search_results:
+                print(f"📋 Found {len(search_results)} results")
+            else:
+                print("📭 No results found")
+            return search_results
         
         elif response.status_code == 422:
             print("❌ Validation error - check flow configuration")
@@ -200,7 +228,7 @@ def search_memories(query: str) -> Optional[List[Dict]]:
             return None
             
     except requests.exceptions.Timeout:
-        print("⏰ Request timeout (30s)")
+        print(f"⏰ Request timeout ({TIMEOUTS['run']:g}s)")
         return None
     except requests.exceptions.RequestException as e:
         print(f"❌ Network error: {e}")
@@ -211,7 +239,7 @@ def check_flow_health():
     try:
         # Try to get flow information
         flow_info_url = f"{BASE_URL}/api/v1/flows/{FLOW_ID}"
-        response = requests.get(flow_info_url, timeout=10)
+        response = get_session().get(flow_info_url, timeout=timeout_for("flows"))
         
         if response.status_code == 200:
             flow_data = response.json()
@@ -263,26 +291,34 @@ def main():
         print("4. Check Astra DB token and permissions")
         return
     
-    # Run all test queries
+    # Run all test queries concurrently over one pooled connection
     print("\n" + "=" * 60)
     print("🚀 RUNNING ALL TEST QUERIES")
     print("=" * 60)
     
+    from retrieval import AsyncMemoryRetriever  # Imports this module, so import lazily
+    
+    async def run_queries():
+        retriever = AsyncMemoryRetriever(FLOW_ID, BASE_URL)
+        try:
+            return await retriever.search_many(test_queries, deadline=30)
+        finally:
+            await retriever.close()
+    
     all_results = []
     success_count = 0
     
-    for i, query in enumerate(test_queries, 1):
+    for i, (query, results) in enumerate(asyncio.run(run_queries()).items(), 1):
         print(f"\n🎯 Query {i}/{len(test_queries)}: {query}")
         print("-" * 40)
         
-        results = search_memories(query)
         if results:
             success_count += 1
             all_results.extend(results)
-        
-        # Rate limiting
-        if i < len(test_queries):
-            time.sleep(1)
+            for result in results:
+                print(format_search_result(result))
+        else:
+            print("📭 No results found")
     
     # Summary
     print("\n" + "=" * 60)
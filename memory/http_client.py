@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP clients for the memory tools
+One pooled keep-alive requests session per process for the sync scripts,
+and a factory for pooled httpx clients (HTTP/2 when the h2 package is
+installed) for the async ones. Timeouts are set per Langflow endpoint
+rather than hardcoded at each call site.
+"""
+
+import importlib.util
+import os
+import threading
+from typing import Optional, Tuple
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+# Connections kept open per host
+POOL_SIZE = int(os.getenv("MEMORY_HTTP_POOL_SIZE", "16"))
+
+# "auto" uses HTTP/2 for the async clients when h2 is installed, "on"/"off" force it
+HTTP2_MODE = os.getenv("MEMORY_HTTP2", "auto").lower()
+HTTP2 = HTTP2_MODE == "on" or (HTTP2_MODE == "auto" and importlib.util.find_spec("h2") is not None)
+
+CONNECT_TIMEOUT = float(os.getenv("MEMORY_CONNECT_TIMEOUT", "5"))
+
+# Read timeout in seconds per endpoint: ingestion webhook, /run search flow, flow metadata
+TIMEOUTS = {
+    "webhook": float(os.getenv("MEMORY_WEBHOOK_TIMEOUT", "30")),
+    "run": float(os.getenv("MEMORY_RUN_TIMEOUT", "30")),
+    "flows": float(os.getenv("MEMORY_FLOWS_TIMEOUT", "10")),
+}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+def timeout_for(endpoint: str) -> Tuple[float, float]:
+    """(connect, read) timeout for a requests call to `endpoint`"""
+    return (CONNECT_TIMEOUT, TIMEOUTS[endpoint])
+
+def httpx_timeout(endpoint: str, read: Optional[float] = None) -> httpx.Timeout:
+    """The same timeouts as timeout_for, for an httpx client"""
+    return httpx.Timeout(read if read is not None else TIMEOUTS[endpoint], connect=CONNECT_TIMEOUT)
+
+def new_session(pool_size: int = POOL_SIZE) -> requests.Session:
+    """A keep-alive requests session holding up to `pool_size` connections per host"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def get_session() -> requests.Session:
+    """The process-wide session, created on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = new_session()
+        return _session
+
+def close_session():
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+def async_client(
+    endpoint: str,
+    pool_size: int = POOL_SIZE,
+    timeout: Optional[float] = None,
+) -> httpx.AsyncClient:
+    """
+    A pooled keep-alive httpx client for `endpoint`. Async clients belong to
+    one event loop, so each caller creates (and closes) its own.
+    """
+    limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+    return httpx.AsyncClient(limits=limits, timeout=httpx_timeout(endpoint, timeout), http2=HTTP2)
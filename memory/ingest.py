@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Bulk memory ingestion into the Langflow webhook
+Streams records from a JSONL or CSV file and posts them through a bounded
+pool of concurrent workers with token-bucket rate limiting, jittered retries
+on 429/5xx and a resumable checkpoint file. Records whose content was
+already ingested are skipped via a local content-hash index.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+import httpx
+
+from http_client import async_client
+from dedup import RunDedup, content_hash, record_user, with_user
+from retrieval import DEFAULT_CACHE_DB, RetrievalCache
+from embeddings import DEFAULT_EMBEDDER, Embedder, load_embedder, memory_text
+from local_index import LocalVectorIndex
+
+DEFAULT_WEBHOOK_URL = "http://127.0.0.1:7860/api/v1/webhook/a952c6cc-e887-4e2a-a389-386d54e65858"
+DEFAULT_SEEN_DB = os.getenv("MEMORY_SEEN_DB", "memory_seen.sqlite")
+
+# Ingested memories are added to the local index in batches of this many
+LOCAL_INDEX_SYNC_BATCH = 256
+
+# Statuses worth retrying: rate limited or a transient server-side failure
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+Item = TypeVar("Item")
+
+def read_records(path: str) -> Iterator[Dict]:
+    """Yield memory records one at a time from a .jsonl or .csv file"""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+class TokenBucket:
+    """Allows `rate` requests per second on average, with bursts of up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class Checkpoint:
+    """
+    Append-only log of the record positions that were ingested successfully,
+    with the content hash each had at the time. Records finish out of order
+    under concurrency, so every position is logged rather than a single
+    high-water mark. A position only counts as done while its record still
+    has the logged hash, so a record edited in place is sent again.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.done: Dict[int, Optional[str]] = {}
+        self._file = None
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    fields = line.split()
+                    if fields:
+                        # Checkpoints written before hashes were logged hold positions only
+                        self.done[int(fields[0])] = fields[1] if len(fields) > 1 else None
+
+    def contains(self, position: int, record: Dict) -> bool:
+        return self.done.get(position, "") == content_hash(record)
+
+    def mark(self, position: int, record: Dict):
+        digest = content_hash(record)
+        self.done[position] = digest
+        if self.path:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(f"{position} {digest}\n")
+            self._file.flush()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Full-jitter exponential backoff"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+async def post_memory(
+    client: httpx.AsyncClient,
+    url: str,
+    record: Dict,
+    bucket: Optional[TokenBucket] = None,
+    max_retries: int = 5,
+) -> Tuple[bool, str]:
+    """Post one memory, retrying 429/5xx and network errors; returns (ok, detail)"""
+    for attempt in range(max_retries + 1):
+        if bucket:
+            await bucket.acquire()
+        try:
+            response = await client.post(url, json=record)
+        except httpx.HTTPError as e:
+            detail = f"network error: {e}"
+        else:
+            if response.status_code in (200, 202):
+                return True, str(response.status_code)
+            detail = f"HTTP {response.status_code}"
+            if response.status_code not in RETRYABLE_STATUSES:
+                return False, detail
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit() and attempt < max_retries:
+                await asyncio.sleep(int(retry_after))
+                continue
+
+        if attempt < max_retries:
+            await asyncio.sleep(backoff_delay(attempt))
+    return False, detail
+
+async def run_workers(items: AsyncIterator[Item], handle: Callable[[Item], Awaitable[None]], concurrency: int):
+    """
+    Await `handle` on every item through `concurrency` workers. Items are
+    pulled through a bounded queue, so slow workers push back on the producer
+    instead of it buffering the whole input in memory. The first exception
+    `handle` raises stops the run and is re-raised once the workers are done;
+    workers keep taking items off the queue meanwhile, so the producer never
+    blocks on a queue nobody reads.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    errors: List[BaseException] = []
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            if errors:
+                continue
+            try:
+                await handle(item)
+            except Exception as e:
+                errors.append(e)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        async for item in items:
+            if errors:
+                break
+            await queue.put(item)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+    if errors:
+        raise errors[0]
+
+class Ingested:
+    """
+    Bookkeeping for memories the webhook accepted: each is marked in the seen
+    index of `dedup` (and at its position in `checkpoint`), cached searches
+    involving its user are invalidated, and with `local_index` it is embedded
+    into the index in batches of `sync_batch`. Every path that delivers
+    memories goes through this, so none of them leaves the others' state
+    stale. With a local index, a record is only marked once the index has
+    it: marked but unindexed records would be skipped as unchanged by every
+    later run if the process died before the batch was synced.
+    """
+
+    def __init__(
+        self,
+        dedup: Optional[RunDedup] = None,
+        retrieval_cache: Optional[RetrievalCache] = None,
+        local_index: Optional[LocalVectorIndex] = None,
+        embedder: Optional[Embedder] = None,
+        sync_batch: int = LOCAL_INDEX_SYNC_BATCH,
+        checkpoint: Optional[Checkpoint] = None,
+    ):
+        self.dedup = dedup
+        self.checkpoint = checkpoint
+        self.retrieval_cache = retrieval_cache
+        self.local_index = local_index
+        if local_index is not None:
+            embedder = embedder or load_embedder("hashing", local_index.dim)
+            local_index.check_embedder(embedder)
+        self.embedder = embedder
+        self.sync_batch = sync_batch
+        # Delivered (position, record) pairs waiting to be embedded into the local index
+        self.unsynced: List[Tuple[Optional[int], Dict]] = []
+
+    def add(self, record: Dict, position: Optional[int] = None):
+        """Bookkeeping for one delivered record, read at `position` of the input if known"""
+        self._mark(record, position)
+        if self.retrieval_cache:
+            self.retrieval_cache.invalidate_user(record_user(record))
+
+    def add_many(self, records: Iterable[Dict]):
+        """Like add for every record, invalidating each user once, then flush"""
+        users = set()
+        for record in records:
+            self._mark(record)
+            users.add(record_user(record))
+        if self.retrieval_cache:
+            for user in users:
+                self.retrieval_cache.invalidate_user(user)
+        self.flush()
+
+    def _mark(self, record: Dict, position: Optional[int] = None):
+        if self.local_index is None:
+            self._done(record, position)
+            return
+        self.unsynced.append((position, record))
+        if len(self.unsynced) >= self.sync_batch:
+            self.flush()
+
+    def _done(self, record: Dict, position: Optional[int]):
+        if self.checkpoint and position is not None:
+            self.checkpoint.mark(position, record)
+        if self.dedup:
+            self.dedup.mark(record)
+
+    def flush(self):
+        """Embed the records still waiting into the local index, then mark them done"""
+        if self.local_index is None or not self.unsynced:
+            return
+        records = [record for _, record in self.unsynced]
+        self.local_index.add(records, self.embedder.embed([memory_text(record) for record in records]))
+        for position, record in self.unsynced:
+            self._done(record, position)
+        self.unsynced.clear()
+
+async def ingest(
+    records: Iterable[Dict],
+    url: str = DEFAULT_WEBHOOK_URL,
+    concurrency: int = 8,
+    rate: Optional[float] = None,
+    max_retries: int = 5,
+    checkpoint_path: Optional[str] = None,
+    seen_path: Optional[str] = None,
+    retrieval_cache: Optional[RetrievalCache] = None,
+    local_index: Optional[LocalVectorIndex] = None,
+    embedder: Optional[Embedder] = None,
+    timeout: Optional[float] = None,
+    spool=None,
+) -> Dict[str, int]:
+    """
+    Post every record through `concurrency` workers. Records are pulled lazily
+    (see run_workers), so a slow webhook pushes back on the reader. With
+    `seen_path`, records whose content hash matches what was last ingested
+    are skipped. Cached retrieval results involving each ingested user are
+    invalidated in `retrieval_cache` (default: the shared one at
+    DEFAULT_CACHE_DB that the retrievers use), and with `local_index` every
+    ingested memory is also embedded into the local index with `embedder`,
+    which must be the one searches of that index use (default: hashing at
+    the index's dimensions). With `spool` (a spool.MemorySpool), records
+    that still fail after the retries are spooled for its drainer to
+    deliver instead of being lost.
+    """
+    checkpoint = Checkpoint(checkpoint_path)
+    dedup = RunDedup(seen_path)
+    bucket = TokenBucket(rate) if rate else None
+    stats = {"sent": 0, "failed": 0, "spooled": 0, "resumed": 0, "skipped": 0, "new": 0, "updated": 0}
+    own_cache = retrieval_cache is None
+    if own_cache:
+        retrieval_cache = RetrievalCache(disk_path=DEFAULT_CACHE_DB)
+    ingested = Ingested(dedup, retrieval_cache, local_index, embedder, checkpoint=checkpoint)
+
+    async def pending():
+        for position, record in enumerate(records):
+            if checkpoint.contains(position, record):
+                stats["resumed"] += 1
+                continue
+            kind = dedup.classify(record)
+            if kind is None:
+                stats["skipped"] += 1
+                continue
+            yield position, record, kind
+
+    async with async_client("webhook", pool_size=concurrency, timeout=timeout) as client:
+        async def send(item: Tuple[int, Dict, str]):
+            position, record, kind = item
+            ok, detail = await post_memory(client, url, with_user(record), bucket, max_retries)
+            if ok:
+                stats["sent"] += 1
+                stats[kind] += 1
+                ingested.add(record, position)
+            elif spool is not None:
+                # The spool delivers it from here on, so a resumed run doesn't send it again
+                spool.append(record)
+                checkpoint.mark(position, record)
+                stats["spooled"] += 1
+                print(f"📥 Record {position} ({record.get('subject', 'no subject')}) spooled after: {detail}")
+            else:
+                stats["failed"] += 1
+                print(f"❌ Record {position} ({record.get('subject', 'no subject')}) failed: {detail}")
+
+        try:
+            await run_workers(pending(), send, concurrency)
+        finally:
+            ingested.flush()
+            checkpoint.close()
+            dedup.close()
+            if own_cache:
+                retrieval_cache.close()
+
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", help="memories to ingest, .jsonl or .csv")
+    parser.add_argument("--url", default=os.getenv("MEMORY_WEBHOOK_URL", DEFAULT_WEBHOOK_URL))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=None, help="max requests per second")
+    parser.add_argument("--retries", type=int, default=5)
+    parser.add_argument("--checkpoint", default=None, help="resume file (default: <path>.checkpoint)")
+    parser.add_argument("--seen-db", default=DEFAULT_SEEN_DB, help="content-hash index of ingested memories")
+    parser.add_argument("--no-dedup", action="store_true", help="post every record, even unchanged ones")
+    parser.add_argument("--local-index", default=os.getenv("MEMORY_LOCAL_INDEX"),
+                        help="directory of the local vector index to keep in sync")
+    parser.add_argument("--embedder", default=DEFAULT_EMBEDDER,
+                        help="embedder for the local index: 'hashing' or module:factory")
+    parser.add_argument("--retrieval-cache-db", default=DEFAULT_CACHE_DB,
+                        help="retrieval cache to invalidate for each ingested user")
+    args = parser.parse_args()
+    local_index = LocalVectorIndex(args.local_index) if args.local_index else None
+
+    checkpoint = args.checkpoint or f"{args.path}.checkpoint"
+    print(f"🚀 Ingesting {args.path} → {args.url}")
+    start = time.perf_counter()
+    stats = asyncio.run(ingest(
+        read_records(args.path),
+        url=args.url,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        max_retries=args.retries,
+        checkpoint_path=checkpoint,
+        seen_path=None if args.no_dedup else args.seen_db,
+        retrieval_cache=RetrievalCache(disk_path=args.retrieval_cache_db),
+        local_index=local_index,
+        embedder=load_embedder(args.embedder, local_index.dim) if local_index is not None else None,
+    ))
+    elapsed = time.perf_counter() - start
+
+    print("=" * 50)
+    print(f"🎉 Sent {stats['sent']} memories in {elapsed:.1f}s ({stats['sent'] / elapsed:.1f}/s)")
+    print(f"🆕 New: {stats['new']}  ✏️  Updated: {stats['updated']}  ⏭️  Unchanged (skipped): {stats['skipped']}")
+    if stats["resumed"]:
+        print(f"⏭️  Skipped {stats['resumed']} already ingested (checkpoint {checkpoint})")
+    if stats["failed"]:
+        print(f"⚠️  {stats['failed']} memories failed; rerun to retry them")
+
+if __name__ == "__main__":
+    main()
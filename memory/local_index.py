@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Local embedded vector index for memory search
+Keeps memory embeddings in a memory-mapped float32 matrix on disk and answers
+cosine top-k queries in batches, either by brute force or through an IVF
+(inverted file) index for large collections. Rows are also partitioned by
+user (email or phone), so a search scoped to one caller only scores that
+caller's memories. LocalFirstRetriever serves searches from it and falls
+back to the remote Langflow flow on a miss.
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from embeddings import Embedder, HashingEmbedder, memory_text
+from dedup import record_key, record_user, user_key
+
+# Rows scored per matrix multiply when brute-forcing, to bound temporary memory
+SCAN_CHUNK_ROWS = 65536
+
+def spherical_kmeans(vectors: np.ndarray, n_lists: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Unit-length centroids that partition `vectors` by cosine similarity"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        for i in range(n_lists):
+            members = vectors[assignments == i]
+            if len(members):
+                centroids[i] = members.sum(axis=0)
+            else:
+                centroids[i] = vectors[rng.integers(len(vectors))]
+        centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+    return centroids
+
+class LocalVectorIndex:
+    """
+    Append-only on-disk index. Re-adding a record key supersedes its earlier
+    row, so ingesting an updated memory never leaves a stale duplicate.
+    `rows_by_user` maps each user key to the rows of that user's memories.
+    Vectors are written before their records, so after a crash between the
+    two writes both files are cut back to the rows they agree on when the
+    index is next opened.
+    """
+
+    def __init__(self, directory: str, dim: int = 256):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.records_path = os.path.join(directory, "records.jsonl")
+        self.ivf_path = os.path.join(directory, "ivf.npz")
+
+        self.meta_path = os.path.join(directory, "meta.json")
+        # Name of the embedder the vectors came from, recorded by the first check_embedder
+        self.embedder_name: Optional[str] = None
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            dim = meta["dim"]
+            self.embedder_name = meta.get("embedder")
+        self.dim = dim
+        self._save_meta()
+
+        self.records: List[Dict] = []
+        self.rows_by_key: Dict[str, int] = {}
+        self.rows_by_user: Dict[str, List[int]] = {}
+        self._load_records()
+
+        self.centroids: Optional[np.ndarray] = None
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self._lists: Optional[List[np.ndarray]] = None
+        if os.path.exists(self.ivf_path):
+            stored = np.load(self.ivf_path)
+            self.centroids = stored["centroids"]
+            self.assignments = stored["assignments"]
+        self._remap()
+
+    def __len__(self) -> int:
+        return len(self.rows_by_key)
+
+    def _save_meta(self):
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "embedder": self.embedder_name}, f)
+
+    def _load_records(self):
+        """Track every complete record, then cut both files back to the rows present in both"""
+        entries, ends = [], []
+        if os.path.exists(self.records_path):
+            with open(self.records_path, "rb") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line) if line.endswith(b"\n") else None
+                    except ValueError:
+                        entry = None
+                    if entry is None:
+                        break  # A record cut off mid-write, and anything after it
+                    entries.append(entry)
+                    ends.append((ends[-1] if ends else 0) + len(line))
+        row_bytes = self.dim * np.dtype(np.float32).itemsize
+        vector_rows = os.path.getsize(self.vectors_path) // row_bytes if os.path.exists(self.vectors_path) else 0
+        rows = min(len(entries), vector_rows)
+
+        truncated = False
+        for path, size in ((self.records_path, ends[rows - 1] if rows else 0), (self.vectors_path, rows * row_bytes)):
+            if os.path.exists(path) and os.path.getsize(path) != size:
+                os.truncate(path, size)
+                truncated = True
+        if truncated:
+            print(f"⚠️ Local index {self.directory} was partially written; kept the {rows} complete rows")
+        for entry in entries[:rows]:
+            self._track(entry)
+
+    def check_embedder(self, embedder: Embedder):
+        """
+        Tie the index to one embedder: the first one checked is recorded, and
+        any other is refused, since its vectors would not be comparable
+        """
+        if embedder.dim != self.dim:
+            raise ValueError(f"Embedder {embedder.name} has {embedder.dim} dimensions, the index {self.dim}")
+        if self.embedder_name is None:
+            self.embedder_name = embedder.name
+            self._save_meta()
+        elif embedder.name != self.embedder_name:
+            raise ValueError(f"Index {self.directory} holds {self.embedder_name} vectors, not {embedder.name}")
+
+    def _track(self, record: Dict):
+        row = len(self.records)
+        self.rows_by_key[record["key"]] = row
+        # Entries written before partitioning carry no user; derive it from their metadata
+        user = record.get("user", record_user(record["metadata"]))
+        if user:
+            self.rows_by_user.setdefault(user, []).append(row)
+        self.records.append(record)
+
+    def _remap(self):
+        rows = len(self.records)
+        self.matrix = (
+            np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+            if rows else np.zeros((0, self.dim), dtype=np.float32)
+        )
+        self.live = np.zeros(rows, dtype=bool)
+        self.live[list(self.rows_by_key.values())] = True
+        # Rows dropped by _load_records may still have IVF assignments
+        self.assignments = self.assignments[:rows]
+        if self.centroids is not None and len(self.assignments) < rows:
+            # Rows added since the IVF was built go to their nearest list
+            missing = np.asarray(self.matrix[len(self.assignments):])
+            self.assignments = np.concatenate([self.assignments, np.argmax(missing @ self.centroids.T, axis=1).astype(np.int32)])
+        self._lists = None
+
+    def add(self, records: Sequence[Dict], vectors: np.ndarray):
+        """Append memories with their embeddings; rows are L2-normalized on the way in"""
+        if not len(records):
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        with open(self.vectors_path, "ab") as f:
+            f.write(vectors.tobytes())
+        with open(self.records_path, "a", encoding="utf-8") as f:
+            for record in records:
+                entry = {
+                    "key": record_key(record),
+                    "user": record_user(record),
+                    "text": memory_text(record),
+                    "metadata": {field: record.get(field) for field in ("name", "email", "subject", "body")},
+                }
+                f.write(json.dumps(entry) + "\n")
+                self._track(entry)
+        self._remap()
+
+    def build_ivf(self, n_lists: Optional[int] = None, iterations: int = 10, sample_size: int = 100000):
+        """Cluster the collection into `n_lists` inverted lists (default ~sqrt(n)) and persist them"""
+        rows = len(self.records)
+        n_lists = min(rows, n_lists or max(1, int(np.sqrt(rows))))
+        rng = np.random.default_rng(0)
+        sample = np.asarray(self.matrix[rng.choice(rows, size=min(rows, sample_size), replace=False)])
+        self.centroids = spherical_kmeans(sample, n_lists, iterations)
+        self.assignments = np.concatenate([
+            np.argmax(np.asarray(self.matrix[start:start + SCAN_CHUNK_ROWS]) @ self.centroids.T, axis=1)
+            for start in range(0, rows, SCAN_CHUNK_ROWS)
+        ]).astype(np.int32)
+        np.savez(self.ivf_path, centroids=self.centroids, assignments=self.assignments)
+        self._lists = None
+
+    def _inverted_lists(self) -> List[np.ndarray]:
+        if self._lists is None:
+            order = np.argsort(self.assignments, kind="stable")
+            bounds = np.searchsorted(self.assignments[order], np.arange(len(self.centroids) + 1))
+            self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self.centroids))]
+        return self._lists
+
+    def search(
+        self, queries: np.ndarray, k: int = 5, nprobe: Optional[int] = None, user: Optional[str] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Top-k (row, cosine score) per query row. With `user`, only that user's
+        partition is scored, exactly. Otherwise, with an IVF built and `nprobe`
+        given, only the `nprobe` closest lists are scanned; else every row is.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if user:
+            return self._search_partition(queries, k, user_key(user))
+        if not len(self.records):
+            return [[] for _ in queries]
+        if self.centroids is not None and nprobe:
+            return [self._search_ivf(query, k, nprobe) for query in queries]
+        return self._search_brute(queries, k)
+
+    def _search_brute(self, queries: np.ndarray, k: int) -> List[List[Tuple[int, float]]]:
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        best_scores = np.zeros((len(queries), 0), dtype=np.float32)
+        for start in range(0, len(self.records), SCAN_CHUNK_ROWS):
+            chunk = np.asarray(self.matrix[start:start + SCAN_CHUNK_ROWS])
+            scores = queries @ chunk.T
+            scores[:, ~self.live[start:start + len(chunk)]] = -np.inf
+            rows = np.broadcast_to(np.arange(start, start + len(chunk)), scores.shape)
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            best_rows = np.concatenate([best_rows, rows], axis=1)
+            if best_scores.shape[1] > k:
+                keep = np.argpartition(-best_scores, k, axis=1)[:, :k]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+        return [self._ranked(rows, scores, k) for rows, scores in zip(best_rows, best_scores)]
+
+    def _search_partition(self, queries: np.ndarray, k: int, user: str) -> List[List[Tuple[int, float]]]:
+        rows = np.asarray(self.rows_by_user.get(user, ()), dtype=np.int64)
+        rows = rows[self.live[rows]]
+        if not len(rows):
+            return [[] for _ in queries]
+        scores = queries @ np.asarray(self.matrix[rows]).T
+        return [self._ranked(rows, row_scores, k) for row_scores in scores]
+
+    def _search_ivf(self, query: np.ndarray, k: int, nprobe: int) -> List[Tuple[int, float]]:
+        lists = self._inverted_lists()
+        probe = np.argsort(-(self.centroids @ query))[:nprobe]
+        rows = np.concatenate([lists[i] for i in probe])
+        rows = np.sort(rows[self.live[rows]])
+        if not len(rows):
+            return []
+        scores = np.asarray(self.matrix[rows]) @ query
+        return self._ranked(rows, scores, k)
+
+    @staticmethod
+    def _ranked(rows: np.ndarray, scores: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        order = np.argsort(-scores)[:k]
+        return [(int(rows[i]), float(scores[i])) for i in order if np.isfinite(scores[i])]
+
+    def result(self, row: int, score: float) -> Dict:
+        """A hit in the same shape extract_search_results produces"""
+        record = self.records[row]
+        return {"text": record["text"], "metadata": record["metadata"], "type": "local_search_result", "score": score}
+
+class LocalFirstRetriever:
+    """
+    Answers memory searches from the local index when it has a confident hit
+    (top score >= `min_score`) and falls back to the remote flow otherwise
+    """
+
+    def __init__(
+        self,
+        index: LocalVectorIndex,
+        remote=None,
+        embedder: Optional[Embedder] = None,
+        min_score: float = 0.3,
+        nprobe: Optional[int] = 8,
+    ):
+        self.index = index
+        self.remote = remote
+        self.embedder = embedder or HashingEmbedder(index.dim)
+        index.check_embedder(self.embedder)
+        self.min_score = min_score
+        self.nprobe = nprobe
+        self.local_hits = 0
+        self.remote_fallbacks = 0
+
+    def search_many(self, queries: Sequence[str], k: int = 5, user: Optional[str] = None) -> List[List[Dict]]:
+        """
+        Embed and search all queries in one batch, within `user`'s memories if
+        given; misses go to the remote flow one by one, with the same scope
+        """
+        hits = self.index.search(self.embedder.embed(queries), k=k, nprobe=self.nprobe, user=user)
+        results = []
+        for query, ranked in zip(queries, hits):
+            if ranked and ranked[0][1] >= self.min_score:
+                self.local_hits += 1
+                results.append([self.index.result(row, score) for row, score in ranked])
+            elif self.remote is not None:
+                self.remote_fallbacks += 1
+                results.append(self.remote.search(query, user))
+            else:
+                results.append([])
+        return results
+
+    def search(self, query: str, k: int = 5, user: Optional[str] = None) -> List[Dict]:
+        return self.search_many([query], k=k, user=user)[0]
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Cached memory retrieval client for the Langflow /run flow
+Repeated lookups (the same caller's context on every call) are answered from
+an in-memory LRU with TTL, backed by an on-disk SQLite tier shared between
+processes, instead of re-running embedding plus vector search each time.
+Ingesting a user's memories invalidates their cached results, and every
+unscoped result, in all processes sharing the disk tier
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import httpx
+
+from dedup import normalize, record_user, user_key
+from http_client import CONNECT_TIMEOUT, POOL_SIZE, TIMEOUTS, async_client, new_session
+from get_memories import BASE_URL, FLOW_ID, SEARCH_COMPONENT, extract_search_results, search_payload
+from run_parser import iter_stream_results
+
+DEFAULT_CACHE_DB = os.getenv("MEMORY_RETRIEVAL_CACHE_DB", "memory_retrieval_cache.sqlite")
+
+# Tag of results not scoped to a user; any ingested memory may change them
+UNSCOPED = "*"
+
+def cache_key(flow_id: str, query: str, user: Optional[str] = None) -> str:
+    return "\x1f".join((flow_id, user_key(user), normalize(query)))
+
+def result_users(results: List[Dict]) -> Set[str]:
+    """Users whose memories appear in a result set, for invalidation"""
+    users = set()
+    for result in results:
+        user = record_user(result.get("metadata") or {})
+        if user:
+            users.add(user)
+    return users
+
+class DiskTier:
+    """SQLite-backed second tier, shared between processes and runs"""
+
+    def __init__(self, path: str):
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, expires_at REAL NOT NULL, results TEXT NOT NULL)"
+        )
+        self.db.execute("CREATE TABLE IF NOT EXISTS result_users (key TEXT NOT NULL, user TEXT NOT NULL)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS result_users_user ON result_users (user)")
+        # Log of invalidations, so other processes can drop the same entries from their memory tier
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS invalidations (seq INTEGER PRIMARY KEY AUTOINCREMENT, user TEXT NOT NULL, at REAL NOT NULL)"
+        )
+        self.db.commit()
+        self.purge_expired()
+
+    def get(self, key: str) -> Optional[Tuple[float, List[Dict], Set[str]]]:
+        row = self.db.execute("SELECT expires_at, results FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        users = {user for (user,) in self.db.execute("SELECT user FROM result_users WHERE key = ?", (key,))}
+        return row[0], json.loads(row[1]), users
+
+    def put(self, key: str, expires_at: float, results: List[Dict], users: Iterable[str]):
+        self.db.execute(
+            "INSERT OR REPLACE INTO results (key, expires_at, results) VALUES (?, ?, ?)",
+            (key, expires_at, json.dumps(results)),
+        )
+        self.db.execute("DELETE FROM result_users WHERE key = ?", (key,))
+        self.db.executemany("INSERT INTO result_users (key, user) VALUES (?, ?)", [(key, user) for user in users])
+        self.db.commit()
+
+    def delete(self, keys: Iterable[str]):
+        keys = [(key,) for key in keys]
+        self.db.executemany("DELETE FROM results WHERE key = ?", keys)
+        self.db.executemany("DELETE FROM result_users WHERE key = ?", keys)
+        self.db.commit()
+
+    def keys_for_user(self, user: str) -> List[str]:
+        return [row[0] for row in self.db.execute("SELECT key FROM result_users WHERE user = ?", (user,))]
+
+    def invalidate(self, user: str) -> int:
+        """Delete the entries of `user` and unscoped ones, and log it; returns the log sequence number"""
+        self.delete(set(self.keys_for_user(user)) | set(self.keys_for_user(UNSCOPED)))
+        cursor = self.db.execute("INSERT INTO invalidations (user, at) VALUES (?, ?)", (user, time.time()))
+        self.db.commit()
+        return cursor.lastrowid
+
+    def version(self) -> int:
+        """Changes whenever another connection commits to the file"""
+        return self.db.execute("PRAGMA data_version").fetchone()[0]
+
+    def invalidations_since(self, seq: int) -> List[Tuple[int, str]]:
+        return self.db.execute("SELECT seq, user FROM invalidations WHERE seq > ? ORDER BY seq", (seq,)).fetchall()
+
+    def last_invalidation(self) -> int:
+        return self.db.execute("SELECT COALESCE(MAX(seq), 0) FROM invalidations").fetchone()[0]
+
+    def prune_invalidations(self, before: float):
+        """Forget invalidations older than any entry still alive could be"""
+        self.db.execute("DELETE FROM invalidations WHERE at < ?", (before,))
+        self.db.commit()
+
+    def purge_expired(self):
+        now = time.time()
+        expired = [row[0] for row in self.db.execute("SELECT key FROM results WHERE expires_at <= ?", (now,))]
+        self.delete(expired)
+
+    def close(self):
+        self.db.close()
+
+class RetrievalCache:
+    """
+    Two-tier cache of search results keyed on flow ID, user and normalized query.
+    The memory tier is an LRU bounded by `max_entries`; both tiers expire
+    entries `ttl` seconds after they were stored. Entries are tagged with the
+    users they concern, or UNSCOPED. With a disk tier, invalidations made by
+    other processes are applied to the memory tier before it answers.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 600, disk_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk = DiskTier(disk_path) if disk_path else None
+        self._entries: "OrderedDict[str, Tuple[float, List[Dict], Set[str]]]" = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.disk:
+            self.disk.prune_invalidations(time.time() - ttl)
+            self._disk_version = self.disk.version()
+            self._applied = self.disk.last_invalidation()
+            self._own: Set[int] = set()
+
+    def _sync(self):
+        """Apply invalidations other processes logged since the last check"""
+        version = self.disk.version()
+        if version == self._disk_version:
+            return
+        self._disk_version = version
+        for seq, user in self.disk.invalidations_since(self._applied):
+            self._applied = seq
+            if seq in self._own:
+                self._own.discard(seq)
+            else:
+                self._drop(user)
+
+    def _drop(self, user: str):
+        """Drop memory-tier entries for `user` and unscoped ones"""
+        tags = {user, UNSCOPED}
+        stale = [key for key, (_, _, entry_tags) in self._entries.items() if entry_tags & tags]
+        for key in stale:
+            del self._entries[key]
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        now = time.time()
+        if self.disk:
+            self._sync()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        if self.disk:
+            stored = self.disk.get(key)
+            if stored and stored[0] > now:
+                self.disk_hits += 1
+                self._remember(key, *stored)
+                return stored[1]
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, results: List[Dict], users: Iterable[str] = ()):
+        """Store results; `users` names the user a search was scoped to, none for an unscoped search"""
+        expires_at = time.time() + self.ttl
+        users = set(users) or {UNSCOPED}
+        users |= result_users(results)
+        self._remember(key, expires_at, results, users)
+        if self.disk:
+            self.disk.put(key, expires_at, results, users)
+
+    def _remember(self, key: str, expires_at: float, results: List[Dict], users: Set[str]):
+        self._entries[key] = (expires_at, results, users)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_user(self, user: Optional[str]):
+        """
+        Drop every cached result for, or mentioning, `user`, and every unscoped
+        result; call after ingesting a memory (of no particular user if None)
+        """
+        user = user_key(user)
+        self._drop(user)
+        if self.disk:
+            self._own.add(self.disk.invalidate(user))
+
+    def clear(self):
+        self._entries.clear()
+
+    def close(self):
+        if self.disk:
+            self.disk.close()
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses}
+
+def run_payload(query: str, user: Optional[str] = None, component: Optional[str] = None) -> Dict:
+    """Request body for the Langflow /run API with a chat input, filtered to `user`'s memories if given"""
+    return search_payload(query, user, component)
+
+class MemoryRetriever:
+    """Runs memory searches through the Langflow /run flow, answering repeats from the cache"""
+
+    def __init__(
+        self,
+        flow_id: str = FLOW_ID,
+        base_url: str = BASE_URL,
+        cache: Optional[RetrievalCache] = None,
+        timeout: Optional[float] = None,
+        search_component: Optional[str] = SEARCH_COMPONENT,
+    ):
+        self.flow_id = flow_id
+        self.search_component = search_component
+        self.run_url = f"{base_url}/api/v1/run/{flow_id}?stream=false"
+        self.stream_url = f"{base_url}/api/v1/run/{flow_id}?stream=true"
+        self.cache = cache if cache is not None else RetrievalCache(disk_path=DEFAULT_CACHE_DB)
+        self.timeout = (CONNECT_TIMEOUT, timeout if timeout is not None else TIMEOUTS["run"])
+        self.session = new_session()
+
+    def search(self, query: str, user: Optional[str] = None) -> List[Dict]:
+        """
+        Search results for `query`; with `user` (email or phone) the flow only
+        searches that caller's memories. Raises on HTTP failure
+        """
+        key = cache_key(self.flow_id, query, user)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = self.session.post(self.run_url, json=run_payload(query, user, self.search_component), timeout=self.timeout)
+        response.raise_for_status()
+        results = extract_search_results(response.json())
+
+        self.cache.put(key, results, [user_key(user)] if user else ())
+        return results
+
+    def stream(self, query: str, user: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Like search, but yields each result as soon as the flow emits it so the
+        agent can start speaking before the run finishes. Only a fully read
+        stream is cached.
+        """
+        key = cache_key(self.flow_id, query, user)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield from cached
+            return
+
+        results = []
+        with self.session.post(self.stream_url, json=run_payload(query, user, self.search_component), timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            for result in iter_stream_results(response.iter_lines()):
+                results.append(result.to_dict())
+                yield results[-1]
+
+        self.cache.put(key, results, [user_key(user)] if user else ())
+
+    def invalidate_user(self, user: Optional[str]):
+        self.cache.invalidate_user(user)
+
+    def close(self):
+        self.session.close()
+        if self.cache.disk:
+            self.cache.disk.close()
+
+class AsyncMemoryRetriever:
+    """
+    Async variant for call setup, where several context lookups (caller profile,
+    open tasks, preferences) are needed at once. All searches share one pooled
+    HTTP client and the same cache as MemoryRetriever.
+    """
+
+    def __init__(
+        self,
+        flow_id: str = FLOW_ID,
+        base_url: str = BASE_URL,
+        cache: Optional[RetrievalCache] = None,
+        timeout: Optional[float] = None,
+        max_connections: int = POOL_SIZE,
+        search_component: Optional[str] = SEARCH_COMPONENT,
+    ):
+        self.flow_id = flow_id
+        self.search_component = search_component
+        self.run_url = f"{base_url}/api/v1/run/{flow_id}?stream=false"
+        self.cache = cache if cache is not None else RetrievalCache(disk_path=DEFAULT_CACHE_DB)
+        self.client = async_client("run", pool_size=max_connections, timeout=timeout)
+
+    async def search(self, query: str, user: Optional[str] = None) -> List[Dict]:
+        """
+        Search results for `query`; with `user` (email or phone) the flow only
+        searches that caller's memories. Raises on HTTP failure
+        """
+        key = cache_key(self.flow_id, query, user)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = await self.client.post(self.run_url, json=run_payload(query, user, self.search_component))
+        response.raise_for_status()
+        results = extract_search_results(response.json())
+
+        self.cache.put(key, results, [user_key(user)] if user else ())
+        return results
+
+    async def search_many(
+        self,
+        queries: Sequence[str],
+        user: Optional[str] = None,
+        concurrency: int = 8,
+        deadline: float = 2.0,
+    ) -> Dict[str, Optional[List[Dict]]]:
+        """
+        Run all queries concurrently, at most `concurrency` at a time, giving each
+        `deadline` seconds. Queries that time out or fail map to None, so the
+        caller still gets every result that did arrive in time.
+        """
+        # Raises on a missing search component here, as errors of single searches are swallowed below
+        run_payload("", user, self.search_component)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(query: str) -> Optional[List[Dict]]:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(self.search(query, user), timeout=deadline)
+                except (asyncio.TimeoutError, httpx.HTTPError, ValueError) as e:
+                    print(f"⏰ Memory search for '{query}' gave up: {e!r}")
+                    return None
+
+        unique = list(dict.fromkeys(queries))
+        results = await asyncio.gather(*(one(query) for query in unique))
+        return dict(zip(unique, results))
+
+    async def close(self):
+        await self.client.aclose()
+        if self.cache.disk:
+            self.cache.disk.close()
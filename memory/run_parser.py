@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Streaming parser for Langflow /run responses
+Walks the raw JSON bytes once with ijson and yields a typed SearchResult as
+soon as each message or search hit has been read, without building the
+whole response tree first. Understands the same response formats as
+extract_search_results in get_memories.py (see iter_search_results for
+the one key-order case where they differ), plus the event stream that
+/run?stream=true sends.
+"""
+
+import io
+import json
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+import ijson
+from ijson.common import ObjectBuilder
+
+class SearchResult:
+    __slots__ = ("text", "type", "metadata")
+
+    def __init__(self, text: str, type: str, metadata: Optional[Dict] = None):
+        self.text = text
+        self.type = type
+        self.metadata = metadata or {}
+
+    def to_dict(self) -> Dict:
+        return {"text": self.text, "type": self.type, "metadata": self.metadata}
+
+    def __repr__(self):
+        return f"SearchResult(type={self.type!r}, text={self.text[:40]!r})"
+
+def _message_result(message, result_type: str) -> Optional[SearchResult]:
+    if isinstance(message, str):
+        return SearchResult(message, f"{result_type}_string")
+    if isinstance(message, dict) and "text" in message:
+        return SearchResult(message["text"], result_type, message.get("data", {}))
+    return None
+
+def _item_result(item) -> Optional[SearchResult]:
+    if isinstance(item, dict):
+        return SearchResult(item.get("page_content", str(item)), "search_result", item.get("metadata", {}))
+    return None
+
+def _legacy_result(result) -> Optional[SearchResult]:
+    if isinstance(result, str):
+        return SearchResult(result, "direct_result")
+    if isinstance(result, dict) and "message" in result:
+        message = result["message"]
+        text = message.get("text", str(message)) if isinstance(message, dict) else str(message)
+        return SearchResult(text, "result_message")
+    return None
+
+# Schema: JSON path prefix -> how to turn the value found there into a record
+SCHEMA = {
+    "outputs.item.results.message": lambda value: _message_result(value, "chat_output"),
+    "outputs.item.results.search_results.item": _item_result,
+    "outputs.item.results.item": _item_result,
+    "result": _legacy_result,
+}
+
+def iter_search_results(source: Union[bytes, str, io.IOBase]) -> Iterator[SearchResult]:
+    """
+    Yield results from a /run response body (bytes, str or a binary file-like
+    object such as a streamed HTTP body) in a single pass. Only the values at
+    the schema paths are materialized, and each is yielded as soon as it is
+    read, except a legacy top-level "result", which waits for the end of the
+    body in case "outputs" follows. Raises ijson.JSONError on bad JSON.
+
+    One difference from extract_search_results: search hits are yielded as
+    they are read, so those an output lists before its "message" are not
+    withheld. Holding every hit back until its output closed would cost the
+    first-result latency and flat memory use this parser is for.
+    """
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    builder = None
+    build_prefix = None
+    depth = 0
+    saw_outputs = False
+    legacy = None
+    # Per output: a message wins over search_results, as in extract_search_results
+    output_has_message = False
+
+    for prefix, event, value in ijson.parse(source, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+            if depth:
+                continue
+            record_prefix, record = build_prefix, SCHEMA[build_prefix](builder.value)
+            builder = None
+        else:
+            if event == "map_key":
+                if prefix == "" and value == "outputs":
+                    saw_outputs = True
+                elif prefix == "outputs.item.results" and value == "message":
+                    output_has_message = True
+                continue
+            if prefix == "outputs.item" and event == "start_map":
+                output_has_message = False
+            if prefix not in SCHEMA or event in ("end_map", "end_array"):
+                continue
+            if prefix == "result" and saw_outputs:
+                continue
+            if prefix == "outputs.item.results.search_results.item" and output_has_message:
+                continue
+            if event in ("start_map", "start_array"):
+                builder = ObjectBuilder()
+                builder.event(event, value)
+                build_prefix = prefix
+                depth = 1
+                continue
+            record_prefix, record = prefix, SCHEMA[prefix](value)
+
+        if record is None:
+            continue
+        if record_prefix == "result":
+            # Only used without "outputs", which may still come later in the body
+            legacy = record
+        else:
+            yield record
+
+    if legacy is not None and not saw_outputs:
+        yield legacy
+
+def results_from_response(response: Dict) -> Iterator[SearchResult]:
+    """The same records iter_search_results yields, from an already parsed response"""
+    if "outputs" in response:
+        for output in response["outputs"] or []:
+            results = output.get("results") if isinstance(output, dict) else None
+            if isinstance(results, dict):
+                if "message" in results:
+                    record = _message_result(results["message"], "chat_output")
+                    if record is not None:
+                        yield record
+                elif isinstance(results.get("search_results"), list):
+                    yield from filter(None, map(_item_result, results["search_results"]))
+            elif isinstance(results, list):
+                yield from filter(None, map(_item_result, results))
+    elif "result" in response:
+        record = _legacy_result(response["result"])
+        if record is not None:
+            yield record
+
+def iter_stream_results(lines: Iterable[Union[bytes, str]]) -> Iterator[SearchResult]:
+    """
+    Yield results from a /run?stream=true event stream (one JSON event per line,
+    blank lines between) as soon as the flow emits them. Chat messages from the
+    flow are yielded as they are added; the final `end` event's full result is
+    only used when no message was streamed before it.
+    """
+    streamed = False
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        event = json.loads(line)
+        kind = event.get("event")
+        data = event.get("data") or {}
+
+        if kind == "add_message" and data.get("sender") != "User" and data.get("text"):
+            streamed = True
+            metadata = data.get("data") if isinstance(data.get("data"), dict) else {}
+            yield SearchResult(data["text"], "chat_output", metadata)
+        elif kind == "end":
+            if not streamed:
+                yield from results_from_response(data.get("result") or {})
+            return
+        elif kind == "error":
+            raise RuntimeError(data.get("error") or data.get("text") or "Langflow flow failed")
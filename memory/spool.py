@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Durable local spool for memory ingestion
+Producers append memories to a SQLite (WAL) file and return at once; a
+drainer pushes them to the Langflow webhook in batches, retrying with
+backoff until each one is accepted. A record is only deleted once the
+webhook has acknowledged it, so delivery is at-least-once: after a crash,
+whatever was spooled or in flight is simply delivered again. Delivered
+memories get the same bookkeeping as ingest.py's (seen index, retrieval
+cache, local index), so a later ingestion run doesn't send them again.
+
+    python spool.py add memories.jsonl     # spool records
+    python spool.py drain --follow         # deliver, waiting for new ones
+    python spool.py stats
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from dedup import RunDedup, with_user
+from embeddings import DEFAULT_EMBEDDER, load_embedder
+from http_client import async_client
+from ingest import DEFAULT_SEEN_DB, DEFAULT_WEBHOOK_URL, RETRYABLE_STATUSES, Ingested, TokenBucket, backoff_delay, read_records
+from local_index import LocalVectorIndex
+from retrieval import DEFAULT_CACHE_DB, RetrievalCache
+
+DEFAULT_SPOOL_DB = os.getenv("MEMORY_SPOOL_DB", "memory_spool.sqlite")
+
+# Outcomes of one delivery attempt
+DELIVERED = "delivered"
+RETRY = "retry"
+REJECTED = "rejected"
+
+class MemorySpool:
+    """
+    Append-only queue of memories waiting for the webhook. A drainer claims
+    a batch for `lease` seconds; records it neither acknowledges nor
+    reschedules in that time (because it crashed) become due again.
+    Records the webhook rejects outright are moved to a dead table rather
+    than retried forever. With `fsync`, every append survives a power loss,
+    not just a crash of the process.
+    """
+
+    def __init__(self, path: str = DEFAULT_SPOOL_DB, fsync: bool = False):
+        self.path = path
+        # Producers and drainers may be separate processes; wait out each other's writes
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(f"PRAGMA synchronous={'FULL' if fsync else 'NORMAL'}")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS spool (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                record TEXT NOT NULL,
+                enqueued_at REAL NOT NULL,
+                due_at REAL NOT NULL,
+                claimed INTEGER NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS spool_due ON spool (due_at, id)")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS dead (
+                id INTEGER PRIMARY KEY,
+                record TEXT NOT NULL,
+                enqueued_at REAL NOT NULL,
+                attempts INTEGER NOT NULL,
+                error TEXT,
+                failed_at REAL NOT NULL
+            )
+        """)
+        self.db.commit()
+
+    def append(self, record: Dict) -> int:
+        """Spool one memory; returns its spool id"""
+        now = time.time()
+        cursor = self.db.execute(
+            "INSERT INTO spool (record, enqueued_at, due_at) VALUES (?, ?, ?)", (json.dumps(record), now, now)
+        )
+        self.db.commit()
+        return cursor.lastrowid
+
+    def append_many(self, records: Iterable[Dict]) -> int:
+        """Spool many memories in one transaction; returns how many"""
+        now = time.time()
+        with self.db:
+            cursor = self.db.executemany(
+                "INSERT INTO spool (record, enqueued_at, due_at) VALUES (?, ?, ?)",
+                ((json.dumps(record), now, now) for record in records),
+            )
+        return cursor.rowcount
+
+    def claim(self, limit: int, lease: float) -> List[Tuple[int, Dict, int]]:
+        """Take up to `limit` due records, oldest first, as (id, record, attempts)"""
+        now = time.time()
+        with self.db:
+            # BEGIN IMMEDIATE so two drainers can't claim the same rows
+            self.db.execute("BEGIN IMMEDIATE")
+            rows = self.db.execute(
+                "SELECT id, record, attempts FROM spool WHERE due_at <= ? ORDER BY id LIMIT ?", (now, limit)
+            ).fetchall()
+            self.db.executemany(
+                "UPDATE spool SET due_at = ?, claimed = 1 WHERE id = ?", ((now + lease, row[0]) for row in rows)
+            )
+        return [(spool_id, json.loads(record), attempts) for spool_id, record, attempts in rows]
+
+    def finish(
+        self,
+        delivered: List[int],
+        retries: List[Tuple[int, str, float]],
+        rejected: List[Tuple[int, str]],
+    ):
+        """Settle a claimed batch in one transaction: delete delivered ids, reschedule
+        (id, error, delay) retries and move (id, error) rejections to the dead table"""
+        now = time.time()
+        with self.db:
+            self.db.executemany("DELETE FROM spool WHERE id = ?", ((spool_id,) for spool_id in delivered))
+            self.db.executemany(
+                "UPDATE spool SET due_at = ?, claimed = 0, attempts = attempts + 1, last_error = ? WHERE id = ?",
+                ((now + delay, error, spool_id) for spool_id, error, delay in retries),
+            )
+            for spool_id, error in rejected:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO dead (id, record, enqueued_at, attempts, error, failed_at) "
+                    "SELECT id, record, enqueued_at, attempts + 1, ?, ? FROM spool WHERE id = ?",
+                    (error, now, spool_id),
+                )
+                self.db.execute("DELETE FROM spool WHERE id = ?", (spool_id,))
+
+    def recover(self) -> int:
+        """Make batches claimed by a drainer that died due now, instead of when their lease runs out"""
+        with self.db:
+            cursor = self.db.execute("UPDATE spool SET due_at = ?, claimed = 0 WHERE claimed = 1", (time.time(),))
+        return cursor.rowcount
+
+    def requeue_dead(self) -> int:
+        """Give rejected records another go, e.g. after fixing the flow"""
+        now = time.time()
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO spool (id, record, enqueued_at, due_at) SELECT id, record, enqueued_at, ? FROM dead", (now,)
+            )
+            self.db.execute("DELETE FROM dead")
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, float]:
+        pending, oldest = self.db.execute("SELECT COUNT(*), MIN(enqueued_at) FROM spool").fetchone()
+        due = self.db.execute("SELECT COUNT(*) FROM spool WHERE due_at <= ?", (time.time(),)).fetchone()[0]
+        dead = self.db.execute("SELECT COUNT(*) FROM dead").fetchone()[0]
+        return {
+            "pending": pending,
+            "due": due,
+            "dead": dead,
+            "oldest_age_s": round(time.time() - oldest, 1) if oldest else 0.0,
+        }
+
+    def close(self):
+        self.db.close()
+
+async def deliver(client: httpx.AsyncClient, url: str, record: Dict) -> Tuple[str, str, Optional[float]]:
+    """One delivery attempt: (outcome, detail, Retry-After seconds if the webhook sent one)"""
+    try:
+        response = await client.post(url, json=with_user(record))
+    except httpx.HTTPError as e:
+        return RETRY, f"network error: {e}", None
+    if response.status_code in (200, 202):
+        return DELIVERED, str(response.status_code), None
+    detail = f"HTTP {response.status_code}"
+    if response.status_code not in RETRYABLE_STATUSES:
+        return REJECTED, detail, None
+    retry_after = response.headers.get("Retry-After")
+    return RETRY, detail, float(retry_after) if retry_after and retry_after.isdigit() else None
+
+class SpoolDrainer:
+    """
+    Pushes spooled memories to the webhook: claims up to `batch_size` due
+    records, posts them over `concurrency` pooled connections and settles
+    the whole batch in one transaction. Failed records are rescheduled with
+    jittered exponential backoff capped at `max_backoff` seconds. Once a
+    batch is settled, `on_delivered` gets the records delivered from it.
+    """
+
+    def __init__(
+        self,
+        spool: MemorySpool,
+        url: str = DEFAULT_WEBHOOK_URL,
+        batch_size: int = 64,
+        concurrency: int = 8,
+        lease: float = 60.0,
+        max_backoff: float = 300.0,
+        rate: Optional[float] = None,
+        timeout: Optional[float] = None,
+        on_delivered: Optional[Callable[[List[Dict]], None]] = None,
+    ):
+        self.spool = spool
+        self.url = url
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.lease = lease
+        self.max_backoff = max_backoff
+        self.bucket = TokenBucket(rate) if rate else None
+        self.timeout = timeout
+        self.on_delivered = on_delivered
+
+    async def drain_batch(self, client: httpx.AsyncClient) -> Dict[str, int]:
+        """Deliver one claimed batch; an empty result means nothing was due"""
+        batch = self.spool.claim(self.batch_size, self.lease)
+        stats = {"claimed": len(batch), "sent": 0, "retried": 0, "rejected": 0}
+        if not batch:
+            return stats
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def attempt(record: Dict):
+            async with semaphore:
+                if self.bucket:
+                    await self.bucket.acquire()
+                return await deliver(client, self.url, record)
+
+        outcomes = await asyncio.gather(*(attempt(record) for _, record, _ in batch))
+        delivered, retries, rejected = [], [], []
+        records = []
+        for (spool_id, record, attempts), (outcome, detail, retry_after) in zip(batch, outcomes):
+            if outcome == DELIVERED:
+                delivered.append(spool_id)
+                records.append(record)
+            elif outcome == RETRY:
+                delay = retry_after if retry_after is not None else backoff_delay(attempts, base=1.0, cap=self.max_backoff)
+                retries.append((spool_id, detail, delay))
+            else:
+                rejected.append((spool_id, detail))
+                print(f"❌ Spooled record {spool_id} ({record.get('subject', 'no subject')}) rejected: {detail}")
+        self.spool.finish(delivered, retries, rejected)
+        if self.on_delivered and records:
+            self.on_delivered(records)
+        stats.update(sent=len(delivered), retried=len(retries), rejected=len(rejected))
+        return stats
+
+    async def run(self, follow: bool = False, poll_interval: float = 1.0) -> Dict[str, int]:
+        """
+        Drain until nothing is due; with `follow`, keep waiting for new
+        records (and rescheduled retries) until cancelled
+        """
+        totals = {"sent": 0, "retried": 0, "rejected": 0}
+        async with async_client("webhook", pool_size=self.concurrency, timeout=self.timeout) as client:
+            while True:
+                stats = await self.drain_batch(client)
+                for key in totals:
+                    totals[key] += stats[key]
+                if not stats["claimed"]:
+                    if not follow:
+                        return totals
+                    await asyncio.sleep(poll_interval)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=DEFAULT_SPOOL_DB, help="spool file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="spool memories from a .jsonl or .csv file")
+    add.add_argument("path")
+    add.add_argument("--fsync", action="store_true", help="make appends survive a power loss, not just a crash")
+    drain = commands.add_parser("drain", help="deliver spooled memories to the webhook")
+    drain.add_argument("--url", default=os.getenv("MEMORY_WEBHOOK_URL", DEFAULT_WEBHOOK_URL))
+    drain.add_argument("--batch-size", type=int, default=64)
+    drain.add_argument("--concurrency", type=int, default=8)
+    drain.add_argument("--rate", type=float, default=None, help="max requests per second")
+    drain.add_argument("--follow", action="store_true", help="keep running and deliver new records as they arrive")
+    drain.add_argument("--recover", action="store_true",
+                       help="redeliver batches a crashed drainer had claimed without waiting for their lease")
+    drain.add_argument("--seen-db", default=DEFAULT_SEEN_DB, help="content-hash index to mark delivered memories in")
+    drain.add_argument("--retrieval-cache-db", default=DEFAULT_CACHE_DB,
+                       help="retrieval cache to invalidate for each delivered user")
+    drain.add_argument("--local-index", default=os.getenv("MEMORY_LOCAL_INDEX"),
+                       help="directory of the local vector index to keep in sync")
+    drain.add_argument("--embedder", default=DEFAULT_EMBEDDER,
+                       help="embedder for the local index: 'hashing' or module:factory")
+    commands.add_parser("stats", help="show what is waiting")
+    commands.add_parser("requeue-dead", help="retry records the webhook rejected")
+    args = parser.parse_args()
+
+    spool = MemorySpool(args.db, fsync=getattr(args, "fsync", False))
+    try:
+        if args.command == "add":
+            count = spool.append_many(read_records(args.path))
+            print(f"📥 Spooled {count} memories into {args.db}")
+        elif args.command == "drain":
+            if args.recover:
+                print(f"♻️  Recovered {spool.recover()} claimed records")
+            dedup = RunDedup(args.seen_db)
+            local_index = LocalVectorIndex(args.local_index) if args.local_index else None
+            ingested = Ingested(
+                dedup,
+                RetrievalCache(disk_path=args.retrieval_cache_db),
+                local_index,
+                load_embedder(args.embedder, local_index.dim) if local_index is not None else None,
+            )
+            drainer = SpoolDrainer(
+                spool, url=args.url, batch_size=args.batch_size, concurrency=args.concurrency, rate=args.rate,
+                on_delivered=ingested.add_many,
+            )
+            print(f"🚰 Draining {args.db} → {args.url}")
+            try:
+                totals = asyncio.run(drainer.run(follow=args.follow))
+            except KeyboardInterrupt:
+                totals = None
+            finally:
+                dedup.close()
+            if totals:
+                print(f"🎉 Sent {totals['sent']}, rescheduled {totals['retried']}, rejected {totals['rejected']}")
+            print(f"📊 {spool.stats()}")
+        elif args.command == "requeue-dead":
+            print(f"♻️  Requeued {spool.requeue_dead()} rejected records")
+        else:
+            print(json.dumps(spool.stats(), indent=2))
+    finally:
+        spool.close()
+
+if __name__ == "__main__":
+    main()
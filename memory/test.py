@@ -3,10 +3,14 @@
 Test retrieval and display actual retrieved data in a nice format
 """
 
-import requests
+import asyncio
 import json
 from typing import Dict, List, Any
 
+import httpx
+
+from http_client import async_client
+
 # Update this with your actual retrieval webhook URL
 RETRIEVAL_WEBHOOK_URL = "http://127.0.0.1:7860/api/v1/webhook/fbe7f7de-63f9-4e8d-9962-42d6cf6c1387"
 
@@ -63,17 +67,12 @@ def display_retrieved_memories(memories: List[Dict], query: Dict):
         
         print()
 
-def test_memory_retrieval(query_data: Dict) -> Dict[str, Any]:
+async def test_memory_retrieval(client: httpx.AsyncClient, query_data: Dict) -> Dict[str, Any]:
     """Test memory retrieval and return parsed results"""
     print(f"🔍 Testing query: {query_data['subject']}")
     
     try:
-        response = requests.post(
-            RETRIEVAL_WEBHOOK_URL,
-            headers={'Content-Type': 'application/json'},
-            json=query_data,
-            timeout=30
-        )
+        response = await client.post(RETRIEVAL_WEBHOOK_URL, json=query_data)
         
         print(f"📡 HTTP Status: {response.status_code}")
         
@@ -110,10 +109,10 @@ def test_memory_retrieval(query_data: Dict) -> Dict[str, Any]:
             print("✅ Got text response")
             return {"success": True, "text": parsed["data"], "raw_data": parsed["data"]}
             
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         print("⏰ Request timed out")
         return {"success": False, "error": "Timeout"}
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print("🔌 Connection error - is Langflow running?")
         return {"success": False, "error": "Connection error"}
     except Exception as e:
@@ -154,14 +153,17 @@ def main():
         }
     ]
     
+    # Send all test queries at once over one pooled client, then show them in order
+    async def run_queries():
+        async with async_client("webhook", pool_size=len(test_queries)) as client:
+            return await asyncio.gather(*(test_memory_retrieval(client, query) for query in test_queries))
+    
     successful_retrievals = 0
     
-    for i, query in enumerate(test_queries, 1):
+    for i, (query, result) in enumerate(zip(test_queries, asyncio.run(run_queries())), 1):
         print(f"\n🧪 TEST {i}/{len(test_queries)}")
         print("=" * 60)
         
-        result = test_memory_retrieval(query)
-        
         if result["success"]:
             successful_retrievals += 1
             
@@ -176,11 +178,6 @@ def main():
                 print(f"📄 Text response: {result['text']}")
         else:
             print(f"❌ Failed: {result.get('error', 'Unknown error')}")
-        
-        # Wait between requests
-        if i < len(test_queries):
-            import time
-            time.sleep(2)
     
     print(f"\n🎉 SUMMARY: {successful_retrievals}/{len(test_queries)} successful retrievals")
     
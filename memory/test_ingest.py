@@ -0,0 +1,94 @@
+"""
+Ingestion pipeline tests; no webhook is needed
+
+    pip install -r requirements-dev.txt
+    python -m pytest test_ingest.py
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from dedup import NEW, RunDedup
+from embed_ingest import embed_ingest
+from embeddings import HashingEmbedder
+from ingest import Checkpoint, Ingested, ingest, run_workers
+from local_index import LocalVectorIndex
+
+# Not a valid URL, so every post raises httpx.InvalidURL, which post_memory does not retry
+BAD_URL = "http://[::1"
+
+def make_records(count: int):
+    return [
+        {"name": "Test", "email": f"user{i % 7}@example.com", "subject": f"Subject {i}", "body": f"Body {i}"}
+        for i in range(count)
+    ]
+
+async def items(count: int):
+    for item in range(count):
+        yield item
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    # Default seen, cache and checkpoint files land here instead of the source tree
+    monkeypatch.chdir(tmp_path)
+
+def test_run_workers_raises_handler_error():
+    handled = []
+
+    async def handle(item: int):
+        if item == 3:
+            raise RuntimeError("boom")
+        handled.append(item)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(asyncio.wait_for(run_workers(items(1000), handle, concurrency=2), timeout=10))
+    # The run stops soon after the failure instead of handling the whole input
+    assert len(handled) < 100
+
+def test_run_workers_handles_every_item():
+    handled = []
+
+    async def handle(item: int):
+        await asyncio.sleep(0)
+        handled.append(item)
+
+    asyncio.run(run_workers(items(100), handle, concurrency=4))
+    assert sorted(handled) == list(range(100))
+
+def test_ingest_raises_instead_of_hanging():
+    with pytest.raises(httpx.InvalidURL):
+        asyncio.run(asyncio.wait_for(
+            ingest(make_records(50), url=BAD_URL, concurrency=2, max_retries=0),
+            timeout=10,
+        ))
+
+def test_embed_ingest_raises_instead_of_hanging():
+    with pytest.raises(httpx.InvalidURL):
+        asyncio.run(asyncio.wait_for(
+            embed_ingest(make_records(50), HashingEmbedder(64), url=BAD_URL, batch_size=8, upload_size=4,
+                         concurrency=2, max_retries=0),
+            timeout=10,
+        ))
+
+def test_records_are_marked_done_only_once_indexed(tmp_path):
+    index = LocalVectorIndex(str(tmp_path / "index"), dim=32)
+    dedup = RunDedup(str(tmp_path / "seen.sqlite"))
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint"))
+    ingested = Ingested(dedup, local_index=index, embedder=HashingEmbedder(32), sync_batch=10, checkpoint=checkpoint)
+    records = make_records(3)
+    for position, record in enumerate(records):
+        ingested.add(record, position)
+
+    # Killed before the batch was synced: the next run must send these again
+    rerun = RunDedup(str(tmp_path / "seen.sqlite"))
+    assert [rerun.classify(record) for record in records] == [NEW] * 3
+    assert not Checkpoint(str(tmp_path / "checkpoint")).done
+
+    ingested.flush()
+    checkpoint.close()
+    rerun = RunDedup(str(tmp_path / "seen.sqlite"))
+    assert len(index.records) == 3
+    assert [rerun.classify(record) for record in records] == [None] * 3
+    assert sorted(Checkpoint(str(tmp_path / "checkpoint")).done) == [0, 1, 2]
@@ -0,0 +1,64 @@
+"""
+Parity of the streaming /run parser with extract_search_results, and the
+one key-order case where iter_search_results documents a difference
+
+    pip install -r requirements-dev.txt
+    python -m pytest test_run_parser.py
+"""
+
+import json
+
+import pytest
+
+from get_memories import extract_search_results
+from run_parser import iter_search_results, results_from_response
+
+HITS = [
+    {"page_content": "Cardiologist appointment", "metadata": {"email": "a@example.com"}},
+    {"page_content": "Pizza order"},
+]
+
+RESPONSES = {
+    "message object": {"outputs": [{"results": {"message": {"text": "hi", "data": {"id": 1}}}}]},
+    "message string": {"outputs": [{"results": {"message": "hi"}}]},
+    "message before search results": {"outputs": [{"results": {"message": "hi", "search_results": HITS}}]},
+    "unusable message still hides search results": {
+        "outputs": [{"results": {"message": {"no_text": True}, "search_results": HITS}}],
+    },
+    "search results only": {"outputs": [{"results": {"search_results": HITS}}]},
+    "results list": {"outputs": [{"results": HITS}]},
+    "several outputs": {
+        "outputs": [
+            {"results": {"message": "first", "search_results": HITS}},
+            {"results": {"search_results": HITS[:1]}},
+            {"results": HITS[1:]},
+        ],
+    },
+    "legacy result string": {"result": "direct"},
+    "legacy result message": {"result": {"message": {"text": "legacy"}}},
+    "legacy result before outputs": {"result": "ignored", "outputs": [{"results": {"message": "hi"}}]},
+    "legacy result after outputs": {"outputs": [{"results": {"message": "hi"}}], "result": "ignored"},
+    "empty outputs hide legacy result": {"result": "ignored", "outputs": []},
+}
+
+def normalized(results):
+    return [(result["text"], result["type"], result.get("metadata") or {}) for result in results]
+
+@pytest.mark.parametrize("response", RESPONSES.values(), ids=list(RESPONSES))
+def test_streaming_parser_matches_extract_search_results(response):
+    expected = normalized(extract_search_results(response))
+    streamed = normalized(result.to_dict() for result in iter_search_results(json.dumps(response)))
+    parsed = normalized(result.to_dict() for result in results_from_response(response))
+    assert streamed == expected
+    assert parsed == expected
+
+def test_message_hides_search_results_read_after_it():
+    response = RESPONSES["message before search results"]
+    assert [result.type for result in iter_search_results(json.dumps(response))] == ["chat_output_string"]
+
+def test_search_results_before_message_are_yielded():
+    # The documented difference: hits are not held back in case a message follows
+    response = {"outputs": [{"results": {"search_results": HITS, "message": "hi"}}]}
+    streamed = [result.type for result in iter_search_results(json.dumps(response))]
+    assert streamed == ["search_result", "search_result", "chat_output_string"]
+    assert [result.type for result in results_from_response(response)] == ["chat_output_string"]
@@ -0,0 +1,90 @@
+import asyncio
+from collections import deque
+from typing import Deque, Iterable
+
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from metrics import ADMISSION_QUEUE, SHED_REQUESTS
+
+class AdmissionLimiter:
+    """
+    Bounds the requests being worked on at once. Up to `max_in_flight` run;
+    up to `max_queue` more wait, first come first served, for at most
+    `queue_timeout` seconds each. Anything beyond that is refused straight
+    away, so when MongoDB slows down callers get a fast answer instead of
+    joining an ever-growing pile-up.
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int, queue_timeout: float):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> bool:
+        """Take a slot; False means the request should be shed"""
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            SHED_REQUESTS.labels("queue_full").inc()
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        ADMISSION_QUEUE.inc()
+        try:
+            # A released slot is handed straight to the waiter, so in_flight stays as it is
+            await asyncio.wait_for(waiter, self.queue_timeout)
+            return True
+        except asyncio.TimeoutError:
+            SHED_REQUESTS.labels("queue_timeout").inc()
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            ADMISSION_QUEUE.dec()
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+class LoadShedding:
+    """
+    Runs each HTTP request under an AdmissionLimiter slot and answers 503
+    with Retry-After when none is free in time. Long-lived event streams and
+    the probe and metrics paths in `exempt` bypass it.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: AdmissionLimiter, retry_after: int = 1, exempt: Iterable[str] = ()):
+        self.app = app
+        self.limiter = limiter
+        self.retry_after = retry_after
+        self.exempt = set(exempt)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in self.exempt or scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        if not await self.limiter.acquire():
+            response = ORJSONResponse(
+                {"detail": "Service overloaded, retry shortly"},
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.release()
@@ -0,0 +1,41 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from metrics import COALESCED_READS
+
+class SingleFlight:
+    """
+    Collapses concurrent identical reads into one. While a read for a key is
+    in flight, callers asking for the same key wait for its result instead
+    of running their own query. Keys are grouped by call_id so a write can
+    `forget` the call's in-flight reads: reads that start after a write
+    always run fresh and see it.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, Dict[Hashable, asyncio.Future]] = {}
+
+    async def do(self, call_id: str, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        reads = self._inflight.setdefault(call_id, {})
+        future = reads.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            reads[key] = future
+            future.add_done_callback(lambda done: self._finish(call_id, key, done))
+        else:
+            COALESCED_READS.inc()
+        # Shielded so a waiter that disconnects doesn't cancel the read for everyone else
+        return await asyncio.shield(future)
+
+    def _finish(self, call_id: str, key: Hashable, future: asyncio.Future):
+        reads = self._inflight.get(call_id)
+        if reads and reads.get(key) is future:
+            del reads[key]
+            if not reads:
+                del self._inflight[call_id]
+        if not future.cancelled():
+            future.exception()  # Mark a failure as retrieved even if every waiter has gone
+
+    def forget(self, call_id: str):
+        """Let reads of `call_id` that start from now on run their own query"""
+        self._inflight.pop(call_id, None)
@@ -0,0 +1,28 @@
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+class ResponseCompression:
+    """
+    Compresses responses of at least `minimum_size` bytes with gzip, or with
+    Brotli for clients that accept it when `encoding` is "br" (needs the
+    optional brotli-asgi package). Event streams are passed through untouched,
+    since buffering them in a compressor would hold back live events.
+    """
+
+    def __init__(self, app: ASGIApp, encoding: str = "gzip", minimum_size: int = 1024):
+        self.app = app
+        if encoding == "br":
+            from brotli_asgi import BrotliMiddleware
+
+            # Falls back to gzip for clients that don't send Accept-Encoding: br
+            self.compressed = BrotliMiddleware(app, minimum_size=minimum_size, gzip_fallback=True)
+        elif encoding == "gzip":
+            self.compressed = GZipMiddleware(app, minimum_size=minimum_size)
+        else:
+            raise ValueError(f"Unknown compression encoding: {encoding}")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+        else:
+            await self.compressed(scope, receive, send)
@@ -0,0 +1,78 @@
+import base64
+import binascii
+from datetime import datetime, timedelta, timezone
+from typing import FrozenSet, Iterable, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+OBJECT_ID_BYTES = 12
+
+def settle_point(settle_seconds: float) -> ObjectId:
+    """Smallest ObjectId a row written `settle_seconds` ago or later can have"""
+    return ObjectId.from_datetime(datetime.now(timezone.utc) - timedelta(seconds=settle_seconds))
+
+class StatusCursor:
+    """
+    A client's position in a call's rows. Every row with an _id at or below
+    `watermark` has been delivered, as have the rows in `seen`.
+
+    _ids are assigned before the insert is sent, so concurrent inserts (and
+    those of other workers, whose ObjectIds are not ordered by write time)
+    can become visible out of _id order. The watermark therefore only moves
+    up to the settle point: rows whose _id is older than the settle window
+    are assumed written and visible. Rows delivered above it are carried in
+    `seen` so they are not sent again, while rows below them that show up
+    late still are.
+    """
+
+    def __init__(self, watermark: ObjectId, seen: Iterable[ObjectId] = ()):
+        self.watermark = watermark
+        self.seen: FrozenSet[ObjectId] = frozenset(oid for oid in seen if oid > watermark)
+
+    @classmethod
+    def parse(cls, token: str) -> "StatusCursor":
+        """A cursor from its token; a plain ObjectId, as older clients hold, is a bare watermark"""
+        if len(token) == 24:
+            return cls(ObjectId(token))
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        except (binascii.Error, ValueError):
+            raise InvalidId(token)
+        if not raw or len(raw) % OBJECT_ID_BYTES:
+            raise InvalidId(token)
+        ids = [ObjectId(raw[start:start + OBJECT_ID_BYTES]) for start in range(0, len(raw), OBJECT_ID_BYTES)]
+        return cls(ids[0], ids[1:])
+
+    def __str__(self) -> str:
+        raw = self.watermark.binary + b"".join(oid.binary for oid in sorted(self.seen))
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def query(self) -> dict:
+        """MongoDB condition on _id matching the rows not yet delivered"""
+        condition = {"$gt": self.watermark}
+        if self.seen:
+            condition["$nin"] = sorted(self.seen)
+        return condition
+
+    def is_new(self, row: dict) -> bool:
+        return row["_id"] > self.watermark and row["_id"] not in self.seen
+
+    def advance(
+        self,
+        delivered: Iterable[dict],
+        settled: Optional[ObjectId],
+        max_pending: int,
+    ) -> "StatusCursor":
+        """
+        The cursor after `delivered` rows were sent, with the watermark raised
+        to `settled` (None keeps it where it is). Past `max_pending` remembered
+        rows the watermark is raised over the oldest of them instead, trading
+        the out-of-order guarantee for a bounded cursor on very busy calls.
+        """
+        watermark = max(self.watermark, settled) if settled else self.watermark
+        seen = sorted(oid for oid in self.seen.union(row["_id"] for row in delivered) if oid > watermark)
+        if len(seen) > max_pending:
+            cut = len(seen) - max_pending
+            watermark, seen = seen[cut - 1], seen[cut:]
+        return StatusCursor(watermark, seen)
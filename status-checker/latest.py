@@ -0,0 +1,83 @@
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Sequence
+
+from metrics import time_mongo
+
+# pymongo is imported where it is used, so it isn't loaded until the driver itself is
+if TYPE_CHECKING:
+    from pymongo import UpdateOne
+
+# Fields of a call_latest document returned to clients
+LATEST_PROJECTION = {"_id": 0, "call_id": 1, "status": 1, "timestamp": 1, "metadata": 1, "count": 1}
+
+def latest_update(call_id: str, rows: List[dict]) -> "UpdateOne":
+    """
+    One atomic upsert folding `rows` of a call into its call_latest document.
+    Counts always add up; status and metadata only move forward in time, so
+    rows arriving out of order never roll the snapshot back.
+    """
+    from pymongo import UpdateOne
+
+    newest = max(rows, key=lambda row: row["timestamp"])
+    is_newer = {"$gte": [newest["timestamp"], {"$ifNull": ["$timestamp", datetime.min]}]}
+    return UpdateOne(
+        {"_id": call_id},
+        [{"$set": {
+            "call_id": call_id,
+            "count": {"$add": [{"$ifNull": ["$count", 0]}, len(rows)]},
+            # $literal so a status or metadata starting with '$' is never read as a field path
+            "status": {"$cond": [is_newer, {"$literal": newest["status"]}, "$status"]},
+            "metadata": {"$cond": [is_newer, {"$literal": newest.get("metadata")}, "$metadata"]},
+            "timestamp": {"$max": ["$timestamp", newest["timestamp"]]},
+        }}],
+        upsert=True,
+    )
+
+async def record_latest(latest_collection, documents: Sequence[dict]):
+    """
+    Upsert the snapshot of every call in `documents` in one round-trip. A failure
+    is reported but doesn't fail the write; the next status for the call
+    brings its status and timestamp back up to date.
+    """
+    by_call: Dict[str, List[dict]] = {}
+    for document in documents:
+        by_call.setdefault(document["call_id"], []).append(document)
+    try:
+        with time_mongo("upsert_latest"):
+            await latest_collection.bulk_write(
+                [latest_update(call_id, rows) for call_id, rows in by_call.items()], ordered=False
+            )
+    except Exception as e:
+        print(f"❌ Latest status update failed for {len(by_call)} calls: {e}")
+
+async def backfill_latest(calls_collection, latest_collection, call_ids: Sequence[str]) -> Dict[str, dict]:
+    """
+    Build snapshots for calls written before call_latest existed, from their
+    status rows. Only fills in documents that are still missing.
+    """
+    pipeline = [
+        {"$match": {"call_id": {"$in": list(call_ids)}}},
+        {"$sort": {"call_id": 1, "timestamp": -1}},
+        {"$group": {
+            "_id": "$call_id",
+            "status": {"$first": "$status"},
+            "timestamp": {"$first": "$timestamp"},
+            "metadata": {"$first": "$metadata"},
+            "count": {"$sum": 1},
+        }},
+    ]
+    with time_mongo("backfill_latest"):
+        groups = await calls_collection.aggregate(pipeline).to_list(length=None)
+    snapshots = {}
+    for group in groups:
+        call_id = group.pop("_id")
+        snapshots[call_id] = {"call_id": call_id, **group}
+    if snapshots:
+        from pymongo import UpdateOne
+
+        with time_mongo("upsert_latest"):
+            await latest_collection.bulk_write([
+                UpdateOne({"_id": call_id}, {"$setOnInsert": snapshot}, upsert=True)
+                for call_id, snapshot in snapshots.items()
+            ], ordered=False)
+    return snapshots
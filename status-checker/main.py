@@ -1,21 +1,353 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from pymongo import MongoClient
-from datetime import datetime
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import asyncio
+import orjson
 import os
 from dotenv import load_dotenv
+from admission import AdmissionLimiter, LoadShedding
+from coalesce import SingleFlight
+from cursor import StatusCursor, settle_point
+from compression import ResponseCompression
+from pubsub import StatusBroker
+from shared_state import make_backend
+from warmup import Warmup
+from write_buffer import StatusWriteBuffer
+from status_cache import StatusCache
+from latest import LATEST_PROJECTION, backfill_latest, record_latest
+from retention import CallCompactor, CallSummaries, ensure_ttl_index, filter_rows, merge_rows
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess
+from metrics import RESULT_ROWS, StatusCacheCollector, time_mongo, track_requests
 
 # Load environment variables
 load_dotenv()
 
+# MongoDB connection settings
+MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+MONGODB_TIMEOUT_MS = int(os.getenv("MONGODB_TIMEOUT_MS", "5000"))
+
+# Upper bound on the number of rows a single status lookup returns
+STATUS_MAX_LIMIT = int(os.getenv("STATUS_MAX_LIMIT", "1000"))
+
+# pymongo's sort directions, so pymongo itself isn't imported before the server is up
+ASCENDING = 1
+DESCENDING = -1
+
+# Only the fields the frontend reads from a status row, plus _id for the polling cursor
+STATUS_PROJECTION = {"_id": 1, "call_id": 1, "status": 1, "timestamp": 1, "metadata": 1}
+
+# Response header carrying the cursor to pass back on the next poll
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# A row is assumed written and visible this many seconds after its _id was assigned; covers insert
+# latency, write buffering, the shared-backend fan-out and clock skew between hosts. Rows delivered
+# within the window are remembered in the cursor, up to STATUS_CURSOR_MAX_PENDING of them
+STATUS_CURSOR_SETTLE_SECONDS = float(os.getenv("STATUS_CURSOR_SETTLE_SECONDS", "10"))
+STATUS_CURSOR_MAX_PENDING = int(os.getenv("STATUS_CURSOR_MAX_PENDING", "100"))
+
+# How /add-status persists rows:
+#   direct   - one insert_one per request, acknowledged before responding (default)
+#   buffered - coalesced into insert_many flushes, still acknowledged before responding
+#   async    - coalesced and acknowledged immediately; rows still waiting are lost on a crash
+STATUS_WRITE_MODE = os.getenv("STATUS_WRITE_MODE", "direct")
+if STATUS_WRITE_MODE not in ("direct", "buffered", "async"):
+    raise ValueError(f"Unknown STATUS_WRITE_MODE: {STATUS_WRITE_MODE}")
+WRITE_BUFFER_MAX_SIZE = int(os.getenv("WRITE_BUFFER_MAX_SIZE", "100"))
+WRITE_BUFFER_MAX_DELAY_MS = int(os.getenv("WRITE_BUFFER_MAX_DELAY_MS", "50"))
+
+# Largest batch accepted by /add-status/batch
+STATUS_BATCH_MAX_SIZE = int(os.getenv("STATUS_BATCH_MAX_SIZE", "1000"))
+
+# Hot cache of recent statuses for live calls; STATUS_CACHE_MAX_CALLS=0 disables it
+STATUS_CACHE_MAX_CALLS = int(os.getenv("STATUS_CACHE_MAX_CALLS", "1000"))
+STATUS_CACHE_TTL_SECONDS = float(os.getenv("STATUS_CACHE_TTL_SECONDS", "300"))
+
+# Live stream settings: per-watcher buffer and idle keep-alive interval
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "100"))
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+
+# Compress responses of at least STATUS_COMPRESSION_MIN_BYTES: off, gzip or br (br needs brotli-asgi)
+STATUS_COMPRESSION = os.getenv("STATUS_COMPRESSION", "off")
+STATUS_COMPRESSION_MIN_BYTES = int(os.getenv("STATUS_COMPRESSION_MIN_BYTES", "1024"))
+
+# Status rows (and call summaries) older than this many days are deleted by a TTL index; 0 keeps them forever
+STATUS_RETENTION_DAYS = float(os.getenv("STATUS_RETENTION_DAYS", "0"))
+
+# Compaction of finished calls into one summary document each. When enabled, lookups also read
+# summaries; the job itself runs every STATUS_COMPACTION_INTERVAL_SECONDS (0: another instance runs it)
+STATUS_COMPACTION_ENABLED = os.getenv("STATUS_COMPACTION_ENABLED", "false").lower() in ("1", "true", "yes")
+STATUS_COMPACTION_INTERVAL_SECONDS = float(os.getenv("STATUS_COMPACTION_INTERVAL_SECONDS", "600"))
+STATUS_COMPACTION_MIN_AGE_SECONDS = float(os.getenv("STATUS_COMPACTION_MIN_AGE_SECONDS", "3600"))
+STATUS_FINAL_STATUSES = [
+    status.strip() for status in os.getenv("STATUS_FINAL_STATUSES", "completed,finished,done,failed").split(",") if status.strip()
+]
+# Keep summaries in a MongoDB time-series collection (MongoDB 5.0+) instead of a regular one
+STATUS_SUMMARY_TIMESERIES = os.getenv("STATUS_SUMMARY_TIMESERIES", "false").lower() in ("1", "true", "yes")
+
+# Worker processes started by `python main.py`. Each worker opens its own MongoDB pool, so the
+# server-side connection count is up to STATUS_WORKERS * MONGODB_MAX_POOL_SIZE
+STATUS_WORKERS = int(os.getenv("STATUS_WORKERS", "1"))
+# Seconds in-flight requests get to finish on shutdown before they are cancelled
+STATUS_GRACEFUL_SHUTDOWN_SECONDS = int(os.getenv("STATUS_GRACEFUL_SHUTDOWN_SECONDS", "10"))
+
+# How writes reach the hot cache and live streams of every worker: memory (this process only) or
+# redis (any Redis-compatible server). With several workers and the memory backend the hot cache is off.
+STATUS_SHARED_BACKEND = os.getenv("STATUS_SHARED_BACKEND", "memory")
+STATUS_REDIS_URL = os.getenv("STATUS_REDIS_URL", "redis://localhost:6379/0")
+STATUS_REDIS_CHANNEL = os.getenv("STATUS_REDIS_CHANNEL", "status-checker:statuses")
+
+# Concurrent identical status reads share one MongoDB query
+STATUS_COALESCE_READS = os.getenv("STATUS_COALESCE_READS", "true").lower() in ("1", "true", "yes")
+
+# Admission control, per worker: at most STATUS_MAX_IN_FLIGHT requests are worked on at once and up to
+# STATUS_MAX_QUEUED more wait up to STATUS_QUEUE_TIMEOUT_MS for a slot; the rest get a 503 with
+# Retry-After. STATUS_MAX_IN_FLIGHT=0 disables it
+STATUS_MAX_IN_FLIGHT = int(os.getenv("STATUS_MAX_IN_FLIGHT", "200"))
+STATUS_MAX_QUEUED = int(os.getenv("STATUS_MAX_QUEUED", "400"))
+STATUS_QUEUE_TIMEOUT_MS = int(os.getenv("STATUS_QUEUE_TIMEOUT_MS", "1000"))
+STATUS_RETRY_AFTER_SECONDS = int(os.getenv("STATUS_RETRY_AFTER_SECONDS", "1"))
+
+# Set by prometheus_client's multiprocess mode; /metrics then aggregates all workers
+MULTIPROCESS_METRICS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+def mongo_client():
+    """One pooled async client per process"""
+    # The driver is a sizeable share of import time, so it is only loaded once the server is up
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    return AsyncIOMotorClient(
+        MONGODB_URI,
+        maxPoolSize=MONGODB_MAX_POOL_SIZE,
+        minPoolSize=MONGODB_MIN_POOL_SIZE,
+        serverSelectionTimeoutMS=MONGODB_TIMEOUT_MS,
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    broker = StatusBroker(queue_size=STREAM_QUEUE_SIZE)
+    app.state.status_broker = broker
+    status_cache = None
+    if STATUS_CACHE_MAX_CALLS > 0 and (STATUS_WORKERS == 1 or STATUS_SHARED_BACKEND != "memory"):
+        status_cache = StatusCache(
+            max_calls=STATUS_CACHE_MAX_CALLS,
+            max_rows=STATUS_MAX_LIMIT,
+            ttl=STATUS_CACHE_TTL_SECONDS,
+        )
+    app.state.status_cache = status_cache
+    status_reads = SingleFlight() if STATUS_COALESCE_READS else None
+    app.state.status_reads = status_reads
+    if STATUS_WORKERS > 1 and STATUS_SHARED_BACKEND == "memory":
+        print("⚠️ STATUS_WORKERS > 1 with the memory backend: hot cache off, live streams only see this worker's writes")
+    # Carries every write to the hot cache and live streams of all workers
+    shared_state = make_backend(STATUS_SHARED_BACKEND, STATUS_REDIS_URL, STATUS_REDIS_CHANNEL)
+    await shared_state.start(
+        lambda documents: announce_statuses(broker, status_cache, status_reads, documents),
+        on_reset=status_cache.clear if status_cache else None,
+        on_invalidate=lambda call_ids: forget_calls(status_cache, status_reads, call_ids),
+    )
+    app.state.shared_state = shared_state
+    cache_collector = StatusCacheCollector(status_cache) if status_cache and not MULTIPROCESS_METRICS else None
+    if cache_collector:
+        REGISTRY.register(cache_collector)
+
+    app.state.mongo_client = None
+    app.state.call_summaries = None
+    app.state.write_buffer = None
+    app.state.compaction = None
+
+    async def connect():
+        """Everything requests need from MongoDB; they wait for this, not for the warm-up"""
+        if app.state.mongo_client is None:
+            # Resolving a mongodb+srv:// URI is a blocking DNS lookup in the client constructor
+            app.state.mongo_client = await asyncio.to_thread(mongo_client)
+        db = app.state.mongo_client.Ayman  # Using 'Ayman' as the database name
+        calls_collection = db.calls  # Collection for storing call statuses
+        latest_collection = db.call_latest  # Current state per call, keyed by call_id
+        if STATUS_COMPACTION_ENABLED:
+            # Lookups merge compacted rows back in, so they can't be served before this
+            with time_mongo("create_index"):
+                app.state.call_summaries = await CallSummaries.open(
+                    db,
+                    "call_summaries",
+                    retention_seconds=int(STATUS_RETENTION_DAYS * 86400),
+                    timeseries=STATUS_SUMMARY_TIMESERIES,
+                )
+        app.state.calls_collection = calls_collection
+        app.state.latest_collection = latest_collection
+        if STATUS_WRITE_MODE != "direct":
+            app.state.write_buffer = StatusWriteBuffer(
+                calls_collection,
+                max_size=WRITE_BUFFER_MAX_SIZE,
+                max_delay=WRITE_BUFFER_MAX_DELAY_MS / 1000,
+                on_flush=shared_state.announce,
+                after_write=lambda documents: record_latest(latest_collection, documents),
+            )
+
+    async def warm_up():
+        calls_collection = app.state.calls_collection
+        latest_collection = app.state.latest_collection
+        # Opens the first pooled connection (TCP, TLS, auth) before a request has to
+        with time_mongo("ping"):
+            await app.state.mongo_client.admin.command("ping")
+        with time_mongo("create_index"):
+            # Serves get_status lookups without a collection scan or in-memory sort
+            await calls_collection.create_index(
+                [("call_id", ASCENDING), ("timestamp", DESCENDING)],
+                name="call_id_timestamp",
+            )
+            # Serves incremental polls: rows above the cursor's watermark
+            await calls_collection.create_index(
+                [("call_id", ASCENDING), ("_id", ASCENDING)],
+                name="call_id_id",
+            )
+            if STATUS_RETENTION_DAYS > 0:
+                # MongoDB's TTL monitor removes rows once their timestamp is older than the retention window
+                await ensure_ttl_index(calls_collection, "timestamp", "timestamp_ttl", int(STATUS_RETENTION_DAYS * 86400))
+                await ensure_ttl_index(latest_collection, "timestamp", "timestamp_ttl", int(STATUS_RETENTION_DAYS * 86400))
+        if STATUS_COMPACTION_ENABLED and STATUS_COMPACTION_INTERVAL_SECONDS > 0:
+            compactor = CallCompactor(
+                calls_collection,
+                app.state.call_summaries,
+                STATUS_FINAL_STATUSES,
+                min_age=STATUS_COMPACTION_MIN_AGE_SECONDS,
+                max_rows=STATUS_MAX_LIMIT,
+            )
+            # Only one worker compacts per interval
+            lock = lambda: shared_state.try_lock("compaction", STATUS_COMPACTION_INTERVAL_SECONDS * 0.9)
+            app.state.compaction = asyncio.create_task(compactor.run(STATUS_COMPACTION_INTERVAL_SECONDS, lock))
+
+    # MongoDB is connected in the background, so a cold start serves /healthz straight away
+    warmup = Warmup(connect, warm_up)
+    app.state.warmup = warmup
+    warmup.start()
+    try:
+        yield
+    finally:
+        await warmup.close()
+        if app.state.compaction:
+            app.state.compaction.cancel()
+            await asyncio.gather(app.state.compaction, return_exceptions=True)
+        if app.state.write_buffer:
+            await app.state.write_buffer.close()
+        await shared_state.close()
+        if cache_collector:
+            REGISTRY.unregister(cache_collector)
+        if app.state.mongo_client:
+            app.state.mongo_client.close()
+
 # Initialize FastAPI app
-app = FastAPI(title="Call Status Checker")
+# orjson serializes datetimes natively, without a jsonable_encoder pass over every row
+app = FastAPI(title="Call Status Checker", lifespan=lifespan, default_response_class=ORJSONResponse)
+if STATUS_COMPRESSION != "off":
+    # Added first so it sits innermost and sees whole response bodies, not the
+    # re-streamed chunks that track_requests passes on
+    app.add_middleware(ResponseCompression, encoding=STATUS_COMPRESSION, minimum_size=STATUS_COMPRESSION_MIN_BYTES)
+if STATUS_MAX_IN_FLIGHT > 0:
+    # Inside track_requests, so shed requests still show up in the request metrics
+    app.add_middleware(
+        LoadShedding,
+        limiter=AdmissionLimiter(STATUS_MAX_IN_FLIGHT, STATUS_MAX_QUEUED, STATUS_QUEUE_TIMEOUT_MS / 1000),
+        retry_after=STATUS_RETRY_AFTER_SECONDS,
+        exempt=("/healthz", "/readyz", "/metrics"),
+    )
+app.middleware("http")(track_requests)
 
-# MongoDB connection
-MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
-client = MongoClient(MONGODB_URI)
-db = client.Ayman  # Using 'Ayman' as the database name
-calls_collection = db.calls  # Collection for storing call statuses
+async def wait_for_mongo(request: Request):
+    """Hold requests that need MongoDB until the startup connection is made, for up to MONGODB_TIMEOUT_MS"""
+    try:
+        await request.app.state.warmup.wait(MONGODB_TIMEOUT_MS / 1000)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=503, detail="MongoDB is not connected yet", headers={"Retry-After": "1"})
+
+async def get_calls_collection(request: Request):
+    await wait_for_mongo(request)
+    return request.app.state.calls_collection
+
+def get_status_broker(request: Request) -> StatusBroker:
+    return request.app.state.status_broker
+
+def get_shared_state(request: Request):
+    return request.app.state.shared_state
+
+async def get_write_buffer(request: Request) -> Optional[StatusWriteBuffer]:
+    await wait_for_mongo(request)
+    return request.app.state.write_buffer
+
+def get_status_cache(request: Request) -> Optional[StatusCache]:
+    return request.app.state.status_cache
+
+def get_status_reads(request: Request) -> Optional[SingleFlight]:
+    return request.app.state.status_reads
+
+async def get_latest_collection(request: Request):
+    await wait_for_mongo(request)
+    return request.app.state.latest_collection
+
+async def get_call_summaries(request: Request) -> Optional[CallSummaries]:
+    await wait_for_mongo(request)
+    return request.app.state.call_summaries
+
+def announce_statuses(
+    broker: StatusBroker,
+    status_cache: Optional[StatusCache],
+    status_reads: Optional[SingleFlight],
+    documents: List[dict],
+):
+    """Make freshly written rows visible to cached reads, new reads and live streams"""
+    for document in documents:
+        if status_reads:
+            status_reads.forget(document["call_id"])
+        if status_cache:
+            status_cache.write_through(document["call_id"], document)
+        broker.publish(document["call_id"], document)
+
+def forget_calls(status_cache: Optional[StatusCache], status_reads: Optional[SingleFlight], call_ids: List[str]):
+    """Drop cached rows of calls another worker wrote to without getting the rows here"""
+    for call_id in call_ids:
+        if status_reads:
+            status_reads.forget(call_id)
+        if status_cache:
+            status_cache.invalidate(call_id)
+
+def as_naive_utc(value: datetime) -> datetime:
+    # MongoDB hands back naive UTC datetimes at millisecond precision (all BSON stores);
+    # keep cached rows and `since` bounds identical to them
+    if value.tzinfo:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+async def compacted_rows(
+    call_summaries: Optional[CallSummaries],
+    call_id: str,
+    since: Optional[datetime] = None,
+    after: Optional[ObjectId] = None,
+) -> List[dict]:
+    """Rows of the call that compaction moved into its summary, newest first"""
+    if call_summaries is None:
+        return []
+    return filter_rows(await call_summaries.rows(call_id), since, after)
+
+def report_write_failure(future: asyncio.Future):
+    if not future.cancelled() and future.exception():
+        print(f"❌ Buffered status write failed: {future.exception()}")
+
+def parse_cursor(cursor: str) -> StatusCursor:
+    try:
+        return StatusCursor.parse(cursor)
+    except InvalidId:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def format_status_event(status: dict, cursor: StatusCursor) -> str:
+    """Render a status row as a Server-Sent Event whose id is the polling cursor just past it"""
+    data = {key: value for key, value in status.items() if key != "_id"}
+    return f"id: {cursor}\nevent: status\ndata: {orjson.dumps(data).decode()}\n\n"
 
 class CallStatus(BaseModel):
     call_id: str
@@ -23,47 +355,373 @@ class CallStatus(BaseModel):
     timestamp: datetime = None
     metadata: dict = None
 
-@app.post("/add-status")
-async def add_status(status: CallStatus):
-    try:
-        # Add current timestamp if not provided
-        if not status.call_id:
-            status.call_id = str('unspecified')
+def prepare_status(status: CallStatus) -> dict:
+    """Fill in defaults and build the document to insert, with its _id assigned up front"""
+    # Add current timestamp if not provided
+    if not status.call_id:
+        status.call_id = str('unspecified')
+
+    if not status.timestamp:
+        status.timestamp = datetime.utcnow()
+    status.timestamp = as_naive_utc(status.timestamp)
+
+    document = status.dict()
+    document["_id"] = ObjectId()
+    return document
+
+class LatestRequest(BaseModel):
+    call_ids: List[str]
 
-        if not status.timestamp:
-            status.timestamp = datetime.utcnow()
+class StatusRow(BaseModel):
+    call_id: str
+    status: str
+    timestamp: Optional[datetime] = None
+    metadata: Optional[dict] = None
+
+class StatusAdded(BaseModel):
+    message: str
+    status_id: str
+
+class StatusBatchAdded(BaseModel):
+    message: str
+    status_ids: List[str]
+
+class LatestStatus(BaseModel):
+    call_id: str
+    status: str
+    timestamp: Optional[datetime] = None
+    metadata: Optional[dict] = None
+    count: int
 
-        # Insert the status into MongoDB
-        result = calls_collection.insert_one(status.dict())
+class LatestStatuses(BaseModel):
+    latest: Dict[str, LatestStatus]
+    missing: List[str]
+
+@app.post("/add-status", response_model=StatusAdded)
+async def add_status(
+    status: CallStatus,
+    calls_collection=Depends(get_calls_collection),
+    latest_collection=Depends(get_latest_collection),
+    shared_state=Depends(get_shared_state),
+    write_buffer: Optional[StatusWriteBuffer] = Depends(get_write_buffer),
+):
+    try:
+        document = prepare_status(status)
+
+        if write_buffer is None:
+            # Insert the status into MongoDB
+            with time_mongo("insert_one"):
+                await calls_collection.insert_one(document)
+            await record_latest(latest_collection, [document])
+            # Update the hot caches and push the new row to anyone streaming this call, on every worker
+            shared_state.announce([document])
+        else:
+            # The buffer announces rows once they are flushed
+            written = write_buffer.add(document)
+            if STATUS_WRITE_MODE == "async":
+                written.add_done_callback(report_write_failure)
+            else:
+                await written
 
         return {
             "message": "Status added successfully",
-            "status_id": str(result.inserted_id)
+            "status_id": str(document["_id"])
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/status/{call_id}")
-async def get_status(call_id: str):
+@app.post("/add-status/batch", response_model=StatusBatchAdded)
+async def add_status_batch(
+    statuses: List[CallStatus],
+    calls_collection=Depends(get_calls_collection),
+    latest_collection=Depends(get_latest_collection),
+    shared_state=Depends(get_shared_state),
+):
+    if not statuses:
+        raise HTTPException(status_code=400, detail="No statuses provided")
+    if len(statuses) > STATUS_BATCH_MAX_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {STATUS_BATCH_MAX_SIZE} statuses")
+
     try:
-        # Find all statuses for the given call_id, sorted by timestamp descending
-        cursor = calls_collection.find(
-            {"call_id": call_id}
-        ).sort("timestamp", -1)
-
-        # Convert cursor to list and handle ObjectId serialization
-        statuses = []
-        for status in cursor:
-            status["_id"] = str(status["_id"])
-            statuses.append(status)
-
-        if not statuses:
+        documents = [prepare_status(status) for status in statuses]
+
+        # One round-trip for the whole batch
+        with time_mongo("insert_many"):
+            await calls_collection.insert_many(documents, ordered=False)
+        await record_latest(latest_collection, documents)
+        shared_state.announce(documents)
+        RESULT_ROWS.labels("/add-status/batch").observe(len(documents))
+
+        return {
+            "message": f"{len(documents)} statuses added successfully",
+            "status_ids": [str(document["_id"]) for document in documents]
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def fetch_statuses(
+    call_id: str,
+    since: Optional[datetime],
+    after: Optional[StatusCursor],
+    limit: int,
+    calls_collection,
+    status_cache: Optional[StatusCache],
+    call_summaries: Optional[CallSummaries] = None,
+) -> List[dict]:
+    """
+    Rows for a status lookup, from the hot cache when it can answer and MongoDB otherwise.
+    With a cursor, rows it has not delivered come back oldest first so a client paging
+    with `limit` never skips any; without one, the newest `limit` rows come back first.
+    Rows of compacted calls are read back from their summaries.
+    """
+    entry = status_cache.get(call_id) if status_cache else None
+
+    if after:
+        if entry and entry.complete:
+            newer = sorted((row for row in entry.statuses if after.is_new(row)), key=lambda row: row["_id"])
+            return [row for row in newer if not since or row["timestamp"] > since][:limit]
+
+        query = {"call_id": call_id, "_id": after.query()}
+        if since:
+            query["timestamp"] = {"$gt": since}
+        rows = calls_collection.find(query, STATUS_PROJECTION).sort("_id", ASCENDING).limit(limit)
+        with time_mongo("find_after_cursor"):
+            statuses = await rows.to_list(length=limit)
+        compacted = [row for row in await compacted_rows(call_summaries, call_id, since, after.watermark) if after.is_new(row)]
+        return merge_rows(statuses, compacted, newest_first=False)[:limit]
+
+    if entry is None and status_cache:
+        # Load the call's recent window once; later polls are served from memory
+        status_cache.begin_load(call_id)
+        rows = calls_collection.find({"call_id": call_id}, STATUS_PROJECTION).sort("timestamp", DESCENDING).limit(STATUS_MAX_LIMIT)
+        with time_mongo("find_recent"):
+            statuses = await rows.to_list(length=STATUS_MAX_LIMIT)
+        statuses = merge_rows(statuses, await compacted_rows(call_summaries, call_id), newest_first=True)
+        complete = len(statuses) < STATUS_MAX_LIMIT
+        statuses = statuses[:STATUS_MAX_LIMIT]
+        status_cache.load(call_id, statuses, complete=complete)
+        return [row for row in statuses if not since or row["timestamp"] > since][:limit]
+
+    if entry:
+        return [row for row in entry.statuses if not since or row["timestamp"] > since][:limit]
+
+    # Newest statuses first, walked straight off the (call_id, timestamp) index
+    query = {"call_id": call_id}
+    if since:
+        query["timestamp"] = {"$gt": since}
+    rows = calls_collection.find(query, STATUS_PROJECTION).sort("timestamp", DESCENDING).limit(limit)
+    with time_mongo("find_recent"):
+        statuses = await rows.to_list(length=limit)
+    compacted = await compacted_rows(call_summaries, call_id, since)
+    return merge_rows(statuses, compacted, newest_first=True)[:limit]
+
+@app.get("/status/{call_id}", response_model=List[StatusRow], responses={304: {"description": "No new rows since the cursor"}})
+async def get_status(
+    call_id: str,
+    limit: int = Query(STATUS_MAX_LIMIT, ge=1, le=STATUS_MAX_LIMIT),
+    since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    calls_collection=Depends(get_calls_collection),
+    status_cache: Optional[StatusCache] = Depends(get_status_cache),
+    call_summaries: Optional[CallSummaries] = Depends(get_call_summaries),
+    status_reads: Optional[SingleFlight] = Depends(get_status_reads),
+):
+    after = parse_cursor(cursor) if cursor else None
+    if since:
+        since = as_naive_utc(since)
+
+    try:
+        read = lambda: fetch_statuses(call_id, since, after, limit, calls_collection, status_cache, call_summaries)
+        if status_reads:
+            # Pollers asking for the same rows at the same moment share one query; the rows are not mutated below
+            statuses = await status_reads.do(call_id, (since, str(after) if after else None, limit), read)
+        else:
+            statuses = await read()
+        RESULT_ROWS.labels("/status/{call_id}").observe(len(statuses))
+
+        settled = settle_point(STATUS_CURSOR_SETTLE_SECONDS)
+        if after:
+            if len(statuses) >= limit:
+                # Rows past the last one returned are still to come, however old
+                settled = min(settled, statuses[-1]["_id"])
+            next_cursor = after.advance(statuses, settled, STATUS_CURSOR_MAX_PENDING)
+            if not statuses:
+                return Response(status_code=304, headers={NEXT_CURSOR_HEADER: str(next_cursor)})
+            statuses = sorted(statuses, key=lambda status: status["timestamp"], reverse=True)
+        else:
+            if not statuses:
+                raise HTTPException(status_code=404, detail="No statuses found for this call ID")
+            if len(statuses) >= limit:
+                # Only the newest `limit` rows were asked for; older ones are skipped, not delivered later
+                next_cursor = StatusCursor(max(status["_id"] for status in statuses))
+            else:
+                next_cursor = StatusCursor(settled).advance(statuses, None, STATUS_CURSOR_MAX_PENDING)
+
+        # One pass dropping _id into fresh dicts (cached rows are never handed out or mutated),
+        # serialized straight by orjson; returning the response skips response_model validation
+        return ORJSONResponse(
+            [{key: value for key, value in status.items() if key != "_id"} for status in statuses],
+            headers={NEXT_CURSOR_HEADER: str(next_cursor)},
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/status/{call_id}/latest", response_model=LatestStatus)
+async def get_latest_status(
+    call_id: str,
+    calls_collection=Depends(get_calls_collection),
+    latest_collection=Depends(get_latest_collection),
+):
+    """Current status, last timestamp and row count of a call, from one point read"""
+    try:
+        with time_mongo("find_latest"):
+            latest = await latest_collection.find_one({"_id": call_id}, LATEST_PROJECTION)
+        if latest is None:
+            latest = (await backfill_latest(calls_collection, latest_collection, [call_id])).get(call_id)
+        if latest is None:
             raise HTTPException(status_code=404, detail="No statuses found for this call ID")
+        return latest
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        return statuses
+@app.post("/status/latest", response_model=LatestStatuses)
+async def get_latest_statuses(
+    body: LatestRequest,
+    calls_collection=Depends(get_calls_collection),
+    latest_collection=Depends(get_latest_collection),
+):
+    """Current state of many calls in one round-trip; unknown call IDs are listed under `missing`"""
+    call_ids = list(dict.fromkeys(body.call_ids))
+    if not call_ids:
+        raise HTTPException(status_code=400, detail="No call IDs provided")
+    if len(call_ids) > STATUS_BATCH_MAX_SIZE:
+        raise HTTPException(status_code=413, detail=f"Request exceeds {STATUS_BATCH_MAX_SIZE} call IDs")
+
+    try:
+        rows = latest_collection.find({"_id": {"$in": call_ids}}, LATEST_PROJECTION)
+        with time_mongo("find_latest_many"):
+            latest = {row["call_id"]: row for row in await rows.to_list(length=len(call_ids))}
+        unknown = [call_id for call_id in call_ids if call_id not in latest]
+        if unknown:
+            latest.update(await backfill_latest(calls_collection, latest_collection, unknown))
+        RESULT_ROWS.labels("/status/latest").observe(len(latest))
+        return {
+            "latest": {call_id: latest[call_id] for call_id in call_ids if call_id in latest},
+            "missing": [call_id for call_id in call_ids if call_id not in latest],
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving, whatever the state of MongoDB"""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz(request: Request):
+    """Readiness: MongoDB is connected and answers a ping"""
+    warmup = request.app.state.warmup
+    if not warmup.connected.is_set():
+        raise HTTPException(status_code=503, detail="Starting", headers={"Retry-After": "1"})
+    try:
+        with time_mongo("ping"):
+            await request.app.state.mongo_client.admin.command("ping")
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"MongoDB unreachable: {e}", headers={"Retry-After": "1"})
+    return {"status": "ready", "warm": warmup.prepared}
+
+@app.get("/metrics")
+async def metrics():
+    if MULTIPROCESS_METRICS:
+        # Sum the samples every worker wrote to PROMETHEUS_MULTIPROC_DIR
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/cache/stats")
+async def cache_stats(status_cache: Optional[StatusCache] = Depends(get_status_cache)):
+    if status_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **status_cache.stats()}
+
+@app.get("/status/{call_id}/stream")
+async def stream_status(
+    call_id: str,
+    request: Request,
+    cursor: Optional[str] = None,
+    calls_collection=Depends(get_calls_collection),
+    broker: StatusBroker = Depends(get_status_broker),
+    call_summaries: Optional[CallSummaries] = Depends(get_call_summaries),
+):
+    # Resume from an explicit cursor or the browser's EventSource reconnect header
+    resume_from = cursor or request.headers.get("last-event-id")
+    after = parse_cursor(resume_from) if resume_from else None
+
+    async def events():
+        # Subscribe before replaying so nothing written in between is lost
+        queue = broker.subscribe(call_id)
+        try:
+            # Without a cursor only rows written from now on are wanted
+            position = after or StatusCursor(ObjectId.from_datetime(datetime.now(timezone.utc)))
+            replayed = set()
+            if after:
+                rows = calls_collection.find(
+                    {"call_id": call_id, "_id": after.query()}, STATUS_PROJECTION
+                ).sort("_id", ASCENDING).limit(STATUS_MAX_LIMIT)
+                statuses = await rows.to_list(length=STATUS_MAX_LIMIT)
+                compacted = [row for row in await compacted_rows(call_summaries, call_id, after=after.watermark) if after.is_new(row)]
+                for status in merge_rows(statuses, compacted, newest_first=False)[:STATUS_MAX_LIMIT]:
+                    replayed.add(status["_id"])
+                    position = position.advance([status], None, STATUS_CURSOR_MAX_PENDING)
+                    yield format_status_event(status, position)
+
+            while True:
+                try:
+                    status = await asyncio.wait_for(queue.get(), timeout=STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if status["_id"] in replayed:
+                    continue  # Already sent during the replay
+                # Every row that has settled has reached the queue; once it is drained they have all been sent
+                settled = settle_point(STATUS_CURSOR_SETTLE_SECONDS) if queue.empty() else None
+                position = position.advance([status], settled, STATUS_CURSOR_MAX_PENDING)
+                yield format_status_event(status, position)
+        finally:
+            broker.unsubscribe(call_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+
+    if STATUS_WORKERS > 1:
+        if not MULTIPROCESS_METRICS:
+            # Workers inherit this, so /metrics on any of them reports all of them
+            import tempfile
+            os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="status-checker-metrics-")
+        # Workers import the app themselves; each gets its own lifespan, MongoDB pool and hot cache
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8001,
+            workers=STATUS_WORKERS,
+            timeout_graceful_shutdown=STATUS_GRACEFUL_SHUTDOWN_SECONDS,
+        )
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8001, timeout_graceful_shutdown=STATUS_GRACEFUL_SHUTDOWN_SECONDS)
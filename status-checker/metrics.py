@@ -0,0 +1,98 @@
+import time
+from contextlib import contextmanager
+
+from fastapi import Request
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from starlette.routing import Match
+
+REQUESTS = Counter(
+    "status_checker_requests_total",
+    "HTTP requests handled, by route and response status",
+    ["method", "route", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "status_checker_request_duration_seconds",
+    "Time to produce a response, by route",
+    ["method", "route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+IN_FLIGHT = Gauge(
+    "status_checker_requests_in_flight",
+    "Requests currently being handled",
+    # Summed over live workers when running with several (PROMETHEUS_MULTIPROC_DIR)
+    multiprocess_mode="livesum",
+)
+MONGO_LATENCY = Histogram(
+    "status_checker_mongo_operation_duration_seconds",
+    "Time spent in MongoDB operations, by operation",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+RESULT_ROWS = Histogram(
+    "status_checker_result_rows",
+    "Status rows returned or written per request, by route",
+    ["route"],
+    buckets=(0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000),
+)
+COMPACTED_ROWS = Counter(
+    "status_checker_compacted_rows_total",
+    "Status rows folded into per-call summaries and removed by compaction",
+)
+COALESCED_READS = Counter(
+    "status_checker_coalesced_reads_total",
+    "Status reads answered by joining an identical read already in flight",
+)
+SHED_REQUESTS = Counter(
+    "status_checker_shed_requests_total",
+    "Requests turned away with a 503 by admission control, by reason",
+    ["reason"],
+)
+ADMISSION_QUEUE = Gauge(
+    "status_checker_admission_queue_depth",
+    "Requests waiting for an admission slot",
+    multiprocess_mode="livesum",
+)
+
+def route_label(request: Request) -> str:
+    """The route template (e.g. /status/{call_id}) so per-call paths don't explode label cardinality"""
+    for route in request.app.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+async def track_requests(request: Request, call_next):
+    route = route_label(request)
+    IN_FLIGHT.inc()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        IN_FLIGHT.dec()
+        REQUEST_LATENCY.labels(request.method, route).observe(time.perf_counter() - start)
+        REQUESTS.labels(request.method, route, str(status)).inc()
+
+@contextmanager
+def time_mongo(operation: str):
+    with MONGO_LATENCY.labels(operation).time():
+        yield
+
+class StatusCacheCollector:
+    """Exposes the hot cache's own counters at scrape time"""
+
+    def __init__(self, status_cache):
+        self.status_cache = status_cache
+
+    def collect(self):
+        stats = self.status_cache.stats()
+        size = GaugeMetricFamily("status_checker_cache_calls", "Calls currently held in the hot cache")
+        size.add_metric([], stats["size"])
+        yield size
+        for name in ("hits", "misses", "evictions", "expirations"):
+            counter = CounterMetricFamily(f"status_checker_cache_{name}", f"Hot cache {name}")
+            counter.add_metric([], stats[name])
+            yield counter
@@ -0,0 +1,37 @@
+import asyncio
+from collections import defaultdict
+from typing import Dict, Set
+
+class StatusBroker:
+    """
+    In-process fan-out of new status rows to live subscribers.
+    add_status publishes each row once; every watcher of that call_id gets
+    its own bounded queue, so N watchers never turn into N database queries.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+    def subscribe(self, call_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[call_id].add(queue)
+        return queue
+
+    def unsubscribe(self, call_id: str, queue: asyncio.Queue):
+        subscribers = self._subscribers.get(call_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[call_id]
+
+    def publish(self, call_id: str, status: dict):
+        for queue in self._subscribers.get(call_id, ()):
+            if queue.full():
+                # A slow watcher loses its oldest event rather than stalling the writer
+                queue.get_nowait()
+            queue.put_nowait(status)
+
+    def subscriber_count(self, call_id: str) -> int:
+        return len(self._subscribers.get(call_id, ()))
@@ -0,0 +1,207 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from bson import ObjectId
+
+from metrics import COMPACTED_ROWS, time_mongo
+
+# MongoDB error code for an existing index created with different options
+INDEX_OPTIONS_CONFLICT = 85
+
+async def ensure_ttl_index(collection, field: str, name: str, expire_after: int):
+    """Create a TTL index on `field`, or change its expiry if it already exists"""
+    # Imported here so pymongo isn't loaded before the driver itself is
+    from pymongo.errors import OperationFailure
+
+    try:
+        await collection.create_index(field, name=name, expireAfterSeconds=expire_after)
+    except OperationFailure as e:
+        if e.code != INDEX_OPTIONS_CONFLICT:
+            raise
+        await collection.database.command(
+            "collMod", collection.name, index={"name": name, "expireAfterSeconds": expire_after}
+        )
+
+def is_final(status: str, final_statuses: Iterable[str]) -> bool:
+    # Substring match, as the frontend decides a call has completed
+    status = status.lower()
+    return any(final in status for final in final_statuses)
+
+def filter_rows(rows: Iterable[dict], since: Optional[datetime], after: Optional[ObjectId]) -> List[dict]:
+    return [
+        row for row in rows
+        if (not since or row["timestamp"] > since) and (not after or row["_id"] > after)
+    ]
+
+def summarize_call(call_id: str, rows: List[dict], max_rows: int) -> dict:
+    """
+    One document standing in for all of a call's status rows (newest first): its
+    final state, how long it ran and spent in each status, and the newest
+    `max_rows` rows themselves so lookups can still be answered from it
+    """
+    rows = sorted(rows, key=lambda row: (row["timestamp"], row["_id"]), reverse=True)
+    oldest_first = rows[::-1]
+    counts: Dict[str, int] = {}
+    durations: Dict[str, float] = {}
+    for row, following in zip(oldest_first, oldest_first[1:] + [None]):
+        counts[row["status"]] = counts.get(row["status"], 0) + 1
+        if following is not None:
+            spent = (following["timestamp"] - row["timestamp"]).total_seconds()
+            durations[row["status"]] = durations.get(row["status"], 0.0) + spent
+
+    started_at, ended_at = oldest_first[0]["timestamp"], rows[0]["timestamp"]
+    return {
+        "call_id": call_id,
+        "final_status": rows[0]["status"],
+        "started_at": started_at,
+        "ended_at": ended_at,
+        # Time field for the TTL index and time-series bucketing
+        "timestamp": ended_at,
+        "duration_seconds": (ended_at - started_at).total_seconds(),
+        "row_count": len(rows),
+        # Lists rather than maps keyed by status, since statuses may contain '.' or '$'
+        "status_counts": [{"status": status, "count": count} for status, count in counts.items()],
+        "status_durations": [{"status": status, "seconds": seconds} for status, seconds in durations.items()],
+        "statuses": rows[:max_rows],
+        "compacted_at": datetime.utcnow(),
+    }
+
+class CallSummaries:
+    """
+    Compacted calls, one summary document per call. Stored in a regular
+    collection keyed by call_id, or in a time-series collection (time field
+    `timestamp`, meta field `call_id`) when `timeseries` is set.
+    """
+
+    def __init__(self, collection, timeseries: bool = False):
+        self.collection = collection
+        self.timeseries = timeseries
+
+    @classmethod
+    async def open(cls, db, name: str, retention_seconds: int = 0, timeseries: bool = False) -> "CallSummaries":
+        if timeseries and name not in await db.list_collection_names():
+            options = {"timeseries": {"timeField": "timestamp", "metaField": "call_id", "granularity": "hours"}}
+            if retention_seconds:
+                options["expireAfterSeconds"] = retention_seconds
+            await db.create_collection(name, **options)
+        collection = db[name]
+        if not timeseries:
+            await collection.create_index("call_id", name="call_id", unique=True)
+            if retention_seconds:
+                await ensure_ttl_index(collection, "timestamp", "timestamp_ttl", retention_seconds)
+        return cls(collection, timeseries)
+
+    async def get(self, call_id: str) -> Optional[dict]:
+        with time_mongo("find_summary"):
+            return await self.collection.find_one({"call_id": call_id}, {"_id": 0})
+
+    async def rows(self, call_id: str) -> List[dict]:
+        """The status rows folded into the call's summary, newest first"""
+        summary = await self.get(call_id)
+        return summary["statuses"] if summary else []
+
+    async def save(self, summary: dict):
+        with time_mongo("save_summary"):
+            if self.timeseries:
+                # Time-series collections only allow deletes by the meta field, not updates
+                await self.collection.delete_many({"call_id": summary["call_id"]})
+                await self.collection.insert_one(dict(summary))
+            else:
+                await self.collection.replace_one({"call_id": summary["call_id"]}, summary, upsert=True)
+
+def merge_rows(raw: List[dict], compacted: List[dict], newest_first: bool) -> List[dict]:
+    """Raw and compacted rows of one call in a single order, without duplicates"""
+    if not compacted:
+        return raw
+    seen = {row["_id"] for row in raw}
+    merged = raw + [row for row in compacted if row["_id"] not in seen]
+    if newest_first:
+        return sorted(merged, key=lambda row: row["timestamp"], reverse=True)
+    return sorted(merged, key=lambda row: row["_id"])
+
+class CallCompactor:
+    """
+    Periodically collapses the status rows of finished calls into summaries.
+    A call qualifies once its newest row has a final status and is older than
+    `min_age` seconds. Rows that arrive after a call was compacted are served
+    alongside its summary and folded in once the call again ends on a final status.
+    """
+
+    def __init__(
+        self,
+        calls_collection,
+        summaries: CallSummaries,
+        final_statuses: Iterable[str],
+        min_age: float = 3600,
+        batch_size: int = 100,
+        max_rows: int = 1000,
+    ):
+        self.calls_collection = calls_collection
+        self.summaries = summaries
+        self.final_statuses = [status.lower() for status in final_statuses]
+        self.min_age = min_age
+        self.batch_size = batch_size
+        self.max_rows = max_rows
+
+    async def candidates(self, cutoff: datetime) -> List[str]:
+        """Calls with rows older than `cutoff` whose newest such row is final"""
+        pipeline = [
+            {"$match": {"timestamp": {"$lt": cutoff}}},
+            {"$sort": {"call_id": 1, "timestamp": -1}},
+            {"$group": {"_id": "$call_id", "status": {"$first": "$status"}}},
+        ]
+        candidates = []
+        with time_mongo("find_compaction_candidates"):
+            async for group in self.calls_collection.aggregate(pipeline, allowDiskUse=True):
+                if is_final(group["status"], self.final_statuses):
+                    candidates.append(group["_id"])
+                    if len(candidates) >= self.batch_size:
+                        break
+        return candidates
+
+    async def compact_call(self, call_id: str, cutoff: datetime) -> int:
+        """Fold one call's rows into its summary; returns how many rows were removed"""
+        from pymongo import DESCENDING
+
+        with time_mongo("find_compaction_rows"):
+            rows = await self.calls_collection.find({"call_id": call_id}).sort("timestamp", DESCENDING).to_list(length=None)
+        if not rows or rows[0]["timestamp"] >= cutoff or not is_final(rows[0]["status"], self.final_statuses):
+            return 0  # Still active
+
+        compacted = await self.summaries.rows(call_id)
+        await self.summaries.save(summarize_call(call_id, merge_rows(rows, compacted, newest_first=True), self.max_rows))
+        # Only the rows summarized; anything written meanwhile stays for the next pass
+        with time_mongo("delete_compacted"):
+            result = await self.calls_collection.delete_many({"_id": {"$in": [row["_id"] for row in rows]}})
+        COMPACTED_ROWS.inc(result.deleted_count)
+        return result.deleted_count
+
+    async def compact_once(self) -> Dict[str, int]:
+        cutoff = datetime.utcnow() - timedelta(seconds=self.min_age)
+        calls = rows = 0
+        for call_id in await self.candidates(cutoff):
+            removed = await self.compact_call(call_id, cutoff)
+            if removed:
+                calls += 1
+                rows += removed
+        return {"calls": calls, "rows": rows}
+
+    async def run(self, interval: float, lock: Optional[Callable[[], Awaitable[bool]]] = None):
+        """
+        Compact every `interval` seconds until cancelled. With `lock`, a pass
+        only runs when it returns True, so one of several workers does the work.
+        """
+        while True:
+            try:
+                if lock and not await lock():
+                    await asyncio.sleep(interval)
+                    continue
+                result = await self.compact_once()
+                if result["calls"]:
+                    print(f"🗜️  Compacted {result['rows']} status rows from {result['calls']} finished calls")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Status compaction failed: {e}")
+            await asyncio.sleep(interval)
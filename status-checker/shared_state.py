@@ -0,0 +1,153 @@
+import asyncio
+import os
+import uuid
+from typing import Callable, List, Optional, Set
+
+import bson
+
+# Called with freshly written rows to update this worker's hot cache and live streams
+Deliver = Callable[[List[dict]], None]
+# Called with call IDs whose hot-cache entries may be missing rows
+Invalidate = Callable[[List[str]], None]
+
+# Seconds between attempts to tell the other workers about writes whose publish failed
+INVALIDATION_RETRY_SECONDS = 1.0
+
+class LocalBackend:
+    """
+    Single-process backend: writes are only announced to the worker that made
+    them. Right for one worker; with several, each worker sees only its own writes.
+    """
+
+    shared = False
+
+    async def start(
+        self,
+        deliver: Deliver,
+        on_reset: Optional[Callable[[], None]] = None,
+        on_invalidate: Optional[Invalidate] = None,
+    ):
+        self.deliver = deliver
+
+    def announce(self, documents: List[dict]):
+        self.deliver(documents)
+
+    async def try_lock(self, name: str, ttl: float) -> bool:
+        return True
+
+    async def close(self):
+        pass
+
+class RedisBackend:
+    """
+    Fans writes out to every worker over a pub/sub channel on any
+    Redis-compatible server. The writing worker applies its rows immediately
+    (so its own reads see them); the others apply them as the message
+    arrives. If the subscription drops, messages may have been missed, so
+    the hot cache is reset before resubscribing. If a publish fails, the
+    calls it carried are named on the next message that gets through
+    (retried every INVALIDATION_RETRY_SECONDS), and the other workers drop
+    those calls from their caches; until then they may serve them stale.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, channel: str = "status-checker:statuses"):
+        import redis.asyncio as redis
+
+        self.client = redis.Redis.from_url(url)
+        self.channel = channel
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._listener: Optional[asyncio.Task] = None
+        self._sends = set()
+        # Calls written here whose rows the other workers never received
+        self._missed: Set[str] = set()
+        self._retry: Optional[asyncio.Task] = None
+
+    async def start(
+        self,
+        deliver: Deliver,
+        on_reset: Optional[Callable[[], None]] = None,
+        on_invalidate: Optional[Invalidate] = None,
+    ):
+        self.deliver = deliver
+        self.on_reset = on_reset
+        self.on_invalidate = on_invalidate
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        # Subscribe before serving so no write after startup is missed
+        await pubsub.subscribe(self.channel)
+        self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def _listen(self, pubsub):
+        while True:
+            try:
+                async for message in pubsub.listen():
+                    payload = bson.decode(message["data"])
+                    if payload["worker"] != self.worker_id:
+                        if payload.get("invalidate") and self.on_invalidate:
+                            self.on_invalidate(payload["invalidate"])
+                        if payload["documents"]:
+                            self.deliver(payload["documents"])
+            except asyncio.CancelledError:
+                await pubsub.aclose()
+                raise
+            except Exception as e:
+                print(f"❌ Status channel lost, resubscribing: {e}")
+                if self.on_reset:
+                    self.on_reset()
+                await asyncio.sleep(1)
+                try:
+                    await pubsub.aclose()
+                    pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                    await pubsub.subscribe(self.channel)
+                except Exception as e:
+                    print(f"❌ Resubscribe failed: {e}")
+
+    def announce(self, documents: List[dict]):
+        self.deliver(documents)
+        self._publish(documents)
+
+    def _publish(self, documents: List[dict]):
+        missed, self._missed = self._missed, set()
+        # BSON keeps ObjectIds and datetimes exactly as MongoDB hands them back
+        message = bson.encode({"worker": self.worker_id, "documents": documents, "invalidate": sorted(missed)})
+        task = asyncio.ensure_future(self._send(message, missed | {document["call_id"] for document in documents}))
+        self._sends.add(task)
+        task.add_done_callback(self._sends.discard)
+
+    async def _send(self, message: bytes, call_ids: Set[str]):
+        try:
+            await self.client.publish(self.channel, message)
+        except Exception as e:
+            print(f"❌ Status publish failed, other workers will drop {len(call_ids)} calls from their caches: {e}")
+            self._missed |= call_ids
+            if self._retry is None or self._retry.done():
+                self._retry = asyncio.create_task(self._retry_invalidation())
+
+    async def _retry_invalidation(self):
+        """Keep sending the missed calls on their own until a message carries them, if no write does first"""
+        while self._missed:
+            await asyncio.sleep(INVALIDATION_RETRY_SECONDS)
+            if self._missed:
+                self._publish([])
+
+    async def try_lock(self, name: str, ttl: float) -> bool:
+        """Hold `name` for `ttl` seconds if no other worker does, so periodic jobs run once per interval"""
+        return bool(await self.client.set(f"{self.channel}:lock:{name}", self.worker_id, nx=True, px=int(ttl * 1000)))
+
+    async def close(self):
+        if self._retry:
+            self._retry.cancel()
+        if self._sends:
+            await asyncio.gather(*self._sends, return_exceptions=True)
+        if self._listener:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+        await self.client.aclose()
+
+def make_backend(kind: str, redis_url: str, channel: str):
+    if kind == "memory":
+        return LocalBackend()
+    if kind == "redis":
+        return RedisBackend(redis_url, channel)
+    raise ValueError(f"Unknown STATUS_SHARED_BACKEND: {kind}")
@@ -0,0 +1,95 @@
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+class CacheEntry:
+    __slots__ = ("statuses", "complete", "expires_at")
+
+    def __init__(self, statuses: List[dict], complete: bool, expires_at: float):
+        self.statuses = statuses  # Newest timestamp first
+        self.complete = complete  # True when this is the call's entire history
+        self.expires_at = expires_at
+
+class StatusCache:
+    """
+    Bounded per-call_id cache of recent status lists for live calls.
+    Entries are loaded on a read miss, kept current by add_status writing
+    through, evicted least-recently-used beyond `max_calls`, and expire
+    `ttl` seconds after they were last loaded or written.
+    """
+
+    def __init__(self, max_calls: int = 1000, max_rows: int = 1000, ttl: float = 300):
+        self.max_calls = max_calls
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        # call_id -> whether a write landed while a read miss was querying MongoDB
+        self._loading: Dict[str, bool] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, call_id: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(call_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[call_id]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(call_id)
+        self.hits += 1
+        return entry
+
+    def begin_load(self, call_id: str):
+        """Mark a read miss as in flight, so writes racing the query can be detected"""
+        self._loading.setdefault(call_id, False)
+
+    def load(self, call_id: str, statuses: List[dict], complete: bool):
+        """Store the newest-first rows just read from MongoDB"""
+        if self._loading.pop(call_id, True):
+            # A write may have missed the query's snapshot; let the next read reload
+            return
+        self._entries[call_id] = CacheEntry(statuses[:self.max_rows], complete, time.monotonic() + self.ttl)
+        self._entries.move_to_end(call_id)
+        while len(self._entries) > self.max_calls:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def write_through(self, call_id: str, status: dict):
+        """Add a freshly written row to a cached call; uncached calls are left to the next read"""
+        entry = self._entries.get(call_id)
+        if entry is None:
+            if call_id in self._loading:
+                self._loading[call_id] = True
+            return
+        entry.statuses.append(status)
+        entry.statuses.sort(key=lambda row: row["timestamp"], reverse=True)
+        if len(entry.statuses) > self.max_rows:
+            del entry.statuses[self.max_rows:]
+            entry.complete = False
+        entry.expires_at = time.monotonic() + self.ttl
+
+    def invalidate(self, call_id: str):
+        self._entries.pop(call_id, None)
+
+    def clear(self):
+        """Drop every entry, e.g. when writes made by other workers may have been missed"""
+        self._entries.clear()
+        for call_id in self._loading:
+            self._loading[call_id] = True
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_calls": self.max_calls,
+            "max_rows": self.max_rows,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,143 @@
+"""
+Live status stream tests against mongomock, with the app served by uvicorn
+so the event stream is read the way a browser reads it
+
+    pip install -r requirements-dev.txt
+    python -m pytest test_stream.py
+"""
+
+import asyncio
+import socket
+import threading
+import time
+from typing import Dict, Iterator
+
+import httpx
+import pytest
+import uvicorn
+from mongomock_motor import AsyncMongoMockClient
+
+import main
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wait_until(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not met in time")
+        time.sleep(0.01)
+
+@pytest.fixture(scope="module")
+def mongo():
+    return AsyncMongoMockClient()
+
+@pytest.fixture(scope="module")
+def base_url(mongo):
+    main.mongo_client = lambda: mongo
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{port}"
+    wait_until(lambda: server.started)
+    with httpx.Client(base_url=url) as client:
+        wait_until(lambda: client.get("/readyz").status_code == 200)
+    yield url
+    server.should_exit = True
+    thread.join(timeout=10)
+
+@pytest.fixture
+def client(base_url):
+    with httpx.Client(base_url=base_url, timeout=10) as client:
+        yield client
+
+def subscribers(call_id: str) -> int:
+    return main.app.state.status_broker.subscriber_count(call_id)
+
+def read_events(response: httpx.Response) -> Iterator[Dict[str, str]]:
+    """Server-Sent Events from a streamed response, skipping keep-alive comments"""
+    event: Dict[str, str] = {}
+    for line in response.iter_lines():
+        if not line:
+            if event:
+                yield event
+                event = {}
+        elif not line.startswith(":"):
+            field, _, value = line.partition(": ")
+            event[field] = value
+
+def take(events: Iterator[Dict[str, str]], count: int):
+    return [next(events) for _ in range(count)]
+
+def statuses(events) -> list:
+    return [main.orjson.loads(event["data"])["status"] for event in events]
+
+def test_stream_delivers_single_and_batch_writes(client):
+    with client.stream("GET", "/status/stream-writes/stream") as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        wait_until(lambda: subscribers("stream-writes") == 1)
+
+        client.post("/add-status", json={"call_id": "stream-writes", "status": "ringing"}).raise_for_status()
+        client.post("/add-status/batch", json=[
+            {"call_id": "stream-writes", "status": "answered"},
+            {"call_id": "other-call", "status": "ignored"},
+            {"call_id": "stream-writes", "status": "completed", "metadata": {"duration": 42}},
+        ]).raise_for_status()
+
+        events = take(read_events(response), 3)
+    assert [event["event"] for event in events] == ["status"] * 3
+    assert statuses(events) == ["ringing", "answered", "completed"]
+    assert main.orjson.loads(events[2]["data"])["metadata"] == {"duration": 42}
+    assert len({event["id"] for event in events}) == 3
+
+def test_last_event_id_replays_missed_rows(client):
+    with client.stream("GET", "/status/stream-replay/stream") as response:
+        wait_until(lambda: subscribers("stream-replay") == 1)
+        client.post("/add-status", json={"call_id": "stream-replay", "status": "first"}).raise_for_status()
+        (first,) = take(read_events(response), 1)
+    wait_until(lambda: subscribers("stream-replay") == 0)
+
+    # Written while the client is disconnected
+    client.post("/add-status", json={"call_id": "stream-replay", "status": "second"}).raise_for_status()
+    client.post("/add-status/batch", json=[{"call_id": "stream-replay", "status": "third"}]).raise_for_status()
+
+    headers = {"Last-Event-ID": first["id"]}
+    with client.stream("GET", "/status/stream-replay/stream", headers=headers) as response:
+        events = read_events(response)
+        replayed = take(events, 2)
+        wait_until(lambda: subscribers("stream-replay") == 1)
+        client.post("/add-status", json={"call_id": "stream-replay", "status": "fourth"}).raise_for_status()
+        live = take(events, 1)
+    assert statuses(replayed) == ["second", "third"]
+    assert statuses(live) == ["fourth"]
+
+    # The last event id also works as a polling cursor
+    assert client.get("/status/stream-replay", params={"cursor": live[0]["id"]}).status_code == 304
+
+def test_replay_includes_rows_that_became_visible_late(client, mongo):
+    with client.stream("GET", "/status/stream-late/stream") as response:
+        wait_until(lambda: subscribers("stream-late") == 1)
+        late = main.prepare_status(main.CallStatus(call_id="stream-late", status="late"))
+        client.post("/add-status", json={"call_id": "stream-late", "status": "early"}).raise_for_status()
+        (early,) = take(read_events(response), 1)
+
+    # `late` got its _id first but only lands now, below the id of the row already sent
+    asyncio.run(mongo.Ayman.calls.insert_one(late))
+
+    with client.stream("GET", "/status/stream-late/stream", headers={"Last-Event-ID": early["id"]}) as response:
+        (replayed,) = take(read_events(response), 1)
+    assert statuses([replayed]) == ["late"]
+
+def test_disconnect_unsubscribes(client):
+    for _ in range(2):
+        with client.stream("GET", "/status/stream-gone/stream"):
+            wait_until(lambda: subscribers("stream-gone") == 1)
+        wait_until(lambda: subscribers("stream-gone") == 0)
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/status/stream-bad/stream", params={"cursor": "not-a-cursor!"}).status_code == 400
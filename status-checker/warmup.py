@@ -0,0 +1,59 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+class Warmup:
+    """
+    Startup work run in the background, so the server accepts connections
+    (and answers liveness probes) as soon as it is up on a cold start.
+    `connect` sets up what requests need, and requests wait for it through
+    `wait`; `prepare` then does what nothing has to wait for, such as opening
+    pooled connections and building indexes. Each step is retried, backing
+    off up to `max_retry_delay` seconds, until it succeeds.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[None]],
+        prepare: Optional[Callable[[], Awaitable[None]]] = None,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 30.0,
+    ):
+        self.connect = connect
+        self.prepare = prepare
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.connected = asyncio.Event()
+        self.prepared = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        await self._retry("connect", self.connect)
+        self.connected.set()
+        if self.prepare:
+            await self._retry("warm-up", self.prepare)
+        self.prepared = True
+        print("🔥 Warm-up complete")
+
+    async def _retry(self, step: str, fn: Callable[[], Awaitable[None]]):
+        delay = self.retry_delay
+        while True:
+            try:
+                await fn()
+                return
+            except Exception as e:
+                print(f"❌ Startup {step} failed, retrying in {delay:g}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+
+    async def wait(self, timeout: float):
+        """Wait until `connect` has finished; raises asyncio.TimeoutError after `timeout` seconds"""
+        if not self.connected.is_set():
+            await asyncio.wait_for(self.connected.wait(), timeout)
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
@@ -0,0 +1,76 @@
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from metrics import time_mongo
+
+class StatusWriteBuffer:
+    """
+    Coalesces single status writes into insert_many flushes.
+    A flush happens as soon as `max_size` rows are waiting, or `max_delay`
+    seconds after the first waiting row, whichever comes first. `after_write`
+    runs once a flush is stored, before the waiting writes are acknowledged.
+    """
+
+    def __init__(
+        self,
+        collection,
+        max_size: int = 100,
+        max_delay: float = 0.05,
+        on_flush: Optional[Callable[[List[dict]], None]] = None,
+        after_write: Optional[Callable[[List[dict]], Awaitable[None]]] = None,
+    ):
+        self.collection = collection
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.on_flush = on_flush
+        self.after_write = after_write
+        self._pending: List[Tuple[dict, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes = set()
+
+    def add(self, document: dict) -> asyncio.Future:
+        """Queue a document; the returned future resolves once it has been written"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((document, future))
+        if len(self._pending) >= self.max_size:
+            self._schedule_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._schedule_flush)
+        return future
+
+    def _schedule_flush(self):
+        task = asyncio.ensure_future(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        documents = [document for document, _ in batch]
+        try:
+            with time_mongo("insert_many_buffered"):
+                await self.collection.insert_many(documents, ordered=False)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if self.after_write:
+            await self.after_write(documents)
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
+        if self.on_flush:
+            self.on_flush(documents)
+
+    async def close(self):
+        """Write out anything still waiting; called on shutdown"""
+        await self.flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)